@@ -0,0 +1,72 @@
+import re
+
+from hardwaremon import devices, hostfs
+
+# ---------- amdgpu sysfs Telemetry ---------- #
+# The amdgpu driver exposes load, VRAM, clocks and its hwmon sensors under
+# /sys/class/drm/cardN/device, so no tool has to be spawned. The attribute
+# files stay open between ticks (hostfs.Handles); the card list itself only
+# changes on hotplug and is cached by the inventory (see collectors.py).
+
+DRM = "/sys/class/drm"
+
+_handles = hostfs.Handles()
+
+
+def cards():
+    # [{"card", "device", "hwmon"}] for every AMD card, in card order
+    try:
+        entries = hostfs.listdir(DRM)
+    except OSError:
+        return []
+    found = []
+    for entry in sorted(entries, key=lambda e: int(e[4:]) if e[4:].isdigit() else -1):
+        if not re.fullmatch(r"card\d+", entry):
+            continue  # connectors (card0-DP-1) and render nodes
+        device = f"{DRM}/{entry}/device"
+        if hostfs.read(device + "/vendor") != f"0x{devices.VENDOR_AMD:04x}":
+            continue
+        try:
+            hwmons = sorted(hostfs.listdir(device + "/hwmon"))
+        except OSError:
+            hwmons = []
+        found.append({"card": entry, "device": device,
+                      "hwmon": f"{device}/hwmon/{hwmons[0]}" if hwmons else None})
+    return found
+
+
+def _int(path):
+    value = _handles.read(path) if path else None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def active_clock(table):
+    # pp_dpm_sclk: "0: 500Mhz\n1: 1800Mhz *" -> 1800 (the starred level)
+    for line in (table or "").splitlines():
+        if line.rstrip().endswith("*"):
+            match = re.search(r"(\d+)\s*mhz", line, re.IGNORECASE)
+            if match:
+                return int(match.group(1))
+    return None
+
+
+def reading(card):
+    device, hwmon = card["device"], card["hwmon"]
+    total, used = _int(device + "/mem_info_vram_total"), _int(device + "/mem_info_vram_used")
+    power = _int(hwmon and hwmon + "/power1_average")
+    if power is None:
+        power = _int(hwmon and hwmon + "/power1_input")  # newer kernels on some chips
+    temp = _int(hwmon and hwmon + "/temp1_input")
+    return {
+        "index": int(card["card"][4:]),
+        "name": card["card"],
+        "utilization": _int(device + "/gpu_busy_percent"),
+        "memory_used": used / 2**20 if used is not None else None,
+        "memory_total": total / 2**20 if total is not None else None,
+        "temperature": temp / 1000 if temp is not None else None,
+        "power": power / 1e6 if power is not None else None,     # µW
+        "clock": active_clock(_handles.read(device + "/pp_dpm_sclk")),
+    }
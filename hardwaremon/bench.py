@@ -0,0 +1,328 @@
+import argparse
+import json
+import math
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from hardwaremon import collectors, hostfs, profiling, snapshot
+
+# ---------- Collector Benchmarks ---------- #
+# `hardwaremon bench` times every collector and section, plus one full
+# refresh pass, on a fresh snapshot per call with the collectors' reused
+# values dropped (so nothing is served from the per-tick memo or from a
+# collector whose interval isn't up yet). Latency comes from a plain timing loop; peak allocation is
+# measured in a separate tracemalloc pass because tracing slows every call
+# down. With --save the results become the baseline; otherwise they are
+# compared against it and the exit status is 1 if anything regressed.
+
+BASELINE_FILE = "hardwaremon-bench.json"
+DEFAULT_THRESHOLD = 1.5   # allowed p50 / peak allocation growth vs. baseline
+SLACK_MS = 0.5            # ignore regressions smaller than this (timer noise)
+
+# --scale: sections whose cost should grow with the host, run on synthetic trees
+SCALING_TARGETS = ("top_processes", "network_info", "drive_info", "partition_info", "fan_info", "full_pass")
+DEFAULT_SCALES = (1, 4, 16, 64)
+SUPERLINEAR = 1.25        # log-log slope of cost vs. host size; 1.0 is linear
+
+# --startup: import time of each entry point (best of several `python -X
+# importtime` runs) against a budget, plus modules it must not pull in
+STARTUP_BUDGET_MS = {"hardwaremon.hardwaremon": 150, "hardwaremon.hardwaremon_gui": 150}
+STARTUP_FORBIDDEN = {
+    "hardwaremon.hardwaremon": ("tkinter", "requests", "PIL"),   # the CLI
+    "hardwaremon.hardwaremon_gui": ("requests", "PIL"),          # Pillow loads after the first frame
+}
+
+
+class SpawnCounter:
+    # Counts subprocesses started while active, from profiling's audit hook
+    def __init__(self):
+        self._start = self._end = None
+
+    def __enter__(self):
+        self._start = profiling.total_spawns()
+        self._end = None
+        return self
+
+    def __exit__(self, *exc):
+        self._end = profiling.total_spawns()
+
+    @property
+    def count(self):
+        end = profiling.total_spawns() if self._end is None else self._end
+        return end - self._start
+
+
+def full_pass():
+    # What one GUI/CLI refresh does, minus the Tk widget writes
+    from hardwaremon import hardwaremon
+    hardwaremon.update_history()
+    hardwaremon.check_alerts()
+    return [section() for section in hardwaremon.SECTIONS]
+
+
+def targets():
+    from hardwaremon import hardwaremon
+    found = {}
+    for name in collectors.REGISTRY:
+        found["collector:" + name] = lambda name=name: collectors.get(name)
+    for section in hardwaremon.SECTIONS + [hardwaremon.system_summary, hardwaremon.history_info,
+                                           hardwaremon.check_alerts]:
+        found[section.__name__] = section
+    found["full_pass"] = full_pass
+    return found
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    # nearest-rank
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def _fresh():
+    snapshot.tick()
+    collectors.clear()
+
+
+def measure(func, iterations=20, warmup=1):
+    for _ in range(warmup):
+        _fresh()
+        func()
+
+    times = []
+    with SpawnCounter() as spawns:
+        for _ in range(iterations):
+            _fresh()
+            started = time.perf_counter()
+            func()
+            times.append((time.perf_counter() - started) * 1000)
+
+    _fresh()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "p50_ms": round(percentile(times, 50), 4),
+        "p95_ms": round(percentile(times, 95), 4),
+        "p99_ms": round(percentile(times, 99), 4),
+        "max_ms": round(max(times), 4),
+        "alloc_kib": round(peak / 1024, 1),
+        "spawns": round(spawns.count / iterations, 2),
+    }
+
+
+def run(names=None, iterations=20):
+    available = targets()
+    results = {}
+    for name in names or available:
+        if name not in available:
+            raise KeyError(f"unknown benchmark {name!r}")
+        results[name] = measure(available[name], iterations)
+    return results
+
+
+def load_baseline(path=BASELINE_FILE):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_baseline(results, path=BASELINE_FILE, thresholds=None):
+    data = {
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "saved": time.time(),
+        "thresholds": thresholds or {"default": DEFAULT_THRESHOLD},
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+
+
+def compare(results, baseline, threshold=None):
+    # Returns one message per regression; thresholds in the baseline file
+    # ({"default": 1.5, "top_processes": 3.0, ...}) override the default
+    limits = baseline.get("thresholds", {})
+    regressions = []
+    for name, now in results.items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            continue
+        ratio = limits.get(name, threshold or limits.get("default", DEFAULT_THRESHOLD))
+        if now["p50_ms"] > before["p50_ms"] * ratio + SLACK_MS:
+            regressions.append(f"{name}: p50 {before['p50_ms']:.2f} -> {now['p50_ms']:.2f} ms")
+        if now["alloc_kib"] > before["alloc_kib"] * ratio + 64:
+            regressions.append(f"{name}: peak alloc {before['alloc_kib']:.0f} -> {now['alloc_kib']:.0f} KiB")
+        if now["spawns"] > before["spawns"]:
+            regressions.append(f"{name}: subprocesses {before['spawns']:g} -> {now['spawns']:g} per call")
+    return regressions
+
+
+def scaling(scales=DEFAULT_SCALES, names=SCALING_TARGETS, iterations=5):
+    # {name: [p50 ms at each scale]} measured on fixtures.build() trees
+    from hardwaremon import fixtures
+    available = targets()
+    table = {name: [] for name in names}
+    try:
+        for scale in scales:
+            with tempfile.TemporaryDirectory(prefix="hardwaremon-scale-") as root:
+                fixtures.build(root, **fixtures.sizes(scale))
+                hostfs.set_root(root)
+                for name in names:
+                    table[name].append(measure(available[name], iterations)["p50_ms"])
+                hostfs.set_root(None)
+    finally:
+        hostfs.set_root(None)
+    return table
+
+
+def growth(scales, costs):
+    # Slope between the smallest and largest host on a log-log scale
+    if len(scales) < 2 or costs[0] <= 0 or costs[-1] <= 0:
+        return None
+    return math.log(costs[-1] / costs[0]) / math.log(scales[-1] / scales[0])
+
+
+def format_scaling(scales, table, width=40):
+    from hardwaremon import fixtures
+    lines = ["host sizes: " + "; ".join(
+        f"x{scale} = " + ", ".join(f"{count} {name}" for name, count in fixtures.sizes(scale).items())
+        for scale in (scales[0], scales[-1]))]
+    for name, costs in table.items():
+        slope = growth(scales, costs)
+        verdict = "" if slope is None else f"  slope {slope:.2f}" + \
+            ("  SUPER-LINEAR" if slope > SUPERLINEAR else "")
+        lines.append("")
+        lines.append(f"{name}{verdict}")
+        top = max(costs) or 1
+        for scale, cost in zip(scales, costs):
+            lines.append(f"  x{scale:<5} {'#' * max(1, round(cost / top * width)):{width}} {cost:9.3f} ms")
+    return lines
+
+
+def import_time(module, runs=5):
+    # (best cumulative import time in ms, names of every module imported)
+    best, imported = None, set()
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                capture_output=True, text=True, check=True).stderr
+        for line in output.splitlines():
+            # "import time:       self [us] |  cumulative | imported package"
+            fields = line.split("|")
+            if len(fields) != 3 or not line.startswith("import time:"):
+                continue
+            name = fields[2].strip()
+            imported.add(name)
+            if name == module and fields[1].strip().isdigit():
+                ms = int(fields[1]) / 1000
+                best = ms if best is None else min(best, ms)
+    return best, imported
+
+
+def startup(budgets=STARTUP_BUDGET_MS, runs=5):
+    # {module: {"ms", "budget_ms", "forbidden": [modules it shouldn't import]}}
+    results = {}
+    for module, budget in budgets.items():
+        ms, imported = import_time(module, runs)
+        forbidden = [name for name in STARTUP_FORBIDDEN.get(module, ())
+                     if name in imported or any(m.startswith(name + ".") for m in imported)]
+        results[module] = {"ms": ms, "budget_ms": budget, "forbidden": forbidden}
+    return results
+
+
+def format_startup(results):
+    lines = [f"{'module':28} {'import ms':>9} {'budget':>7}  forbidden imports"]
+    for module, r in results.items():
+        lines.append(f"{module:28} {r['ms']:9.1f} {r['budget_ms']:7g}  {', '.join(r['forbidden']) or '-'}")
+    return lines
+
+
+def format_table(results):
+    lines = [f"{'benchmark':28} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'KiB':>8} {'spawns':>7}"]
+    for name, r in results.items():
+        lines.append(f"{name:28} {r['p50_ms']:9.3f} {r['p95_ms']:9.3f} {r['p99_ms']:9.3f} "
+                     f"{r['max_ms']:9.3f} {r['alloc_kib']:8.1f} {r['spawns']:7g}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="hardwaremon bench",
+                                     description="Time every collector and section against a baseline")
+    parser.add_argument("names", nargs="*", help="benchmarks to run (default: all)")
+    parser.add_argument("--iterations", type=int, default=20, help="timed calls per benchmark")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help=f"baseline file (default: {BASELINE_FILE})")
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help=f"allowed slowdown ratio (default: from the baseline, else {DEFAULT_THRESHOLD})")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--list", action="store_true", help="list benchmark names and exit")
+    parser.add_argument("--scale", default=None, metavar="N,N,...",
+                        help="instead, time sections on synthetic hosts of these sizes "
+                             f"(e.g. {','.join(map(str, DEFAULT_SCALES))}) and flag super-linear growth")
+    parser.add_argument("--csv", default=None, help="with --scale, also write the costs to this CSV file")
+    parser.add_argument("--startup", action="store_true",
+                        help="instead, measure entry point import time (python -X importtime) against "
+                             "its budget and check the CLI doesn't import Tk, requests or Pillow")
+    parser.add_argument("--budget", type=float, default=None, help="with --startup, budget in ms for every module")
+    hostfs.add_arguments(parser)
+    args = parser.parse_args(argv)
+    hostfs.apply(args)
+
+    if args.list:
+        print("\n".join(targets()))
+        return 0
+
+    if args.startup:
+        budgets = {module: args.budget or budget for module, budget in STARTUP_BUDGET_MS.items()}
+        results = startup(budgets)
+        print(json.dumps(results, indent=1) if args.json else "\n".join(format_startup(results)))
+        over = [module for module, r in results.items() if r["forbidden"] or r["ms"] > r["budget_ms"]]
+        return 1 if over else 0
+
+    if args.scale:
+        scales = sorted(int(n) for n in args.scale.split(","))
+        names = args.names or SCALING_TARGETS
+        table = scaling(scales, names, min(args.iterations, 5))
+        print("\n".join(format_scaling(scales, table)))
+        if args.csv:
+            with open(args.csv, "w") as f:
+                f.write("benchmark," + ",".join(f"x{scale}" for scale in scales) + "\n")
+                for name, costs in table.items():
+                    f.write(name + "," + ",".join(f"{cost:.4f}" for cost in costs) + "\n")
+        slopes = [growth(scales, costs) for costs in table.values()]
+        return 1 if any(slope and slope > SUPERLINEAR for slope in slopes) else 0
+
+    unknown = set(args.names) - targets().keys()
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))} (see --list)")
+
+    results = run(args.names, args.iterations)
+    print(json.dumps(results, indent=1) if args.json else "\n".join(format_table(results)))
+
+    baseline = load_baseline(args.baseline)
+    if args.save:
+        thresholds = baseline.get("thresholds") if baseline else None
+        if args.threshold:
+            thresholds = dict(thresholds or {}, default=args.threshold)
+        if baseline and args.names:
+            results = dict(baseline.get("results", {}), **results)
+        save_baseline(results, args.baseline, thresholds)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save to create one")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
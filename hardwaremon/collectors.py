@@ -0,0 +1,586 @@
+import getpass
+import os
+import platform
+import shutil
+import threading
+import time
+from dataclasses import asdict, dataclass, is_dataclass
+
+import psutil
+
+from hardwaremon import amdgpu, devices, engine, hostfs, inventory, nvidia, processes, profiling, snapshot
+
+# ---------- Typed Collectors ---------- #
+# A collector reads one kind of hardware state and returns small records
+# (or a list of them) instead of formatted text. Results are memoized on
+# the current snapshot, so the text sections, graphs, alerts, exporter and
+# JSON output all share one sample per tick. Formatting lives with each
+# consumer (see the section functions in hardwaremon.py).
+#
+# Each collector also declares how often it is worth re-reading: CPU usage
+# moves every few hundred ms, disk usage hardly at all, and inventory-backed
+# ones (GPUs, board, USB devices) only change on hotplug, see ON_CHANGE in
+# engine.py. A value is reused by later snapshots until its interval is up,
+# so a section that also shows CPU usage doesn't re-read disks or sensors
+# every 250 ms.
+
+REGISTRY = {}   # name -> function(snap)
+INTERVALS = {}  # name -> seconds between reads, or ON_CHANGE
+_values = {}    # name -> (monotonic time read, function, value)
+_trace = threading.local()
+
+RESIZABLE_BAR = "/sys/bus/pci/devices/0000:00:01.0/resizable_bar"
+DMI_BASE = "/sys/devices/virtual/dmi/id/"
+
+
+def collector(name, interval=engine.DEFAULT_INTERVAL):
+    def decorator(func):
+        REGISTRY[name] = func
+        INTERVALS[name] = interval
+        return func
+    return decorator
+
+
+def get(name, snap=None):
+    reads = getattr(_trace, "reads", None)
+    if reads is not None:
+        reads.add(name)
+    snap = snap or snapshot.current()
+    return snap.memo("collector:" + name, lambda: _read(name, snap))
+
+
+def _read(name, snap):
+    func, interval = REGISTRY[name], INTERVALS.get(name)
+    now = time.monotonic()
+    cached = _values.get(name)
+    # ON_CHANGE ones are backed by the inventory, which caches them already
+    if cached is not None and interval and cached[1] is func and now - cached[0] < interval:
+        return cached[2]
+    value = profiling.PROFILER.call("collector:" + name, func, snap)
+    if interval:
+        _values[name] = (now, func, value)
+    return value
+
+
+def clear():
+    # Forget reused values, e.g. when switching hosts
+    _values.clear()
+
+
+def traced(func, *args, **kwargs):
+    # (result, names of the collectors func read while running)
+    outer = getattr(_trace, "reads", None)
+    _trace.reads = reads = set()
+    try:
+        return func(*args, **kwargs), reads
+    finally:
+        _trace.reads = outer
+        if outer is not None:
+            outer.update(reads)
+
+
+def interval(names):
+    # Refresh interval for something that reads these collectors: the
+    # shortest of theirs, ON_CHANGE if they all are
+    declared = [INTERVALS[name] for name in names if INTERVALS.get(name) is not engine.ON_CHANGE]
+    if declared:
+        return min(declared)
+    return engine.ON_CHANGE if names else engine.DEFAULT_INTERVAL
+
+
+def is_stale(name, snap=None):
+    snap = snap or snapshot.current()
+    return snap.is_stale("collector:" + name)
+
+
+def sample(names=None, snap=None):
+    snap = snap or snapshot.current()
+    return {name: get(name, snap) for name in names or REGISTRY}
+
+
+def to_dict(value):
+    # Records (and lists/dicts of them) as plain JSON-friendly values
+    if isinstance(value, list):
+        return [to_dict(v) for v in value]
+    if isinstance(value, dict):
+        return {k: to_dict(v) for k, v in value.items()}
+    if is_dataclass(value):
+        return asdict(value)
+    return value
+
+
+# ---------- Records ---------- #
+# __slots__ keeps one instance per sensor/interface/process small; the
+# fields are listed twice because dataclass(slots=True) needs Python 3.10.
+
+@dataclass
+class Usage:
+    __slots__ = ("cpu", "mem", "disk")
+    cpu: float
+    mem: float
+    disk: float
+
+
+@dataclass
+class Cpu:
+    __slots__ = ("name", "freq_mhz", "cores", "threads")
+    name: str
+    freq_mhz: float
+    cores: int
+    threads: int
+
+
+@dataclass
+class Memory:
+    __slots__ = ("total", "used", "available", "percent")
+    total: int
+    used: int
+    available: int
+    percent: float
+
+
+@dataclass
+class Swap:
+    __slots__ = ("total", "used", "percent")
+    total: int
+    used: int
+    percent: float
+
+
+@dataclass
+class Disk:
+    __slots__ = ("mountpoint", "total", "used", "free", "percent")
+    mountpoint: str
+    total: int
+    used: int
+    free: int
+    percent: float
+
+
+@dataclass
+class DiskIo:
+    __slots__ = ("read_bytes", "write_bytes")
+    read_bytes: int
+    write_bytes: int
+
+
+@dataclass
+class System:
+    __slots__ = ("system", "release", "machine", "uptime", "user", "columns", "lines", "resizable_bar")
+    system: str
+    release: str
+    machine: str
+    uptime: float
+    user: str
+    columns: int
+    lines: int
+    resizable_bar: bool
+
+
+@dataclass
+class NetInterface:
+    __slots__ = ("name", "sent", "recv")
+    name: str
+    sent: int
+    recv: int
+
+
+@dataclass
+class ProcessRow:
+    __slots__ = ("pid", "name", "cpu", "mem", "rss", "threads")
+    pid: int
+    name: str
+    cpu: float
+    mem: float
+    rss: int
+    threads: int
+
+
+@dataclass
+class Partition:
+    # total/used/percent are None when the mountpoint can't be read
+    __slots__ = ("device", "mountpoint", "fstype", "total", "used", "percent")
+    device: str
+    mountpoint: str
+    fstype: str
+    total: int
+    used: int
+    percent: float
+
+
+# device tells chips with the same name apart: the hwmonN directory, or
+# the chip name again for sensors psutil reported (it merges them by name)
+
+@dataclass
+class Fan:
+    __slots__ = ("chip", "sensor", "rpm", "device")
+    chip: str
+    sensor: str
+    rpm: int
+    device: str
+
+
+@dataclass
+class Temperature:
+    __slots__ = ("chip", "label", "current", "device")
+    chip: str
+    label: str
+    current: float
+    device: str
+
+
+@dataclass
+class Voltage:
+    __slots__ = ("chip", "sensor", "label", "volts", "device")
+    chip: str
+    sensor: str
+    label: str
+    volts: float
+    device: str
+
+
+@dataclass
+class Power:
+    __slots__ = ("chip", "sensor", "label", "watts", "device")
+    chip: str
+    sensor: str
+    label: str
+    watts: float
+    device: str
+
+
+@dataclass
+class Battery:
+    __slots__ = ("percent", "plugged", "secsleft")
+    percent: float
+    plugged: bool
+    secsleft: int
+
+
+@dataclass
+class Gpu:
+    __slots__ = ("name", "description", "vendor_id", "link_width", "max_link_width", "vram")
+    name: str
+    description: str          # lspci-style line
+    vendor_id: int
+    link_width: int
+    max_link_width: int
+    vram: str
+
+
+@dataclass
+class GpuTelemetry:
+    # None wherever the driver reports [N/A] / [Not Supported]
+    __slots__ = ("index", "name", "utilization", "memory_used", "memory_total", "temperature", "power", "clock")
+    index: int
+    name: str
+    utilization: float    # %
+    memory_used: float    # MiB
+    memory_total: float   # MiB
+    temperature: float    # °C
+    power: float          # W
+    clock: float          # graphics clock, MHz
+
+
+@dataclass
+class Board:
+    __slots__ = ("vendor", "name", "version", "serial")
+    vendor: str
+    name: str
+    version: str
+    serial: str
+
+
+@dataclass
+class OsInfo:
+    __slots__ = ("system", "distro", "version")
+    system: str
+    distro: str
+    version: str
+
+
+@dataclass
+class Device:
+    __slots__ = ("description",)
+    description: str
+
+
+# ---------- Static Facts (cached by inventory) ---------- #
+
+@inventory.fact("cpu_name")
+def _read_cpu_name():
+    if platform.system() == "Linux":
+        for line in (hostfs.read("/proc/cpuinfo") or "").splitlines():
+            if "model name" in line:
+                return line.split(":", 1)[1].strip()
+    return platform.processor()
+
+
+@inventory.fact("cpu_counts")
+def _read_cpu_counts():
+    return [hostfs.call("cpu_count:physical", psutil.cpu_count, logical=False),
+            hostfs.call("cpu_count:logical", psutil.cpu_count, logical=True)]
+
+
+@inventory.fact("motherboard")
+def _read_motherboard():
+    return {
+        "vendor": hostfs.read(DMI_BASE + "board_vendor"),
+        "name": hostfs.read(DMI_BASE + "board_name"),
+        "version": hostfs.read(DMI_BASE + "board_version"),
+        "serial": hostfs.read(DMI_BASE + "board_serial"),
+    }
+
+
+@inventory.fact("distro", watch="/etc/os-release")
+def _read_distro():
+    release = hostfs.read("/etc/os-release")
+    if release is None:
+        return "Unknown Linux Distro"
+    for line in release.splitlines():
+        if line.startswith("PRETTY_NAME="):
+            return line.split("=")[1].strip().strip('"')
+    return ""
+
+
+def _dedicated_gpus():
+    # Dedicated AMD / NVIDIA display devices (VGA or 3D controllers, no APUs)
+    return [
+        dev for dev in devices.pci_display_devices()
+        if dev.vendor_id in (devices.VENDOR_NVIDIA, devices.VENDOR_AMD)
+        and dev.class_id in (0x0300, 0x0302)
+        and "APU" not in devices.pci_name(dev)
+    ]
+
+
+def _gpu_fact(dev, vram=None):
+    return {
+        "name": devices.pci_name(dev),
+        "description": devices.format_pci(dev),
+        "vendor_id": dev.vendor_id,
+        "link_width": dev.link_width,
+        "max_link_width": dev.max_link_width,
+        "vram": vram,
+    }
+
+
+@inventory.fact("dedicated_gpus", watch="/sys/bus/pci/devices")
+def _probe_dedicated_gpus():
+    gpus = []
+    for dev in _dedicated_gpus():
+        vram = None
+        if dev.vendor_id == devices.VENDOR_NVIDIA:
+            vram = hostfs.command(["nvidia-smi", "--query-gpu=memory.total",
+                                   "--format=csv,noheader,nounits"], ttl=60).strip()
+            vram = f"{vram.splitlines()[0]} MB" if vram else None
+        elif dev.vendor_id == devices.VENDOR_AMD:
+            total = hostfs.read(f"/sys/bus/pci/devices/{dev.slot}/mem_info_vram_total")
+            vram = f"{int(total) // 2**20} MB" if total and total.isdigit() else None
+        gpus.append(_gpu_fact(dev, vram))
+    return gpus
+
+
+@inventory.fact("intel_gpus", watch="/sys/bus/pci/devices")
+def _probe_intel_gpus():
+    return [_gpu_fact(dev) for dev in devices.pci_display_devices()
+            if dev.vendor_id == devices.VENDOR_INTEL]
+
+
+@inventory.fact("amdgpu_cards", watch="/sys/class/drm")
+def _probe_amdgpu_cards():
+    return amdgpu.cards()
+
+
+@inventory.fact("keyboards", watch="/sys/bus/usb/devices")
+def _probe_keyboards():
+    return devices.usb_matching("keyboard", devices.HID_KEYBOARD)
+
+
+@inventory.fact("mice", watch="/sys/bus/usb/devices")
+def _probe_mice():
+    return devices.usb_matching("mouse", devices.HID_MOUSE)
+
+
+# ---------- Collectors ---------- #
+
+@collector("usage", interval=0.25)
+def _usage(snap):
+    return Usage(snap.cpu_percent(), snap.virtual_memory().percent, snap.disk_usage().percent)
+
+
+@collector("cpu")
+def _cpu(snap):
+    freq = hostfs.call("cpu_freq", psutil.cpu_freq)
+    cores, threads = inventory.get("cpu_counts") or (None, None)
+    return Cpu(inventory.get("cpu_name"), freq.current if freq else None, cores, threads)
+
+
+@collector("memory")
+def _memory(snap):
+    mem = snap.virtual_memory()
+    return Memory(mem.total, mem.used, mem.available, mem.percent)
+
+
+@collector("swap", interval=2.0)
+def _swap(snap):
+    swap = hostfs.call("swap_memory", psutil.swap_memory)
+    return Swap(swap.total, swap.used, swap.percent)
+
+
+@collector("disk", interval=5.0)
+def _disk(snap):
+    disk = snap.disk_usage()
+    return Disk("/", disk.total, disk.used, disk.free, disk.percent)
+
+
+@collector("disk_io")
+def _disk_io(snap):
+    io = hostfs.call("disk_io_counters", psutil.disk_io_counters)
+    return DiskIo(io.read_bytes, io.write_bytes) if io else None
+
+
+@collector("system")
+def _system(snap):
+    try:
+        user = os.getlogin()
+    except OSError:
+        user = getpass.getuser()  # no controlling terminal (daemon, cron, pipes)
+    size = shutil.get_terminal_size()
+    system, release, machine = hostfs.call(
+        "platform", lambda: [platform.system(), platform.release(), platform.machine()])
+    return System(system, release, machine,
+                  time.time() - hostfs.call("boot_time", psutil.boot_time), user,
+                  size.columns, size.lines, hostfs.exists(RESIZABLE_BAR))
+
+
+@collector("network")
+def _network(snap):
+    return [NetInterface(iface, data.bytes_sent, data.bytes_recv)
+            for iface, data in hostfs.call("net_io_counters", psutil.net_io_counters, pernic=True).items()]
+
+
+PROCESSES = processes.ProcessTable()  # keeps Process handles between ticks
+
+
+@collector("processes", interval=2.0)
+def _processes(snap):
+    return [ProcessRow(row["pid"], row["name"], row["cpu"], row["mem"], row["rss"], row["threads"])
+            for row in hostfs.call("processes:top5", PROCESSES.top, 5)]
+
+
+@collector("partitions", interval=5.0)
+def _partitions(snap):
+    parts = []
+    for part in hostfs.call("disk_partitions", psutil.disk_partitions, all=False):
+        try:
+            usage = hostfs.call("disk_usage:" + part.mountpoint, psutil.disk_usage, hostfs.path(part.mountpoint))
+            total, used, percent = usage.total, usage.used, usage.percent
+        except (OSError, LookupError):
+            total = used = percent = None
+        parts.append(Partition(part.device, part.mountpoint, part.fstype, total, used, percent))
+    return parts
+
+
+@collector("fans", interval=2.0)
+def _fans(snap):
+    return [Fan(chip, sensor, int(rpm), device) for chip, device, sensor, _, rpm in snap.hwmon().get("fans", [])]
+
+
+@collector("temperatures", interval=2.0)
+def _temperatures(snap):
+    # hwmon's batched read where the host has it; psutil covers thermal
+    # zones and other platforms
+    temps = snap.hwmon().get("temperatures")
+    if temps:
+        return [Temperature(chip, label, current, device) for chip, device, _, label, current in temps]
+    return [Temperature(chip, entry.label, entry.current, chip)
+            for chip, entries in snap.temperatures().items() for entry in entries]
+
+
+@collector("voltages", interval=2.0)
+def _voltages(snap):
+    return [Voltage(chip, sensor, label, volts, device)
+            for chip, device, sensor, label, volts in snap.hwmon().get("voltages", [])]
+
+
+@collector("power", interval=2.0)
+def _power(snap):
+    return [Power(chip, sensor, label, watts, device)
+            for chip, device, sensor, label, watts in snap.hwmon().get("power", [])]
+
+
+@collector("battery", interval=10.0)
+def _battery(snap):
+    bat = snap.battery()
+    return Battery(bat.percent, bat.power_plugged, bat.secsleft) if bat is not None else None
+
+
+@collector("gpus", interval=engine.ON_CHANGE)
+def _gpus(snap):
+    if platform.system() != "Linux":
+        return []
+    return [Gpu(**gpu) for gpu in inventory.get("dedicated_gpus") or []]
+
+
+@collector("intel_gpus", interval=engine.ON_CHANGE)
+def _intel_gpus(snap):
+    if platform.system() != "Linux":
+        return []
+    return [Gpu(**gpu) for gpu in inventory.get("intel_gpus") or []]
+
+
+@collector("amdgpu")
+def _amdgpu(snap):
+    return [GpuTelemetry(**amdgpu.reading(card)) for card in inventory.get("amdgpu_cards") or []]
+
+
+def _nvidia_readings():
+    # Only the live host has an nvidia-smi worth asking (replay answers
+    # from the archive, a --root tree has none)
+    return nvidia.shared().latest() if hostfs.live() else []
+
+
+@collector("nvidia")
+def _nvidia(snap):
+    if not any(gpu.vendor_id == devices.VENDOR_NVIDIA for gpu in get("gpus", snap)):
+        return []
+    return [GpuTelemetry(**reading) for reading in hostfs.call("nvidia_smi", _nvidia_readings)]
+
+
+@collector("board", interval=engine.ON_CHANGE)
+def _board(snap):
+    if platform.system() != "Linux":
+        return None
+    return Board(**(inventory.get("motherboard") or dict.fromkeys(Board.__slots__)))
+
+
+@collector("os", interval=engine.ON_CHANGE)
+def _os(snap):
+    system = platform.system()
+    if system == "Linux":
+        return OsInfo(system, inventory.get("distro"), platform.release())
+    if system == "Darwin":
+        return OsInfo(system, None, platform.mac_ver()[0])
+    return OsInfo(system, None, platform.version())
+
+
+@collector("keyboards", interval=engine.ON_CHANGE)
+def _keyboards(snap):
+    if platform.system() != "Linux":
+        return []
+    return [Device(line) for line in inventory.get("keyboards") or []]
+
+
+@collector("mice", interval=engine.ON_CHANGE)
+def _mice(snap):
+    if platform.system() != "Linux":
+        return []
+    return [Device(line) for line in inventory.get("mice") or []]
+
+
+@collector("wifi", interval=10.0)
+def _wifi(snap):
+    if platform.system() != "Linux":
+        return []
+    output = hostfs.command(["iwconfig"], timeout=2, ttl=5)
+    return [Device(line.strip()) for line in output.splitlines() if "ESSID" in line]
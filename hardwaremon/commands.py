@@ -0,0 +1,90 @@
+import subprocess
+import threading
+import time
+
+# ---------- External Commands ---------- #
+# Every helper program (iwconfig, nvidia-smi...) runs through run(): argv
+# without a shell, a timeout so a wedged tool can't hang a refresh, at most
+# MAX_CHILDREN at once, one process for identical commands already running
+# (later callers wait for its output), and an optional per-call TTL during
+# which the last output is reused. STATS counts what happened.
+
+DEFAULT_TIMEOUT = 5.0
+MAX_CHILDREN = 4
+
+STATS = {"spawns": 0, "timeouts": 0, "failures": 0, "cache_hits": 0, "shared": 0}
+
+_slots = threading.BoundedSemaphore(MAX_CHILDREN)
+_lock = threading.Lock()
+_cache = {}      # argv tuple -> (expires, output)
+_running = {}    # argv tuple -> _Pending
+
+
+class _Pending:
+    __slots__ = ("done", "output")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.output = ""
+
+
+def _count(name):
+    with _lock:
+        STATS[name] += 1
+
+
+def _execute(argv, timeout):
+    with _slots:
+        _count("spawns")
+        try:
+            result = subprocess.run(argv, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                    stdin=subprocess.DEVNULL, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            _count("timeouts")  # run() has already killed it
+            return ""
+        except (OSError, ValueError):
+            _count("failures")  # not installed, not executable...
+            return ""
+    if result.returncode != 0 and not result.stdout:
+        _count("failures")
+    return result.stdout
+
+
+def run(argv, timeout=DEFAULT_TIMEOUT, ttl=0):
+    # stdout of argv ("" if it can't be run, fails silently or times out)
+    key = tuple(argv)
+    with _lock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            STATS["cache_hits"] += 1
+            return cached[1]
+        pending = _running.get(key)
+        owner = pending is None
+        if owner:
+            pending = _running[key] = _Pending()
+        else:
+            STATS["shared"] += 1
+    if not owner:
+        pending.done.wait()
+        return pending.output
+
+    try:
+        pending.output = _execute(list(argv), timeout)
+    finally:
+        with _lock:
+            del _running[key]
+            if ttl:
+                _cache[key] = (time.monotonic() + ttl, pending.output)
+        pending.done.set()
+    return pending.output
+
+
+def clear():
+    with _lock:
+        _cache.clear()
+
+
+def summary():
+    with _lock:
+        return ("commands: {spawns} run, {timeouts} timed out, {failures} failed, "
+                "{cache_hits} from cache, {shared} shared").format(**STATS)
@@ -0,0 +1,106 @@
+import argparse
+import math
+import signal
+import sys
+import time
+
+from hardwaremon import collectors, snapshot, timeseries
+
+# ---------- Headless Collector Daemon ---------- #
+# `hardwaremon daemon` samples once per interval and appends a record to the
+# memory-mapped ring (see timeseries.py). The GUI and CLI backfill their
+# history from the same file when they start. A collector that fails
+# leaves NaN in its fields for that tick (reported on stderr the first
+# time) instead of stopping the daemon.
+
+FLUSH_EVERY = 60  # records between msync calls
+MISSING = math.nan
+
+_reported = set()  # collectors whose failure has been reported
+
+
+class RateCounter:
+    # Turns ever-growing byte counters into per-second rates
+    def __init__(self):
+        self.last = None
+
+    def update(self, t, counters):
+        previous, self.last = self.last, (t, counters)
+        if previous is None or t <= previous[0]:
+            return [0.0] * len(counters)
+        dt = t - previous[0]
+        return [max(0.0, (now - before) / dt) for now, before in zip(counters, previous[1])]
+
+
+def _get(name, snap):
+    try:
+        return collectors.get(name, snap)
+    except Exception as e:
+        if name not in _reported:
+            _reported.add(name)
+            print(f"hardwaremon daemon: {name} unavailable: {type(e).__name__}: {e}", file=sys.stderr)
+        return MISSING
+
+
+def sample(net_rates, disk_rates):
+    snap = snapshot.tick()
+    t = time.time()
+    usage = _get("usage", snap)
+    nics = _get("network", snap)
+    io = _get("disk_io", snap)
+    swap = _get("swap", snap)
+    if nics is MISSING:
+        sent = recv = MISSING
+    else:
+        sent, recv = net_rates.update(t, [sum(n.sent for n in nics), sum(n.recv for n in nics)])
+    if io is MISSING:
+        read = write = MISSING
+    else:
+        read, write = disk_rates.update(t, [io.read_bytes, io.write_bytes]) if io else (0.0, 0.0)
+    return t, {
+        "cpu": getattr(usage, "cpu", MISSING),
+        "mem": getattr(usage, "mem", MISSING),
+        "disk": getattr(usage, "disk", MISSING),
+        "swap": getattr(swap, "percent", MISSING),
+        "net_sent": sent,
+        "net_recv": recv,
+        "disk_read": read,
+        "disk_write": write,
+    }
+
+
+def run(path=None, interval=1.0, capacity=timeseries.DEFAULT_CAPACITY, count=None):
+    ring = timeseries.RingFile(path, capacity=capacity, writable=True)
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+
+    net_rates, disk_rates = RateCounter(), RateCounter()
+    written = 0
+    try:
+        while not stopping and (count is None or written < count):
+            started = time.monotonic()
+            t, values = sample(net_rates, disk_rates)
+            ring.append(values, t)
+            written += 1
+            if written % FLUSH_EVERY == 0:
+                ring.flush()
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        ring.flush()
+        ring.close()
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="hardwaremon daemon",
+                                     description="Collect hardware stats headless into a ring file")
+    parser.add_argument("--path", default=None,
+                        help="ring file (default: ~/.cache/hardwaremon/history.ring)")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between samples")
+    parser.add_argument("--capacity", type=int, default=timeseries.DEFAULT_CAPACITY,
+                        help="records kept before the oldest is overwritten")
+    parser.add_argument("--count", type=int, default=None, help="stop after N samples")
+    args = parser.parse_args(argv)
+    run(args.path, args.interval, args.capacity, args.count)
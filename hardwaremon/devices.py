@@ -0,0 +1,237 @@
+import os
+import threading
+from collections import namedtuple
+
+from hardwaremon import hostfs
+
+# ---------- Native PCI / USB Enumeration ---------- #
+# Walks /sys/bus/{pci,usb}/devices directly instead of forking
+# `lspci | grep ...` / `lsusb | grep ...` pipelines. Names come from the
+# pci.ids / usb.ids databases, which are indexed lazily on first lookup.
+
+PCI_DEVICES = "/sys/bus/pci/devices"
+USB_DEVICES = "/sys/bus/usb/devices"
+
+PCI_IDS_PATHS = [
+    "/usr/share/hwdata/pci.ids",
+    "/usr/share/misc/pci.ids",
+    "/usr/share/pci.ids",
+    "/usr/share/pciids/pci.ids",
+]
+USB_IDS_PATHS = [
+    "/usr/share/hwdata/usb.ids",
+    "/usr/share/misc/usb.ids",
+    "/var/lib/usbutils/usb.ids",
+    "/usr/share/usb.ids",
+]
+
+VENDOR_NVIDIA = 0x10de
+VENDOR_AMD = 0x1002
+VENDOR_INTEL = 0x8086
+
+# Used when no ids database is installed, so the common cases still read well
+FALLBACK_VENDORS = {
+    0x10de: "NVIDIA Corporation",
+    0x1002: "Advanced Micro Devices, Inc. [AMD/ATI]",
+    0x1022: "Advanced Micro Devices, Inc. [AMD]",
+    0x8086: "Intel Corporation",
+}
+FALLBACK_CLASSES = {
+    0x0300: "VGA compatible controller",
+    0x0301: "XGA compatible controller",
+    0x0302: "3D controller",
+    0x0380: "Display controller",
+}
+
+PciDevice = namedtuple(
+    "PciDevice",
+    ["slot", "class_id", "vendor_id", "device_id", "revision",
+     "link_width", "max_link_width"]
+)
+UsbDevice = namedtuple(
+    "UsbDevice",
+    ["busnum", "devnum", "vendor_id", "product_id", "manufacturer",
+     "product", "interfaces"]
+)
+
+
+class IdsDatabase:
+    def __init__(self, paths):
+        self.paths = paths
+        self.path = None
+        self._index = None     # "vendor id" / "C class id" -> byte offset
+        self._blocks = {}      # parsed child entries, per indexed header
+        self._lock = threading.Lock()  # sections look devices up from worker threads
+
+    def _build_index(self):
+        # Filled locally and published in one go, so no lookup sees half an index
+        index = {}
+        self.path = next((p for p in self.paths if os.path.exists(p)), None)
+        if self.path:
+            offset = 0
+            with open(self.path, "rb") as f:
+                for line in f:
+                    # Only top-level lines are indexed; children are parsed on demand
+                    if line[:1] not in (b"\t", b"#", b"\n"):
+                        key = line.split(b"  ", 1)[0].decode("ascii", "replace").lower()
+                        index.setdefault(key, offset)
+                    offset += len(line)
+        self._index = index
+
+    def _entry(self, key):
+        with self._lock:
+            return self._load_entry(key)
+
+    def _load_entry(self, key):
+        if self._index is None:
+            self._build_index()
+        if key in self._blocks:
+            return self._blocks[key]
+        block = None
+        offset = self._index.get(key)
+        if offset is not None:
+            children = {}
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                name = f.readline().decode("utf-8", "replace").split("  ", 1)[-1].strip()
+                for raw in f:
+                    if raw[:1] == b"#":
+                        continue
+                    if raw[:1] != b"\t":
+                        break
+                    if raw[:2] == b"\t\t":
+                        continue  # subsystems / prog-ifs aren't shown
+                    child, _, child_name = raw.decode("utf-8", "replace").strip().partition("  ")
+                    children[child.lower()] = child_name.strip()
+            block = (name, children)
+        self._blocks[key] = block
+        return block
+
+    def vendor(self, vendor_id):
+        entry = self._entry(f"{vendor_id:04x}")
+        return entry[0] if entry else None
+
+    def device(self, vendor_id, device_id):
+        entry = self._entry(f"{vendor_id:04x}")
+        return entry[1].get(f"{device_id:04x}") if entry else None
+
+    def device_class(self, class_id):
+        # class_id is the 16-bit base class + subclass, e.g. 0x0300
+        entry = self._entry(f"c {class_id >> 8:02x}")
+        if not entry:
+            return None
+        return entry[1].get(f"{class_id & 0xff:02x}") or entry[0]
+
+
+PCI_IDS = IdsDatabase(PCI_IDS_PATHS)
+USB_IDS = IdsDatabase(USB_IDS_PATHS)
+
+
+_read = hostfs.read
+
+
+def _read_int(path, base=16):
+    value = _read(path)
+    try:
+        return int(value, base) if value else None
+    except ValueError:
+        return None
+
+
+def pci_devices():
+    devices = []
+    try:
+        entries = sorted(hostfs.listdir(PCI_DEVICES))
+    except OSError:
+        return devices
+    for slot in entries:
+        path = os.path.join(PCI_DEVICES, slot)
+        cls = _read_int(os.path.join(path, "class"))
+        devices.append(PciDevice(
+            slot=slot,
+            class_id=(cls >> 8) if cls is not None else None,
+            vendor_id=_read_int(os.path.join(path, "vendor")),
+            device_id=_read_int(os.path.join(path, "device")),
+            revision=_read_int(os.path.join(path, "revision")),
+            link_width=_read_int(os.path.join(path, "current_link_width"), 10),
+            max_link_width=_read_int(os.path.join(path, "max_link_width"), 10),
+        ))
+    return devices
+
+
+def pci_display_devices():
+    return [d for d in pci_devices() if d.class_id is not None and d.class_id >> 8 == 0x03]
+
+
+def pci_name(dev):
+    vendor = PCI_IDS.vendor(dev.vendor_id) or FALLBACK_VENDORS.get(dev.vendor_id) \
+        or f"Device {dev.vendor_id:04x}"
+    device = PCI_IDS.device(dev.vendor_id, dev.device_id) or f"Device {dev.device_id:04x}"
+    name = f"{vendor} {device}"
+    if dev.revision:
+        name += f" (rev {dev.revision:02x})"
+    return name
+
+
+def format_pci(dev):
+    # Same shape as an `lspci` line: "01:00.0 VGA compatible controller: NVIDIA ..."
+    slot = dev.slot[5:] if dev.slot.startswith("0000:") else dev.slot
+    cls = PCI_IDS.device_class(dev.class_id) or FALLBACK_CLASSES.get(dev.class_id) \
+        or f"Class {dev.class_id:04x}"
+    return f"{slot} {cls}: {pci_name(dev)}"
+
+
+def usb_devices():
+    devices = []
+    try:
+        entries = sorted(hostfs.listdir(USB_DEVICES))
+    except OSError:
+        return devices
+    for entry in entries:
+        if ":" in entry:
+            continue  # interfaces are collected with their device below
+        path = os.path.join(USB_DEVICES, entry)
+        vendor_id = _read_int(os.path.join(path, "idVendor"))
+        if vendor_id is None:
+            continue
+        interfaces = []
+        for iface in entries:
+            if iface.startswith(entry + ":"):
+                ipath = os.path.join(USB_DEVICES, iface)
+                interfaces.append((
+                    _read_int(os.path.join(ipath, "bInterfaceClass")),
+                    _read_int(os.path.join(ipath, "bInterfaceSubClass")),
+                    _read_int(os.path.join(ipath, "bInterfaceProtocol")),
+                ))
+        devices.append(UsbDevice(
+            busnum=_read_int(os.path.join(path, "busnum"), 10) or 0,
+            devnum=_read_int(os.path.join(path, "devnum"), 10) or 0,
+            vendor_id=vendor_id,
+            product_id=_read_int(os.path.join(path, "idProduct")) or 0,
+            manufacturer=_read(os.path.join(path, "manufacturer")),
+            product=_read(os.path.join(path, "product")),
+            interfaces=interfaces,
+        ))
+    return devices
+
+
+def format_usb(dev):
+    # Same shape as an `lsusb` line: "Bus 001 Device 003: ID 046d:c52b Logitech, Inc. ..."
+    vendor = USB_IDS.vendor(dev.vendor_id) or dev.manufacturer or ""
+    product = USB_IDS.device(dev.vendor_id, dev.product_id) or dev.product or ""
+    name = f"{vendor} {product}".strip()
+    return (f"Bus {dev.busnum:03d} Device {dev.devnum:03d}: "
+            f"ID {dev.vendor_id:04x}:{dev.product_id:04x} {name}").rstrip()
+
+
+HID_KEYBOARD = (0x03, 0x01, 0x01)  # HID boot-protocol keyboard
+HID_MOUSE = (0x03, 0x01, 0x02)     # HID boot-protocol mouse
+
+
+def usb_matching(word, hid_protocol=None):
+    lines = []
+    for dev in usb_devices():
+        line = format_usb(dev)
+        if word in line.lower() or (hid_protocol and hid_protocol in dev.interfaces):
+            lines.append(line)
+    return lines
@@ -0,0 +1,196 @@
+import queue
+import threading
+import time
+
+# ---------- Background Collection Engine ---------- #
+# Collectors run on worker threads; finished results go into a queue that
+# the UI drains from root.after, so the Tk thread only ever renders. A
+# collector that overruns its deadline (slow nvidia-smi, hung NFS mount...)
+# is reported as stale and is not resubmitted until it comes back.
+#
+# Each collector runs on its own interval (CPU every 250 ms, disks every few
+# seconds...). The ticker sleeps until the earliest one is due and submits
+# everything due within COALESCE of it in the same round, so several
+# intervals still share one wake-up and one snapshot. A collector whose
+# result didn't change has its interval doubled, up to MAX_BACKOFF times
+# the declared one; ON_CHANGE collectors run once and then only when
+# changed(name) says so, checked every CHANGE_POLL seconds.
+
+DEFAULT_INTERVAL = 1.0   # seconds between runs of a collector without its own interval
+DEFAULT_DEADLINE = 2.0   # seconds before an in-flight collector counts as stale
+DEFAULT_WORKERS = 4
+
+ON_CHANGE = None         # interval for collectors that only rerun when changed
+COALESCE = 0.05          # seconds a collector may run early to share a round
+MAX_BACKOFF = 4          # unchanged results stretch an interval up to this factor
+CHANGE_POLL = 5.0        # seconds between changed() checks for ON_CHANGE collectors
+
+
+class CollectionEngine:
+    def __init__(self, collectors, interval=DEFAULT_INTERVAL, deadlines=None,
+                 workers=DEFAULT_WORKERS, on_tick=None, intervals=None, changed=None, steady=()):
+        self.collectors = dict(collectors)   # name -> function
+        self.interval = interval
+        self.intervals = dict(intervals or {})  # name -> seconds or ON_CHANGE
+        self.deadlines = deadlines or {}
+        self.on_tick = on_tick               # runs on the ticker thread before each round
+        self.changed = changed               # changed(name) -> bool, for ON_CHANGE collectors
+        self.steady = set(steady)            # never backed off (e.g. history sampling)
+        self.active = set(self.collectors)
+        self.workers = workers
+
+        self.results = queue.Queue()
+        self.latest = {}      # name -> last good result
+        self.errors = {}      # name -> exception from the last run, if it failed
+        self.finished = {}    # name -> monotonic time of the last result
+
+        self._jobs = queue.Queue()
+        self._started = {}    # name -> monotonic start time of the in-flight run
+        self._due = {}        # name -> monotonic time of its next run (or change check)
+        self._backoff = {}    # name -> current interval multiplier
+        self._ran = set()     # ON_CHANGE collectors that have run at least once
+        self._last = {}       # name -> previous result, to spot unchanged values
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+
+    def start(self):
+        # Plain daemon threads rather than a ThreadPoolExecutor: a collector
+        # stuck in a syscall must not block interpreter exit.
+        for i in range(self.workers):
+            threading.Thread(target=self._worker, name=f"hardwaremon-worker-{i}",
+                             daemon=True).start()
+        threading.Thread(target=self._loop, name="hardwaremon-ticker", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        for _ in range(self.workers):
+            self._jobs.put(None)
+
+    def set_active(self, names):
+        self.active = set(names)
+        self._wake.set()  # newly active collectors are due right away
+
+    def set_interval(self, name, interval):
+        with self._lock:
+            if self.intervals.get(name, self.interval) != interval:
+                self.intervals[name] = interval
+                self._due.pop(name, None)
+        self._wake.set()
+
+    def effective_interval(self, name):
+        # Declared interval times the current backoff; ON_CHANGE stays None
+        base = self.intervals.get(name, self.interval)
+        return None if base is ON_CHANGE else base * self._backoff.get(name, 1)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            due = self.due(time.monotonic())
+            if due:
+                self.tick(due)
+            self._wake.wait(max(0.0, self.next_wakeup() - time.monotonic()))
+            self._wake.clear()
+
+    def due(self, now):
+        # Names to run this round; ON_CHANGE collectors whose change check
+        # came up empty are just rescheduled
+        names = []
+        for name in list(self.active):
+            interval = self.effective_interval(name)
+            # pulled forward by at most a quarter of its own interval
+            slack = COALESCE if interval is None else min(COALESCE, interval / 4)
+            if self._due.get(name, now) > now + slack:
+                continue
+            if self.intervals.get(name, self.interval) is ON_CHANGE and name in self._ran:
+                self._due[name] = now + CHANGE_POLL
+                try:
+                    if not (self.changed and self.changed(name)):
+                        continue
+                except Exception:
+                    continue
+            names.append(name)
+        return names
+
+    def next_wakeup(self):
+        now = time.monotonic()
+        return min((self._due.get(name, now) for name in list(self.active)), default=now + CHANGE_POLL)
+
+    def tick(self, names=None):
+        if self.on_tick:
+            try:
+                self.on_tick()
+            except Exception:
+                pass
+        self.submit(names)
+
+    def submit(self, names=None):
+        now = time.monotonic()
+        for name in list(self.active if names is None else names):
+            interval = self.effective_interval(name)
+            self._due[name] = now + (CHANGE_POLL if interval is None else interval)
+            with self._lock:
+                if name in self._started:
+                    continue  # previous run still going, don't pile up behind it
+                self._started[name] = now
+            self._jobs.put(name)
+
+    def _worker(self):
+        while True:
+            name = self._jobs.get()
+            if name is None:
+                return
+            try:
+                value, error = self.collectors[name](), None
+            except Exception as e:
+                value, error = None, e
+            with self._lock:
+                self._started.pop(name, None)
+                if error is None:
+                    self._adapt(name, value)
+            self.results.put((name, value, error, time.monotonic()))
+
+    def drain(self):
+        # Call from the UI thread; returns the names that got a new result
+        changed = []
+        while True:
+            try:
+                name, value, error, finished = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.finished[name] = finished
+            if error is None:
+                self.latest[name] = value
+                self.errors.pop(name, None)
+            else:
+                self.errors[name] = error
+            changed.append(name)
+        return changed
+
+    def _adapt(self, name, value):
+        # Called with the lock held, on the worker that produced value
+        previous = self._last.get(name)
+        self._last[name] = value
+        if self.intervals.get(name, self.interval) is ON_CHANGE:
+            self._ran.add(name)
+        elif previous is not None and value == previous and name not in self.steady:
+            self._backoff[name] = min(self._backoff.get(name, 1) * 2, MAX_BACKOFF)
+        else:
+            self._backoff.pop(name, None)
+
+    def deadline(self, name):
+        return self.deadlines.get(name, DEFAULT_DEADLINE)
+
+    def is_stale(self, name):
+        now = time.monotonic()
+        with self._lock:
+            started = self._started.get(name)
+        if started is not None and now - started > self.deadline(name):
+            return True
+        if name in self.errors:
+            return True
+        finished = self.finished.get(name)
+        if finished is None:
+            return True
+        interval = self.effective_interval(name)
+        return interval is not None and now - finished > interval + self.deadline(name)
@@ -0,0 +1,245 @@
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import psutil
+
+from hardwaremon import collectors, hostfs, snapshot
+
+# ---------- OpenMetrics / Prometheus Exporter ---------- #
+# A background thread samples every `interval` seconds and stores the
+# metric families. Scrapes only ever read that cache: each exposition
+# format is serialized at most once per sample and then served as bytes.
+
+DEFAULT_PORT = 9717
+OPENMETRICS_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+class Family:
+    __slots__ = ("name", "kind", "help", "samples")
+
+    def __init__(self, name, kind, help):
+        self.name = name
+        self.kind = kind       # "gauge" or "counter"
+        self.help = help
+        self.samples = []      # [(labels dict, value)]
+
+    def add(self, value, **labels):
+        if value is not None:
+            self.samples.append((labels, value))
+        return self
+
+
+def _devices():
+    # Series must be unique. hwmon sensors are told apart by their hwmonN
+    # device; psutil's can repeat it, so repeats get "-2", "-3"...
+    seen = {}
+
+    def device(record, sensor):
+        key = (record.chip, record.device, sensor)
+        seen[key] = seen.get(key, 0) + 1
+        return record.device if seen[key] == 1 else f"{record.device}-{seen[key]}"
+    return device
+
+
+def collect():
+    snap = snapshot.tick()
+    families = []
+
+    def get(name, missing=None):
+        # A collector that can't be read drops its families, not the whole sample
+        try:
+            return collectors.get(name, snap)
+        except Exception:
+            return missing
+
+    def family(name, kind, help):
+        fam = Family(f"hardwaremon_{name}", kind, help)
+        families.append(fam)
+        return fam
+
+    usage = get("usage")
+    if usage:
+        family("cpu_usage_percent", "gauge", "CPU utilisation across all cores.").add(usage.cpu)
+    try:
+        loadavg = hostfs.call("getloadavg", psutil.getloadavg) if hasattr(psutil, "getloadavg") else None
+    except Exception:
+        loadavg = None
+    if loadavg:
+        load = family("load_average", "gauge", "System load average.")
+        for period, value in zip(("1m", "5m", "15m"), loadavg):
+            load.add(value, period=period)
+
+    mem = get("memory")
+    if mem:
+        family("memory_total_bytes", "gauge", "Total physical memory.").add(mem.total)
+        family("memory_used_bytes", "gauge", "Used physical memory.").add(mem.used)
+        family("memory_usage_percent", "gauge", "Physical memory utilisation.").add(mem.percent)
+    swap = get("swap")
+    if swap:
+        family("swap_usage_percent", "gauge", "Swap utilisation.").add(swap.percent)
+
+    used = family("disk_used_bytes", "gauge", "Used space per mounted filesystem.")
+    total = family("disk_total_bytes", "gauge", "Size of each mounted filesystem.")
+    for part in get("partitions", []):
+        used.add(part.used, mountpoint=part.mountpoint, device=part.device)
+        total.add(part.total, mountpoint=part.mountpoint, device=part.device)
+    io = get("disk_io")
+    if io:
+        family("disk_read_bytes", "counter", "Bytes read from all disks.").add(io.read_bytes)
+        family("disk_written_bytes", "counter", "Bytes written to all disks.").add(io.write_bytes)
+
+    sent = family("network_transmit_bytes", "counter", "Bytes sent per interface.")
+    recv = family("network_receive_bytes", "counter", "Bytes received per interface.")
+    for nic in get("network", []):
+        sent.add(nic.sent, interface=nic.name)
+        recv.add(nic.recv, interface=nic.name)
+
+    device = _devices()
+    fans = family("fan_speed_rpm", "gauge", "Fan speed from hwmon.")
+    for fan in get("fans", []):
+        fans.add(fan.rpm, chip=fan.chip, device=device(fan, fan.sensor), sensor=fan.sensor)
+
+    temps = family("temperature_celsius", "gauge", "Temperature sensors.")
+    index = {}
+    for temp in get("temperatures", []):
+        index[temp.device] = index.get(temp.device, 0) + 1
+        sensor = temp.label or f"temp{index[temp.device]}"
+        temps.add(temp.current, chip=temp.chip, device=device(temp, sensor), sensor=sensor)
+
+    volts = family("voltage_volts", "gauge", "Voltage sensors from hwmon.")
+    for volt in get("voltages", []):
+        sensor = volt.label or volt.sensor
+        volts.add(volt.volts, chip=volt.chip, device=device(volt, sensor), sensor=sensor)
+
+    power = family("power_watts", "gauge", "Power sensors from hwmon.")
+    for reading in get("power", []):
+        sensor = reading.label or reading.sensor
+        power.add(reading.watts, chip=reading.chip, device=device(reading, sensor), sensor=sensor)
+
+    bat = get("battery")
+    if bat is not None:
+        family("battery_percent", "gauge", "Battery charge.").add(bat.percent)
+        family("battery_plugged", "gauge", "1 when on AC power.").add(int(bool(bat.plugged)))
+
+    return families
+
+
+def serialize(families, openmetrics=True):
+    out = []
+    for fam in families:
+        if not fam.samples:
+            continue
+        # OpenMetrics names the family without _total; the 0.0.4 text format with it
+        counter = fam.kind == "counter"
+        name = fam.name if openmetrics or not counter else fam.name + "_total"
+        out.append(f"# HELP {name} {fam.help}")
+        out.append(f"# TYPE {name} {fam.kind}")
+        sample_name = fam.name + "_total" if counter else fam.name
+        for labels, value in fam.samples:
+            out.append(f"{sample_name}{_labels(labels)} {value}")
+    if openmetrics:
+        out.append("# EOF")
+    return ("\n".join(out) + "\n").encode()
+
+
+class MetricsCache:
+    def __init__(self, interval=5.0, collect=collect):
+        self.interval = interval
+        self.collect = collect
+        self.families = []
+        self.generation = 0
+        self.sampled_at = None
+        self._encoded = {}    # openmetrics flag -> bytes for the current generation
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def sample(self):
+        families = self.collect()
+        with self._lock:
+            self.families = families
+            self.generation += 1
+            self.sampled_at = time.time()
+            self._encoded = {}
+
+    def start(self):
+        self.sample()
+        threading.Thread(target=self._loop, name="hardwaremon-exporter", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception:
+                pass  # keep serving the previous sample
+
+    def payload(self, openmetrics=True):
+        with self._lock:
+            body = self._encoded.get(openmetrics)
+            if body is None:
+                body = self._encoded[openmetrics] = serialize(self.families, openmetrics)
+            return body
+
+
+def make_handler(cache):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                body = b'<a href="/metrics">/metrics</a>\n'
+                self.send_response(200 if self.path == "/" else 404)
+                self.send_header("Content-Type", "text/html")
+            else:
+                openmetrics = "application/openmetrics-text" in self.headers.get("Accept", "")
+                body = cache.payload(openmetrics)
+                self.send_response(200)
+                self.send_header("Content-Type", OPENMETRICS_TYPE if openmetrics else PROMETHEUS_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # scrapes every few seconds would flood stderr
+
+    return MetricsHandler
+
+
+def serve(host="127.0.0.1", port=DEFAULT_PORT, interval=5.0):
+    cache = MetricsCache(interval)
+    cache.start()
+    server = ThreadingHTTPServer((host, port), make_handler(cache))
+    server.daemon_threads = True
+    return server, cache
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="hardwaremon exporter",
+                                     description="Serve hardware stats as OpenMetrics over HTTP")
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind (default: localhost only)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--interval", type=float, default=5.0, help="seconds between samples")
+    args = parser.parse_args(argv)
+
+    server, cache = serve(args.host, args.port, args.interval)
+    print(f"Serving metrics on http://{args.host}:{server.server_port}/metrics")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        cache.stop()
+        server.server_close()
@@ -0,0 +1,120 @@
+import argparse
+import os
+import random
+
+# ---------- Synthetic Host Trees ---------- #
+# Builds a fake /proc, /sys and /etc that psutil and the collectors accept,
+# sized like a big server: hundreds of CPUs, thousands of processes and
+# veth interfaces, hundreds of mounts, dozens of hwmon chips. Point
+# `--root` at the result (see hostfs.py) to run sections against it, or
+# use `hardwaremon bench --scale` to see how each one grows with host size.
+
+# Host size at scale 1; every count is multiplied by the scale
+BASE_SIZE = {"cpus": 4, "processes": 50, "interfaces": 32, "mounts": 4, "chips": 1}
+
+CHIP_NAMES = ("nct6775", "k10temp", "coretemp", "amdgpu", "nvme", "acpitz", "it8686")
+PROCESS_NAMES = ("postgres", "nginx", "java", "python3", "containerd", "kworker", "sshd", "redis")
+
+
+def sizes(scale=1):
+    return {name: count * scale for name, count in BASE_SIZE.items()}
+
+
+def _write(root, path, text):
+    full = os.path.join(root, path.lstrip("/"))
+    os.makedirs(os.path.dirname(full), exist_ok=True)
+    with open(full, "w") as f:
+        f.write(text)
+
+
+def _proc(root, cpus, processes, interfaces, mounts, rng):
+    cpu_line = "cpu{} {} 0 {} {} 0 0 0 0 0 0\n"
+    stat = [cpu_line.format(" ", 1000 * cpus, 500 * cpus, 50000 * cpus)]
+    stat += [cpu_line.format(i, 1000, 500, 50000) for i in range(cpus)]
+    stat.append("btime 1700000000\n")
+    _write(root, "/proc/stat", "".join(stat))
+
+    _write(root, "/proc/cpuinfo", "".join(
+        f"processor\t: {i}\nmodel name\t: Synthetic Server CPU @ 2.40GHz\n\n" for i in range(cpus)))
+    total_kb = 4 * 1024 * 1024 * max(1, cpus // 4)
+    _write(root, "/proc/meminfo", "".join(f"{key}:{value:>16} kB\n" for key, value in (
+        ("MemTotal", total_kb), ("MemFree", total_kb // 4), ("MemAvailable", total_kb // 2),
+        ("Buffers", 1024), ("Cached", total_kb // 8), ("SwapCached", 0), ("Active", total_kb // 4),
+        ("Inactive", total_kb // 8), ("SwapTotal", total_kb // 4), ("SwapFree", total_kb // 4),
+        ("Shmem", 1024), ("SReclaimable", 1024))))
+    _write(root, "/proc/vmstat", "pswpin 0\npswpout 0\n")
+    _write(root, "/proc/diskstats", "".join(
+        f" 252 {i} vd{i} 100 0 800 10 50 0 400 5 0 20 15 0 0 0 0\n" for i in range(mounts)))
+    _write(root, "/proc/sys/kernel/random/boot_id", "00000000-0000-4000-8000-000000000000\n")
+
+    _write(root, "/proc/filesystems", "nodev\tproc\nnodev\tsysfs\n\text4\n\txfs\n")
+    lines = ["/dev/vda1 / ext4 rw,relatime 0 0\n", "proc /proc proc rw 0 0\n"]
+    for i in range(mounts):
+        lines.append(f"/dev/vd{i + 1} /mnt/vol{i} {'xfs' if i % 2 else 'ext4'} rw,relatime 0 0\n")
+        os.makedirs(os.path.join(root, f"mnt/vol{i}"), exist_ok=True)
+    _write(root, "/proc/self/mounts", "".join(lines))
+
+    net = ["Inter-|   Receive                            |  Transmit\n",
+           " face |bytes    packets errs drop fifo frame compressed multicast|"
+           "bytes    packets errs drop fifo colls carrier compressed\n",
+           "    lo: 1000 10 0 0 0 0 0 0 1000 10 0 0 0 0 0 0\n"]
+    for i in range(interfaces):
+        name = "eth0" if i == 0 else f"veth{i:05x}"
+        rx, tx = rng.randrange(1 << 30), rng.randrange(1 << 30)
+        net.append(f"{name:>6}: {rx} {rx // 1000} 0 0 0 0 0 0 {tx} {tx // 1000} 0 0 0 0 0 0\n")
+    _write(root, "/proc/net/dev", "".join(net))
+
+    for pid in range(1, processes + 1):
+        name = f"{PROCESS_NAMES[pid % len(PROCESS_NAMES)]}{pid % 100}"
+        threads = 1 + pid % 32
+        fields = ["S", "1", str(pid), str(pid), "0", "-1", "4194304", "100", "0", "0", "0",
+                  str(rng.randrange(100000)), str(rng.randrange(50000)), "0", "0", "20", "0",
+                  str(threads), "0", str(pid * 10), str(rng.randrange(1 << 30)),
+                  str(rng.randrange(1 << 18))] + ["0"] * 14 + [str(pid % cpus), "0", "0", "0"]
+        _write(root, f"/proc/{pid}/stat", f"{pid} ({name}) {' '.join(fields)}\n")
+        pages = rng.randrange(1 << 18)
+        _write(root, f"/proc/{pid}/statm", f"{pages * 2} {pages} {pages // 4} 10 0 {pages} 0\n")
+        _write(root, f"/proc/{pid}/status",
+               f"Name:\t{name}\nState:\tS (sleeping)\nTgid:\t{pid}\nPid:\t{pid}\nPPid:\t1\n"
+               f"Uid:\t0\t0\t0\t0\nGid:\t0\t0\t0\t0\nThreads:\t{threads}\n"
+               f"voluntary_ctxt_switches:\t0\nnonvoluntary_ctxt_switches:\t0\n")
+
+
+def _sys(root, chips, rng):
+    for i in range(chips):
+        base = f"/sys/class/hwmon/hwmon{i}"
+        _write(root, base + "/name", CHIP_NAMES[i % len(CHIP_NAMES)] + "\n")
+        for j in range(1, 4):
+            _write(root, f"{base}/fan{j}_input", f"{rng.randrange(600, 2400)}\n")
+            _write(root, f"{base}/temp{j}_input", f"{rng.randrange(30000, 80000)}\n")
+            _write(root, f"{base}/temp{j}_label", f"Core {j - 1}\n")
+    dmi = "/sys/devices/virtual/dmi/id/"
+    for attr, value in (("board_vendor", "Synthetic Corp"), ("board_name", "SYN-9000"),
+                        ("board_version", "1.0"), ("board_serial", "0000")):
+        _write(root, dmi + attr, value + "\n")
+    os.makedirs(os.path.join(root, "sys/bus/pci/devices"), exist_ok=True)
+    os.makedirs(os.path.join(root, "sys/bus/usb/devices"), exist_ok=True)
+    _write(root, "/etc/os-release", 'PRETTY_NAME="Synthetic Linux 1.0"\n')
+
+
+def build(root, cpus=4, processes=50, interfaces=32, mounts=4, chips=1, seed=0):
+    rng = random.Random(seed)  # same tree every time for a given size
+    _proc(root, cpus, processes, interfaces, mounts, rng)
+    _sys(root, chips, rng)
+    return root
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="hardwaremon fixture",
+                                     description="Build a synthetic /proc + /sys tree for --root")
+    parser.add_argument("root", help="directory to create the tree in")
+    parser.add_argument("--scale", type=int, default=1, help=f"multiplier for {BASE_SIZE}")
+    for name in BASE_SIZE:
+        parser.add_argument(f"--{name}", type=int, default=None, help=f"override the {name} count")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    counts = sizes(args.scale)
+    counts.update({name: getattr(args, name) for name in BASE_SIZE if getattr(args, name) is not None})
+    build(args.root, seed=args.seed, **counts)
+    print(f"Built {args.root}: " + ", ".join(f"{count} {name}" for name, count in counts.items()))
@@ -0,0 +1,93 @@
+# ---------- Retained-Mode Canvas Graphs ---------- #
+# Canvas items (line, labels, grid) are created once and then moved with
+# canvas.coords / canvas.itemconfig, instead of canvas.delete("all") and a
+# rebuild on every frame. Grid and axis items are only repositioned when the
+# canvas is resized and only recoloured when the theme changes.
+
+GRID_STEPS = range(0, 101, 20)
+
+
+class LineGraph:
+    def __init__(self, canvas, label, color, fg=None, grid_color="#444444",
+                 padding=10, max_val=100, grid=False, title=None, smooth=True,
+                 font=("monospace", 10, "bold")):
+        self.canvas = canvas
+        self.label = label
+        self.padding = padding
+        self.max_val = max_val
+        self.data = []
+        self._size = None
+
+        self.line = canvas.create_line(0, 0, 0, 0, fill=color, width=2,
+                                       smooth=smooth, state="hidden")
+        self.value_text = canvas.create_text(5, 5, anchor="nw", text="",
+                                             fill=color, font=font)
+        self.title_text = None
+        if title:
+            self.title_text = canvas.create_text(0, 10, text=title, fill=fg or color,
+                                                 font=(font[0], 12, "bold"))
+        self.grid_lines = []
+        self.grid_labels = []
+        if grid:
+            for i in GRID_STEPS:
+                self.grid_lines.append(canvas.create_line(0, 0, 0, 0, fill=grid_color, dash=(2, 4)))
+                self.grid_labels.append(canvas.create_text(30, 0, text=f"{i}%", fill=fg or color,
+                                                           anchor="w", font=font))
+            canvas.tag_lower(self.line)
+            for item in self.grid_lines:
+                canvas.tag_lower(item)
+
+        canvas.bind("<Configure>", self._on_resize, add="+")
+
+    def size(self):
+        w = self.canvas.winfo_width()
+        h = self.canvas.winfo_height()
+        if w <= 1 or h <= 1:  # not mapped yet, fall back to the requested size
+            w, h = int(self.canvas["width"]), int(self.canvas["height"])
+        return w, h
+
+    def _on_resize(self, event=None):
+        self._size = None
+        self.update(self.data)
+
+    def _layout(self, w, h):
+        # Static items: only touched when the canvas size changes
+        self._size = (w, h)
+        if self.title_text is not None:
+            self.canvas.coords(self.title_text, w / 2, 10)
+        for i, line, label in zip(GRID_STEPS, self.grid_lines, self.grid_labels):
+            y = h - (i / 100) * h
+            self.canvas.coords(line, 0, y, w, y)
+            self.canvas.coords(label, 30, y - 10)
+
+    def update(self, data):
+        self.data = data
+        w, h = self.size()
+        if self._size != (w, h):
+            self._layout(w, h)
+
+        if len(data) < 2:
+            self.canvas.itemconfigure(self.line, state="hidden")
+            return
+
+        pad = self.padding
+        step_x = (w - 2 * pad) / (len(data) - 1)
+        scale = (h - 2 * pad) / self.max_val
+        points = []
+        for i, value in enumerate(data):
+            points.append(pad + i * step_x)
+            points.append(h - pad - value * scale)
+
+        self.canvas.coords(self.line, *points)
+        self.canvas.itemconfigure(self.line, state="normal")
+        self.canvas.itemconfigure(self.value_text, text=f"{self.label}: {data[-1]:.1f}%")
+
+    def set_theme(self, color, fg=None, bg=None):
+        if bg is not None:
+            self.canvas.configure(bg=bg)
+        self.canvas.itemconfigure(self.line, fill=color)
+        self.canvas.itemconfigure(self.value_text, fill=color)
+        if self.title_text is not None:
+            self.canvas.itemconfigure(self.title_text, fill=fg or color)
+        for label in self.grid_labels:
+            self.canvas.itemconfigure(label, fill=fg or color)
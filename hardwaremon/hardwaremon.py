@@ -1,211 +1,97 @@
-from email.mime import text
-from logging import root
+import argparse
+import contextlib
+import json
 import platform
 import os
+import sys
 import time
-import shutil
-import re
-import requests
 import psutil
-import tkinter.messagebox as messagebox
+from hardwaremon import collectors, commands, devices, engine, graphs, history, hostfs, hwmon, inventory, nvidia, profiling, render, sensors, snapshot, timeseries, updates
 
 VERSION = "v3.0.9"  # increment with each release
 
 
-MAX_POINTS = 60  # last 60 seconds
+MAX_POINTS = 60  # last 60 seconds shown in the graphs
 
-cpu_history = []
-mem_history = []
-disk_history = []
+# 1 s raw samples + 1 min / 1 h rollups, fixed memory
+HISTORY = history.HistoryStore(("cpu", "mem", "disk", "gpu"))
 
 
-import requests
-
 def check_for_updates():
-    repo = "louisboii747/HardwareMon" 
-    url = f"https://api.github.com/repos/{repo}/releases/latest"
-
-    try:
-        response = requests.get(url, timeout=5)
-        if response.status_code == 200:
-            latest_version = response.json()["tag_name"].lstrip("v")
-            if latest_version != VERSION:
-                return f"Update available: v{latest_version}"
-        return None  # No update
-    except Exception:
-        return None  # Fail silently
-
-def update_history():
-    cpu = psutil.cpu_percent(interval=None)
-    mem = psutil.virtual_memory().percent
-    disk = psutil.disk_usage('/').percent
-
-    cpu_history.append(cpu)
-    mem_history.append(mem)
-    disk_history.append(disk)
-
-    if len(cpu_history) > MAX_POINTS:
-        cpu_history.pop(0)
-        mem_history.pop(0)
-
-
-def draw_graph(canvas, data, color, label):
-    canvas.delete("all")
+    # Blocking, cached check (see updates.py); the GUI uses updates.start()
+    return updates.check(VERSION)
 
-    width = int(canvas["width"])
-    height = int(canvas["height"])
-    padding = 10
+def gpu_telemetry():
+    # Live load/VRAM/power of the dedicated GPUs: amdgpu sysfs, then nvidia-smi
+    return collectors.get("amdgpu") + collectors.get("nvidia")
 
-    if len(data) < 2:
-        return
 
-    max_val = 100  # percent-based graph
-    step_x = (width - 2 * padding) / (len(data) - 1)
-
-    points = []
-    for i, value in enumerate(data):
-        x = padding + i * step_x
-        y = height - padding - (value / max_val) * (height - 2 * padding)
-        points.extend([x, y])
-
-    canvas.create_line(points, fill=color, width=2, smooth=True)
-    canvas.create_text(
-        5, 5,
-        anchor="nw",
-        text=f"{label}: {data[-1]:.1f}%",
-        fill=color,
-        font=("monospace", 10, "bold")
-    )
+def update_history():
+    try:
+        usage = collectors.get("usage")
+    except Exception:
+        return  # nothing to record; the sections say why
+    try:
+        gpus = gpu_telemetry()
+    except Exception:
+        gpus = []
+    HISTORY.record(cpu=usage.cpu, mem=usage.mem, disk=usage.disk,
+                   gpu=gpus[0].utilization if gpus else None)
+
+
+def history_info():
+    # Includes anything backfilled from a running `hardwaremon daemon`
+    lines = ["=== Usage History ==="]
+    with HISTORY.lock:
+        for name, label in (("cpu", "CPU"), ("mem", "Memory"), ("disk", "Disk"), ("gpu", "GPU")):
+            raw = HISTORY[name].latest(MAX_POINTS)
+            if not raw:
+                continue
+            line = f"{label:7}: last {len(raw)}s avg {sum(raw) / len(raw):5.1f}%"
+            rows = HISTORY[name].minute.rows(60)
+            if rows:
+                line += (f" | last {len(rows)} min: min {min(r[1] for r in rows):5.1f}%"
+                         f" avg {sum(r[2] for r in rows) / len(rows):5.1f}%"
+                         f" max {max(r[3] for r in rows):5.1f}%")
+            lines.append(line)
+    return lines if len(lines) > 1 else ["===No usage history yet==="]
 
 
 ALERTS = {
     "cpu": 90,
     "memory": 90,
-    "gpu_temp": 80,
+    "gpu_temp": 80,             # edge; junction and VRAM run hotter by design
+    "gpu_junction_temp": 100,
+    "gpu_mem_temp": 95,
     "battery_low": 20
 }
 
 def check_alerts():
     alerts = []
-    cpu = psutil.cpu_percent(interval=None)
-    if cpu > ALERTS["cpu"]:
-        alerts.append(f"⚠️ CPU Usage High: {cpu:.1f}%")
-    
-    mem = psutil.virtual_memory().percent
-    if mem > ALERTS["memory"]:
-        alerts.append(f"⚠️ Memory Usage High: {mem:.1f}%")
-    
-    temps = psutil.sensors_temperatures()
-    if temps:
-        for name, entries in temps.items():
-            for entry in entries:
-                if "gpu" in entry.label.lower() or "nvidia" in name.lower():
-                    if entry.current > ALERTS["gpu_temp"]:
-                        alerts.append(f"⚠️ GPU Temp High: {entry.current} °C")
-    
-    bat = psutil.sensors_battery()
-    if bat and not bat.power_plugged and bat.percent < ALERTS["battery_low"]:
-        alerts.append(f"⚠️ Battery Low: {bat.percent:.1f}%")
-    
-    return alerts
-
-
-def gpu_info():
-    lines = ["=== GPU Information ==="]
-
-    try:
-        if platform.system() != "Linux":
-            return ["GPU info not implemented for this OS."]
-
-        # 1. Find ONLY dedicated AMD / NVIDIA GPUs
-        cmd = (
-            "lspci | grep -Ei "
-            "'(NVIDIA Corporation|Advanced Micro Devices, Inc.)' | "
-            "grep -E '(VGA|3D)' | "
-            "grep -vi 'APU'"
-        )
-        gpus = [l for l in os.popen(cmd).read().splitlines() if l]
-
-        if not gpus:
-            return ["No dedicated AMD or NVIDIA GPU found."]
-
-        for gpu in gpus:
-            lines.append(gpu)
-
-            # Extract PCI bus ID (e.g. 01:00.0)
-            bus_id = gpu.split()[0]
-
-            # 2. PCIe lane width (current + max)
-            pcie_info = os.popen(f"lspci -s {bus_id} -vv").read()
-            lane_match = re.search(
-                r"LnkSta:\s+Speed\s+[^,]+,\s+Width\s+x(\d+).*?\n.*?LnkCap:\s+Speed\s+[^,]+,\s+Width\s+x(\d+)",
-                pcie_info,
-                re.S
-            )
-
-            if lane_match:
-                current, maximum = lane_match.groups()
-                lines.append(f"  PCIe: x{current} (max x{maximum})")
-            else:
-                lines.append("  PCIe: Unknown")
-
-            # 3. VRAM detection
-            if "NVIDIA" in gpu:
-                vram = os.popen(
-                    "nvidia-smi --query-gpu=memory.total "
-                    "--format=csv,noheader,nounits"
-                ).read().strip()
-                if vram:
-                    lines.append(f"  VRAM: {vram} MB")
-                else:
-                    lines.append("  VRAM: Unknown")
-
-            elif "Advanced Micro Devices" in gpu:
-                vram = os.popen(
-                    "grep -i 'VRAM' /var/log/Xorg.0.log 2>/dev/null | head -n1"
-                ).read().strip()
-                if vram:
-                    lines.append(f"  VRAM: {vram}")
-                else:
-                    lines.append("  VRAM: Unknown (AMD userspace tools vary)")
-
-        return lines
-
-    except Exception as e:
-        return [f"GPU info error: {e}"] 
-    mem = psutil.virtual_memory().percent
-    if mem > ALERTS["memory"]:
-        alerts = []
-        alerts.append(f"⚠️ Memory Usage High: {mem:.1f}%")
-    
-    # GPU temp (if available)
-    temps = psutil.sensors_temperatures()
-    if temps:
-        for name, entries in temps.items():
-            for entry in entries:
-                if "gpu" in entry.label.lower() or "nvidia" in name.lower():
-                    if entry.current > ALERTS["gpu_temp"]:
-                        alerts = []
-                        alerts.append(f"⚠️ GPU Temp High: {entry.current} °C")
-    
-    # Battery
-    bat = psutil.sensors_battery()
-    if bat and not bat.power_plugged and bat.percent < ALERTS["battery_low"]:
-        alerts = []
+    usage = collectors.get("usage")
+    if usage.cpu > ALERTS["cpu"]:
+        alerts.append(f"⚠️ CPU Usage High: {usage.cpu:.1f}%")
+
+    if usage.mem > ALERTS["memory"]:
+        alerts.append(f"⚠️ Memory Usage High: {usage.mem:.1f}%")
+
+    groups = temperature_groups()
+    for category, limit, name in ((sensors.GPU_EDGE, "gpu_temp", "GPU"),
+                                  (sensors.GPU_JUNCTION, "gpu_junction_temp", "GPU Junction"),
+                                  (sensors.GPU_MEM, "gpu_mem_temp", "GPU Memory")):
+        for temp in groups.get(category, []):
+            if temp.current > ALERTS[limit]:
+                alerts.append(f"⚠️ {name} Temp High: {temp.current} °C")
+
+    bat = collectors.get("battery")
+    if bat and not bat.plugged and bat.percent < ALERTS["battery_low"]:
         alerts.append(f"⚠️ Battery Low: {bat.percent:.1f}%")
 
     return alerts
 
+
 def get_cpu_name():
-    if platform.system() == "Linux":
-        try:
-            with open("/proc/cpuinfo") as f:
-                for line in f:
-                    if "model name" in line:
-                        return line.split(":", 1)[1].strip()
-        except Exception:
-            pass
-    return platform.processor()
+    return inventory.get("cpu_name")
 
 THEMES = {
     "dark": {
@@ -256,37 +142,19 @@ def apply_theme(root, text, theme_name):
 current_theme = "dark"  # default
 
 
-def read_sys(path):
-    try:
-        with open(path) as f:
-            return f.read().strip()
-    except Exception:
-        return None
-
 def battery_info():
-    lines = ["=== Battery Information ==="]
-    if not hasattr(psutil, "sensors_battery"):
-        return None
-    bat = psutil.sensors_battery()
+    bat = collectors.get("battery")
     if bat is None:
         return None
-    percent = bat.percent
-    plugged = bat.power_plugged
-    secsleft = bat.secsleft
-    if secsleft == psutil.POWER_TIME_UNLIMITED:
+    if bat.secsleft == psutil.POWER_TIME_UNLIMITED:
         time_str = "N/A"
-    elif secsleft == psutil.POWER_TIME_UNKNOWN:
+    elif bat.secsleft == psutil.POWER_TIME_UNKNOWN:
         time_str = "Unknown"
     else:
-        hours, remainder = divmod(secsleft, 3600)
+        hours, remainder = divmod(bat.secsleft, 3600)
         minutes, _ = divmod(remainder, 60)
         time_str = f"{hours}h {minutes}m"
-    return f"{percent}% {'(Charging)' if plugged else '(Discharging)'} - Time left: {time_str}"
-    return lines
-
-def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
-
+    return f"{bat.percent}% {'(Charging)' if bat.plugged else '(Discharging)'} - Time left: {time_str}"
 
 ## START SYSTEM SUMMARY ##
 
@@ -294,40 +162,23 @@ def clear_screen():
 def system_summary():
     lines = ["=== SYSTEM SUMMARY ==="]
 
-    cpu_name = get_cpu_name()
-    total_ram = round(psutil.virtual_memory().total / (1024**3), 1)
-    disk_total = round(psutil.disk_usage('/').total / (1024**3), 1)
-
-    # GPU name (simplified)
-    gpu_name = "Unknown"
-    if platform.system() == "Linux":
-        output = os.popen(
-            "lspci | grep -Ei '(VGA|3D)' | grep -Ei '(NVIDIA|AMD)'"
-        ).read().strip()
-        if output:
-            gpu_name = output.split(":")[-1].strip()
+    cpu = collectors.get("cpu")
+    mem = collectors.get("memory")
+    disk = collectors.get("disk")
+    usage = collectors.get("usage")
+    gpus = collectors.get("gpus")
 
-    lines.append(f"CPU  : {cpu_name}")
-    lines.append(f"GPU  : {gpu_name}")
-    lines.append(f"RAM  : {total_ram} GB")
-    lines.append(f"Disk : {disk_total} GB\n")
+    lines.append(f"CPU  : {cpu.name}")
+    lines.append(f"GPU  : {gpus[0].name if gpus else 'Unknown'}")
+    lines.append(f"RAM  : {round(mem.total / (1024**3), 1)} GB")
+    lines.append(f"Disk : {round(disk.total / (1024**3), 1)} GB\n")
 
-    cpu = psutil.cpu_percent(interval=None)
-    mem = psutil.virtual_memory().percent
-    disk = psutil.disk_usage('/').percent
-
-    lines.append(f"CPU Usage   : {cpu:.1f}%")
-    lines.append(f"Memory Usage: {mem:.1f}%")
-    lines.append(f"Disk Usage  : {disk:.1f}%")
+    lines.append(f"CPU Usage   : {usage.cpu:.1f}%")
+    lines.append(f"Memory Usage: {usage.mem:.1f}%")
+    lines.append(f"Disk Usage  : {usage.disk:.1f}%")
 
     return lines
 
-# ---------- Full Sections ---------- #
-
-SECTIONS = [
-    system_summary
-]
-
 
 ## END System Summary ##
 
@@ -336,25 +187,25 @@ SECTIONS = [
 def system_info():
     lines = ["=== System Information ==="]
     try:
-        uptime_seconds = time.time() - psutil.boot_time()
+        system = collectors.get("system")
+        cpu = collectors.get("cpu")
         info = [
-            f"OS/Kernel Version: {platform.system()} {platform.release()}",
-            f"Architecture: {platform.machine()}",
-            f"CPU: {get_cpu_name()}",
-            f"CPU Frequency: {psutil.cpu_freq().current:.2f} MHz",
-            f"CPU Cores: {psutil.cpu_count(logical=False)}",
-            f"Threads: {psutil.cpu_count(logical=True)}",
-            f"Memory: {round(psutil.virtual_memory().total / (1024**3), 2)} GB",
-            f"Disk: {round(psutil.disk_usage('/').total / (1024**3), 2)} GB",
-            f"Uptime: {uptime_seconds / 3600:.2f} hours",
-            f"User: {os.getlogin()}",
-            f"Display Size: {shutil.get_terminal_size().columns}x{shutil.get_terminal_size().lines}",
-            f"Filesystem: {platform.system()}"
-           f"Resizable Bar: {'Supported' if os.path.exists('/sys/bus/pci/devices/0000:00:01.0/resizable_bar') else 'Not Supported'}"
-        
+            f"OS/Kernel Version: {system.system} {system.release}",
+            f"Architecture: {system.machine}",
+            f"CPU: {cpu.name}",
+            f"CPU Frequency: {cpu.freq_mhz:.2f} MHz" if cpu.freq_mhz else "CPU Frequency: Unknown",
+            f"CPU Cores: {cpu.cores}",
+            f"Threads: {cpu.threads}",
+            f"Memory: {round(collectors.get('memory').total / (1024**3), 2)} GB",
+            f"Disk: {round(collectors.get('disk').total / (1024**3), 2)} GB",
+            f"Uptime: {system.uptime / 3600:.2f} hours",
+            f"User: {system.user}",
+            f"Display Size: {system.columns}x{system.lines}",
+            f"Filesystem: {system.system}",
+            f"Resizable Bar: {'Supported' if system.resizable_bar else 'Not Supported'}",
         ]
 
-        io = psutil.disk_io_counters()
+        io = collectors.get("disk_io")
         if io:
             info.append(
                 f"Disk Activity: {io.read_bytes / (1024**2):.2f} MB read, "
@@ -364,41 +215,21 @@ def system_info():
         bat = battery_info()
         info.append(f"Battery: {bat if bat else 'N/A'}")
 
-        return info
+        return lines + info
 
     except Exception as e:
         return [f"System info error: {e}"]
-    
+
 
 ## END System Info ##
 
 def swap_memory():
     lines = ["=== Swap Memory ==="]
-    swap = psutil.swap_memory()
+    swap = collectors.get("swap")
     lines.append(f"Swap: {round(swap.total / (1024**3), 2)} GB, Used: {round(swap.used / (1024**3), 2)} GB ({swap.percent}%)")
     return lines
 
 
-
-
-
-def memory_temperature():
-    lines = ["=== Memory Temperature ==="]
-    temps = psutil.sensors_temperatures()
-    if not temps:
-        return ["===Memory temperature sensors not available"]
-
-    for name, entries in temps.items():
-        for entry in entries:
-            if "memory" in entry.label.lower() or "ram" in name.lower():
-                if entry.label:
-                    lines.append(f"{entry.label}: {entry.current} °C")
-                else:
-                    lines.append(f"{name}: {entry.current} °C")
-
-    return lines if len(lines) > 1 else ["===No Memory temperature data found==="]
-
-
 def gpu_info():
     lines = ["=== GPU Information ==="]
 
@@ -406,59 +237,31 @@ def gpu_info():
         if platform.system() != "Linux":
             return ["GPU info not implemented for this OS."]
 
-        # 1. Find ONLY dedicated AMD / NVIDIA GPUs
-        cmd = (
-            "lspci | grep -Ei "
-            "'(NVIDIA Corporation|Advanced Micro Devices, Inc.)' | "
-            "'(VGA|3D)' | "
-            "'(APU)' -vi"
-            "grep -E '(VGA|3D)' | "
-            "grep -vi 'APU'"
-        )
-        gpus = [l for l in os.popen(cmd).read().splitlines() if l]
-
+        gpus = collectors.get("gpus")
         if not gpus:
             return ["No dedicated AMD or NVIDIA GPU found."]
 
+        # Live readings per vendor, in the same (PCI) order as gpus
+        telemetry = {devices.VENDOR_NVIDIA: iter(collectors.get("nvidia")),
+                     devices.VENDOR_AMD: iter(collectors.get("amdgpu"))}
         for gpu in gpus:
-            lines.append(gpu)
-
-            # Extract PCI bus ID (e.g. 01:00.0)
-            bus_id = gpu.split()[0]
+            lines.append(gpu.description)
 
-            # 2. PCIe lane width (current + max)
-            pcie_info = os.popen(f"lspci -s {bus_id} -vv").read()
-            lane_match = re.search(
-                r"LnkSta:\s+Speed\s+[^,]+,\s+Width\s+x(\d+).*?\n.*?LnkCap:\s+Speed\s+[^,]+,\s+Width\s+x(\d+)",
-                pcie_info,
-                re.S
-            )
-
-            if lane_match:
-                current, maximum = lane_match.groups()
-                lines.append(f"  PCIe: x{current} (max x{maximum})")
+            if gpu.link_width:
+                lines.append(f"  PCIe: x{gpu.link_width} (max x{gpu.max_link_width})")
             else:
                 lines.append("  PCIe: Unknown")
 
-            # 3. VRAM detection
-            if "NVIDIA" in gpu:
-                vram = os.popen(
-                    "nvidia-smi --query-gpu=memory.total "
-                    "--format=csv,noheader,nounits"
-                ).read().strip()
-                if vram:
-                    lines.append(f"  VRAM: {vram} MB")
-                else:
-                    lines.append("  VRAM: Unknown")
-
-            elif "Advanced Micro Devices" in gpu:
-                vram = os.popen(
-                    "grep -i 'VRAM' /var/log/Xorg.0.log 2>/dev/null | head -n1"
-                ).read().strip()
-                if vram:
-                    lines.append(f"  VRAM: {vram}")
-                else:
-                    lines.append("  VRAM: Unknown (AMD userspace tools vary)")
+            if gpu.vendor_id == devices.VENDOR_NVIDIA:
+                lines.append(f"  VRAM: {gpu.vram or 'Unknown'}")
+            elif gpu.vendor_id == devices.VENDOR_AMD:
+                lines.append(f"  VRAM: {gpu.vram or 'Unknown (no amdgpu driver?)'}")
+
+            reading = next(telemetry.get(gpu.vendor_id, iter(())), None)
+            if reading is not None:
+                lines.append("  " + gpu_telemetry_line(reading))
+            elif gpu.vendor_id == devices.VENDOR_NVIDIA and nvidia.collecting():
+                lines.append("  Telemetry: collecting…")
 
         return lines
 
@@ -466,19 +269,24 @@ def gpu_info():
         return [f"GPU info error: {e}"]
 
 
-
+def gpu_telemetry_line(t):
+    def value(v, fmt, unit):
+        return "N/A" if v is None else f"{v:{fmt}}{unit}"
+    return (f"Load: {value(t.utilization, '.0f', '%')} | "
+            f"VRAM used: {value(t.memory_used, '.0f', '')} / {value(t.memory_total, '.0f', ' MiB')} | "
+            f"Temp: {value(t.temperature, '.0f', ' °C')} | Power: {value(t.power, '.1f', ' W')} | "
+            f"Clock: {value(t.clock, '.0f', ' MHz')}")
 
 
 def intel_gpu_info():
     lines = ["=== Intel GPU Information ==="]
     try:
         if platform.system() == "Linux":
-            intel_gpu_output = os.popen("lspci | grep -i 'intel' | grep -i 'vga\\|3d\\|2d'").read()
-            gpus = intel_gpu_output.strip().split("\n")
-            if not gpus or gpus == ['']:
+            gpus = collectors.get("intel_gpus")
+            if not gpus:
                 return ["No Intel GPU information found."]
             for gpu in gpus:
-                lines.append(gpu)
+                lines.append(gpu.description)
         else:
             lines.append("Intel GPU info not implemented for this OS.")
     except Exception as e:
@@ -487,169 +295,153 @@ def intel_gpu_info():
 
 
 def cpu_mem_bar():
-    cpu = psutil.cpu_percent(interval=None)
+    usage = collectors.get("usage")
     lines = ["=== CPU and Memory Usage ==="]
-    mem = psutil.virtual_memory().percent
     width = 50
-    cpu_bar = "#" * int(cpu / 100 * width)
-    mem_bar = "#" * int(mem / 100 * width)
-    lines.append(f"CPU: [{cpu_bar:<{width}}] {cpu:.1f}%")
-    lines.append(f"MEM: [{mem_bar:<{width}}] {mem:.1f}%")
+    cpu_bar = "#" * int(usage.cpu / 100 * width)
+    mem_bar = "#" * int(usage.mem / 100 * width)
+    lines.append(f"CPU: [{cpu_bar:<{width}}] {usage.cpu:.1f}%")
+    lines.append(f"MEM: [{mem_bar:<{width}}] {usage.mem:.1f}%")
     return lines
 
 
 def network_info():
-    net = psutil.net_io_counters(pernic=True)
     lines = ["=== Network Interfaces ==="]
-    for iface, data in net.items():
-        lines.append(f"{iface:10}: Sent={data.bytes_sent / (1024**2):6.2f} MB | Recv={data.bytes_recv / (1024**2):6.2f} MB")
+    for nic in collectors.get("network"):
+        lines.append(f"{nic.name:10}: Sent={nic.sent / (1024**2):6.2f} MB | Recv={nic.recv / (1024**2):6.2f} MB")
     return lines
 
 
 
-def top_processes(n=5):
-    procs = [(p.info["name"], p.info["cpu_percent"], p.info["memory_percent"])
-             for p in psutil.process_iter(["name", "cpu_percent", "memory_percent"])]
-    procs.sort(key=lambda x: (x[1], x[2]), reverse=True)
-    lines = [f"=== Top {n} Processes ==="]
-    for name, cpu, mem in procs[:n]:
-        lines.append(f"{name[:25]:25} | CPU: {cpu:5.1f}% | MEM: {mem:5.1f}%")
-    return lines
+PROCESSES = collectors.PROCESSES
 
 
+def top_processes(n=5, sort="cpu"):
+    if n == 5 and sort == "cpu":
+        rows = collectors.get("processes")  # the shared per-tick sample
+    else:
+        rows = [collectors.ProcessRow(r["pid"], r["name"], r["cpu"], r["mem"], r["rss"], r["threads"])
+                for r in PROCESSES.top(n, sort)]
+    lines = [f"=== Top {n} Processes ===" if sort == "cpu" else f"=== Top {n} Processes (by {sort}) ==="]
+    for row in rows:
+        lines.append(f"{row.name[:25]:25} | CPU: {row.cpu:5.1f}% | MEM: {row.mem:5.1f}%")
+    lines.append(f"({PROCESSES.last_count} processes scanned in {PROCESSES.last_cost * 1000:.1f} ms)")
+    return lines
 
 
 def motherboard_info():
-    if platform.system() == "Linux":
-        lines = ["=== Motherboard Information ==="]
-        base_path = "/sys/devices/virtual/dmi/id/"
-        info = {
-            "Manufacturer": read_sys(base_path + "board_vendor"),
-            "Product Name": read_sys(base_path + "board_name"),
-            "Version": read_sys(base_path + "board_version"),
-            "Serial Number": read_sys(base_path + "board_serial"),
-        
-        }
-    for key , value in info.items():
+    lines = ["=== Motherboard Information ==="]
+    board = collectors.get("board")
+    if board is None:
+        return lines
+    for key, value in (("Manufacturer", board.vendor), ("Product Name", board.name),
+                       ("Version", board.version), ("Serial Number", board.serial)):
         lines.append(f"{key}: {value if value else 'N/A'}")
 
     return lines
-    
-
 
 
 def fan_info():
     lines = ["=== Fan Sensors ==="]
-    hwmon_base = "/sys/class/hwmon"
 
-    if not os.path.exists(hwmon_base):
+    if not hostfs.exists(hwmon.HWMON_BASE):
         return ["Fan sensors not available"]
 
-    for hw in os.listdir(hwmon_base):
-        hw_path = os.path.join(hwmon_base, hw)
-        name = read_sys(os.path.join(hw_path, "name")) or hw
-        
-        for file in os.listdir(hw_path):
-            if file.startswith("fan") and file.endswith("_input"):
-                rpm = read_sys(os.path.join(hw_path, file))
-                if rpm and rpm.isdigit():
-                    lines.append(f"{name} {file}: {rpm} RPM")
+    for fan in collectors.get("fans"):
+        lines.append(f"{fan.chip} {fan.sensor}: {fan.rpm} RPM")
 
     return lines if len(lines) > 1 else ["==No fans detected==="]
 
 
+def voltage_info():
+    lines = ["=== Voltages & Power ==="]
+    for volt in collectors.get("voltages"):
+        lines.append(f"{volt.chip} {volt.label or volt.sensor}: {volt.volts:.3f} V")
+    for power in collectors.get("power"):
+        lines.append(f"{power.chip} {power.label or power.sensor}: {power.watts:.1f} W")
+    return lines if len(lines) > 1 else ["Voltage and power sensors not available"]
 
 
 def partition_info():
     lines = ["=== Partition Information ==="]
-    for part in psutil.disk_partitions(all=False):
+    for part in collectors.get("partitions"):
         lines.append(f"{part.device} mounted on {part.mountpoint} - Type: {part.fstype}")
     return lines
 
 
 def drive_info():
     lines = ["=== Drive Information ==="]
-    for part in psutil.disk_partitions(all=False):
-        try:
-            usage = psutil.disk_usage(part.mountpoint)
-        except (PermissionError, FileNotFoundError):
+    for part in collectors.get("partitions"):
+        if part.total is None:
             continue
 
         lines.append(
             f"{part.mountpoint:15} "
-            f"{usage.used // (1024**3):4} / "
-            f"{usage.total // (1024**3):4} GB "
-            f"({usage.percent:5.1f}%)"
+            f"{part.used // (1024**3):4} / "
+            f"{part.total // (1024**3):4} GB "
+            f"({part.percent:5.1f}%)"
         )
 
     return lines
 
 
-def gpu_temperature():
-    lines = ["=== GPU Temperature ==="]
-    temps = psutil.sensors_temperatures()
-    if not temps:
-        return ["GPU temperature sensors not available"]
-
-    for name, entries in temps.items():
-        for entry in entries:
-            if "gpu" in entry.label.lower() or "nvidia" in name.lower() or "amdgpu" in name.lower():
-                if entry.label:
-                    lines.append(f"{entry.label}: {entry.current} °C")
-                else:
-                    lines.append(f"{name}: {entry.current} °C")
-
-    return lines if len(lines) > 1 else ["===No GPU temperature data found==="]
+def temperature_groups():
+    # This tick's temperatures by sensors category, classified once per snapshot
+    temps = collectors.get("temperatures") or []
+    return snapshot.current().memo("temperature_groups", lambda: sensors.group(temps))
 
 
-def memory_temperature():
-    lines = ["=== Memory Temperature ==="]
-    temps = psutil.sensors_temperatures()
-    if not temps:
-        return ["Memory temperature sensors not available"]
-
-    for name, entries in temps.items():
-        for entry in entries:
-            if "memory" in entry.label.lower() or "ram" in name.lower():
-                if entry.label:
-                    lines.append(f"{entry.label}: {entry.current} °C")
-                else:
-                    lines.append(f"{name}: {entry.current} °C")
+def _temperature_lines(title, missing, empty, categories):
+    lines = [title]
+    if not collectors.get("temperatures"):
+        return [missing]
 
-    return lines if len(lines) > 1 else ["===No Memory temperature data found==="]
+    groups = temperature_groups()
+    for category in categories:
+        for temp in groups.get(category, []):
+            lines.append(f"{temp.label or temp.chip}: {temp.current} °C")
 
+    if collectors.is_stale("temperatures"):
+        lines[0] += " (stale)"
+    return lines if len(lines) > 1 else [empty]
 
-def cpu_temperature():
-    lines = ["=== CPU Core Temperatures ==="]
-    temps = psutil.sensors_temperatures()
 
-    if not temps:
-        return ["CPU temperature sensors not available"]
+def gpu_temperature():
+    return _temperature_lines(
+        "=== GPU Temperature ===",
+        "GPU temperature sensors not available",
+        "===No GPU temperature data found===",
+        sensors.GPU,
+    )
 
-    for name, entries in temps.items():
-        if "core" not in name.lower():
-            continue
 
-        for entry in entries:
-            if entry.label and "core" in entry.label.lower():
-                lines.append(f"{entry.label}: {entry.current} °C")
+def memory_temperature():
+    return _temperature_lines(
+        "=== Memory Temperature ===",
+        "Memory temperature sensors not available",
+        "===No Memory temperature data found===",
+        (sensors.DIMM,),
+    )
 
-    if len(lines) == 1:
-        return ["CPU core temperature sensors not found"]
 
-    return lines
+def cpu_temperature():
+    return _temperature_lines(
+        "=== CPU Core Temperatures ===",
+        "CPU temperature sensors not available",
+        "CPU core temperature sensors not found",
+        sensors.CPU,
+    )
 
 
 def keyboard_info():
     lines = ["=== Keyboard Information ==="]
     try:
         if platform.system() == "Linux":
-            lsusb_output = os.popen("lsusb | grep -i 'keyboard'").read()
-            keyboards = lsusb_output.strip().split("\n")
-            if not keyboards or keyboards == ['']:
+            keyboards = collectors.get("keyboards")
+            if not keyboards:
                 return ["===No keyboard information found.==="]
             for kb in keyboards:
-                lines.append(kb)
+                lines.append(kb.description)
         else:
             lines.append("===Keyboard info not implemented for this OS.===")
     except Exception as e:
@@ -661,12 +453,11 @@ def mouse_info():
     lines = ["=== Mouse Information ==="]
     try:
         if platform.system() == "Linux":
-            lsusb_output = os.popen("lsusb | grep -i 'mouse'").read()
-            mice = lsusb_output.strip().split("\n")
-            if not mice or mice == ['']:
+            mice = collectors.get("mice")
+            if not mice:
                 return ["===No mouse information found.==="]
             for mouse in mice:
-                lines.append(mouse)
+                lines.append(mouse.description)
         else:
             lines.append("===Mouse info not implemented for this OS.===")
     except Exception as e:
@@ -677,22 +468,13 @@ def mouse_info():
 def os_info():
     lines = ["=== Operating System Information ==="]
     try:
-        if platform.system() == "Linux":
-            distro = ""
-            try:
-                with open("/etc/os-release") as f:
-                    for line in f:
-                        if line.startswith("PRETTY_NAME="):
-                            distro = line.split("=")[1].strip().strip('"')
-                            break
-            except Exception:
-                distro = "Unknown Linux Distro"
-            lines.append(f"Distribution: {distro}")
-        elif platform.system() == "Windows":
-            lines.append(f"Windows Version: {platform.version()}")
-        elif platform.system() == "Darwin":
-            mac_ver = platform.mac_ver()[0]
-            lines.append(f"macOS Version: {mac_ver}")
+        info = collectors.get("os")
+        if info.system == "Linux":
+            lines.append(f"Distribution: {info.distro}")
+        elif info.system == "Windows":
+            lines.append(f"Windows Version: {info.version}")
+        elif info.system == "Darwin":
+            lines.append(f"macOS Version: {info.version}")
         else:
             lines.append("OS information not implemented for this OS.")
     except Exception as e:
@@ -704,12 +486,11 @@ def wifi_info():
     lines = ["=== Wi-Fi Information ==="]
     try:
         if platform.system() == "Linux":
-            iwconfig_output = os.popen("iwconfig 2>/dev/null | grep 'ESSID'").read()
-            wifis = iwconfig_output.strip().split("\n")
-            if not wifis or wifis == ['']:
+            wifis = collectors.get("wifi")
+            if not wifis:
                 return ["===No Wi-Fi information found.==="]
             for wifi in wifis:
-                lines.append(wifi)
+                lines.append(wifi.description)
         else:
             lines.append("===Wi-Fi info not implemented for this OS.===")
     except Exception as e:
@@ -717,81 +498,6 @@ def wifi_info():
     return lines
 
 
-## Print Lines ##
-def main():
-    try:
-        while True:
-            clear_screen()
-            # System info
-            for line in system_info():
-                print(line)
-            # Swap memory
-            for line in [swap_memory()]:
-                print(line)
-            # Network
-            for line in network_info():
-                print(line)
-            # Top processes
-            for line in top_processes():
-                print(line)
-            # Drive info
-            for line in drive_info():
-                print(line)
-            # CPU and Memory bar
-            for line in [cpu_mem_bar()]:
-                print(line)
-            # CPU Temperature
-            for line in cpu_temperature():
-                print(line)
-            # Memory Temperature
-            for line in memory_temperature():
-                print(line)
-            # Fan Info
-            for line in fan_info():
-                print(line)
-            # GPU Info
-            for line in gpu_info():
-                print(line)
-            # Motherboard Info
-            for line in motherboard_info():
-                print(line)
-            # GPU Temperature
-            for line in gpu_temperature():
-                print(line)
-            # Battery Info
-            for line in [battery_info()]:
-                print(f"Battery: {line}")
-            # Memory Temperature
-            for line in memory_temperature():
-                print(line)
-            # OS Info
-            for line in os_info():
-                print(line)
-            # Keyboard Info
-            for line in keyboard_info():
-                print(line)
-            # Mouse Info
-            for line in mouse_info():
-                print(line)
-            # Wi-Fi Info
-            for line in wifi_info():
-                print(line)
-            # Partition Info
-            for line in partition_info():
-                print(line)
-            print("\nPress Ctrl+C to exit...")
-            time.sleep(1)
-            # Intel GPU Info
-            for line in intel_gpu_info():
-                print(line)
-
-    
-    except KeyboardInterrupt:
-        print("\nExiting...")
-
-
-current_theme = "dark"
-
 # List of all section functions
 SECTIONS = [
     system_info,
@@ -801,6 +507,7 @@ SECTIONS = [
     cpu_mem_bar,
     drive_info,
     fan_info,
+    voltage_info,
     motherboard_info,
     cpu_temperature,
     gpu_info,
@@ -812,94 +519,139 @@ SECTIONS = [
     wifi_info,
     partition_info,
     intel_gpu_info,
-
 ]
 
-def apply_theme(root, text, theme_name):
-    theme = THEMES[theme_name]
-    root.configure(bg=theme["bg"])
-    text.configure(bg=theme["bg"], fg=theme["fg"], insertbackground=theme["fg"])
-
-
-# ---------- Summary ---------- #
-def system_summary():
-    lines = ["=== SYSTEM SUMMARY ==="]
-
-    cpu_name = get_cpu_name()
-    total_ram = round(psutil.virtual_memory().total / (1024**3), 1)
-    disk_total = round(psutil.disk_usage('/').total / (1024**3), 1)
 
-    # GPU name (simplified)
-    gpu_name = "Unknown"
-    if platform.system() == "Linux":
-        output = os.popen(
-            "lspci | grep -Ei '(VGA|3D)' | grep -Ei '(NVIDIA|AMD)'"
-        ).read().strip()
-        if output:
-            gpu_name = output.split(":")[-1].strip()
+## Print Lines ##
+def unavailable(name, error):
+    return [f"=== {name} unavailable: {type(error).__name__}: {error} ==="]
 
-    lines.append(f"CPU  : {cpu_name}")
-    lines.append(f"GPU  : {gpu_name}")
-    lines.append(f"RAM  : {total_ram} GB")
-    lines.append(f"Disk : {disk_total} GB\n")
 
-    cpu = psutil.cpu_percent(interval=None)
-    mem = psutil.virtual_memory().percent
-    disk = psutil.disk_usage('/').percent
+def run_section(section):
+    # A section whose data can't be read says why instead of taking the rest down
+    try:
+        return section()
+    except Exception as e:
+        return unavailable(section.__name__, e)
 
-    lines.append(f"CPU Usage   : {cpu:.1f}%")
-    lines.append(f"Memory Usage: {mem:.1f}%")
-    lines.append(f"Disk Usage  : {disk:.1f}%")
 
-    return lines
+def collect_sections():
+    return [(section.__name__, profiling.PROFILER.call(section.__name__, run_section, section))
+            for section in SECTIONS + [history_info]]
 
-# ---------- Full Sections Placeholder ----------
-# Replace this with your actual SECTIONS list from your app
-SECTIONS = [ 
-    system_info,
-    swap_memory,
-    network_info,
-    top_processes,
-    cpu_mem_bar,
-    drive_info,
-    fan_info,
-    motherboard_info,
-    cpu_temperature,
-    gpu_info,
-    gpu_temperature,
-    memory_temperature,
-    os_info,
-    keyboard_info,
-    mouse_info,
-    wifi_info,
-    partition_info,
-    intel_gpu_info
-]
 
-import time
+def print_sections():
+    for _, lines in collect_sections():
+        for line in lines:
+            print(line)
 
-# Global cache for update messages
-_last_update_check = 0
-_update_msg_cache = None
-UPDATE_CHECK_INTERVAL = 600  # seconds (10 minutes)
 
-def check_for_updates_cached():
-    global _last_update_check, _update_msg_cache
-    now = time.time()
+## Machine-readable output ##
+# collector -> key in each --format json/ndjson record
+RECORD_FIELDS = {
+    "usage": "usage", "cpu": "cpu", "memory": "mem", "swap": "swap", "disk": "disk",
+    "disk_io": "disk_io", "network": "net", "temperatures": "temps", "fans": "fans",
+    "voltages": "volts", "power": "power",
+    "battery": "battery", "processes": "top", "nvidia": "gpu", "amdgpu": "amdgpu",
+}
 
-    if now - _last_update_check > UPDATE_CHECK_INTERVAL:
-        _last_update_check = now
-        _update_msg_cache = check_for_updates()  # your existing function
 
-    return _update_msg_cache
+def sample_record():
+    # One compact, structured record per tick, from the same sample as the text view
+    record = {"ts": round(time.time(), 3)}
+    for name, key in RECORD_FIELDS.items():
+        try:
+            record[key] = collectors.to_dict(collectors.get(name))
+        except Exception as e:
+            record[key] = None
+            record.setdefault("errors", {})[key] = f"{type(e).__name__}: {e}"
+    return record
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="hardwaremon_cli", description="HardwareMon command line")
+    parser.add_argument("--format", choices=("text", "json", "ndjson"), default="text",
+                        help="text (default) redraws the screen; json/ndjson stream one record per tick")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between ticks")
+    parser.add_argument("--count", type=int, default=None, help="stop after N ticks")
+    parser.add_argument("--profile", nargs="?", const="-", default=None, metavar="FILE",
+                        help="run under cProfile (10 ticks unless --count) and print the top functions "
+                             "and per-section costs to stderr, or save pstats data to FILE")
+    hostfs.add_arguments(parser)
+    args = parser.parse_args(argv)
+    hostfs.apply(args)
+
+    if not args.profile:
+        return _run(args)
+
+    import cProfile
+    import pstats
+    if args.count is None:
+        args.count = 10
+    profiler = cProfile.Profile()
+    profiler.runcall(_run, args)
+    if args.profile == "-":
+        pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(25)
+    else:
+        profiler.dump_stats(args.profile)
+    print("\n".join(profiling.PROFILER.report() + [commands.summary(), sensors.summary()]), file=sys.stderr)
+
+
+def _run(args):
+    text_mode = args.format == "text"
+    out = sys.stdout
+    # On a terminal, text mode redraws only what changed (see render.py);
+    # piped, it just prints each tick's sections
+    screen = render.TerminalRenderer(out) if text_mode and out.isatty() else None
+    ticks = 0
+    if text_mode:
+        timeseries.attach(HISTORY)
+    elif args.format == "json":
+        out.write("[")
+    try:
+        with screen or contextlib.nullcontext():
+            while args.count is None or ticks < args.count:
+                started = time.monotonic()
+                snapshot.tick()
+                update_history()
+                if screen:
+                    screen.render(collect_sections())
+                elif text_mode:
+                    print_sections()
+                    print()
+                else:
+                    record = json.dumps(sample_record(), separators=(",", ":"), default=str)
+                    if args.format == "json":
+                        out.write(("," if ticks else "") + "\n" + record)
+                    else:
+                        out.write(record + "\n")
+                    out.flush()  # one write per tick, never per line
+                ticks += 1
+                if args.count is None or ticks < args.count:
+                    remaining = max(0.0, args.interval - (time.monotonic() - started))
+                    if screen:
+                        if not screen.wait(remaining):  # scrolling/folding keys, q quits
+                            break
+                    else:
+                        time.sleep(remaining)
 
+    except KeyboardInterrupt:
+        if text_mode:
+            print("\nExiting...")
+    except BrokenPipeError:
+        # The reader went away (e.g. `| head`); don't try to close the array
+        os.dup2(os.open(os.devnull, os.O_WRONLY), out.fileno())
+        return
+    if args.format == "json":
+        out.write("\n]\n")
+        out.flush()
 
 # ---------- GUI App ---------- #
+# tkinter is imported here, not at the top, so hardwaremon_cli never loads it
 
 
-
-import tkinter as tk
 def gui_app():
+    import tkinter as tk
     root = tk.Tk()
     root.title("HardwareMon")
     root.geometry("800x600")
@@ -913,6 +665,11 @@ def gui_app():
 
     text = tk.Text(root, font=("monospace", 11))
     text.pack(fill="both", expand=True, padx=5, pady=5)
+    renderer = render.TextRenderer(text)
+
+    # F4: per-section costs, drawn over the top-right corner of the text
+    profile_overlay = tk.Label(text, font=("monospace", 9), justify="left", relief="solid", bd=1)
+    show_profile = tk.BooleanVar(value=False)
 
     main_frame = tk.Frame(root)
     main_frame.pack(pady=5, fill="x")
@@ -927,7 +684,28 @@ def gui_app():
     disk_canvas = tk.Canvas(main_frame, width=780, height=100)
     disk_canvas.pack(pady=2)
 
+    # Canvas items are created once and moved on each frame
+    accent = THEMES[current_theme]["accent"]
+    graph_views = {
+        "cpu": graphs.LineGraph(cpu_canvas, "CPU", accent),
+        "mem": graphs.LineGraph(mem_canvas, "Memory", accent),
+        "disk": graphs.LineGraph(disk_canvas, "Disk", accent),
+    }
+
     # ----  define functions ---- #
+    def show_gpu_graph(show):
+        # GPU load graph only with a dedicated GPU; whether there is one is
+        # decided by the "dedicated_gpu" job, so the first frame doesn't wait
+        # for PCI probes or nvidia-smi
+        if show and "gpu" not in graph_views:
+            theme = THEMES[current_theme]
+            gpu_canvas = tk.Canvas(main_frame, width=780, height=100)
+            gpu_canvas.pack(pady=2)
+            graph_views["gpu"] = graphs.LineGraph(gpu_canvas, "GPU", theme["accent"])
+            graph_views["gpu"].set_theme(theme["accent"], bg=theme["bg"])
+        elif not show and "gpu" in graph_views:
+            graph_views.pop("gpu").canvas.destroy()
+
     def apply_theme_gui(theme_name):
         theme = THEMES[theme_name]
         root.configure(bg=theme["bg"])
@@ -935,15 +713,61 @@ def gui_app():
         version_label.configure(bg=theme["bg"], fg=theme["fg"])
         toggle_btn.configure(bg=theme["bg"], fg=theme["fg"])
         main_frame.configure(bg=theme["bg"])
-        cpu_canvas.configure(bg=theme["bg"])
-        mem_canvas.configure(bg=theme["bg"])
-        disk_canvas.configure(bg=theme["bg"])
+        profile_overlay.configure(bg=theme["bg"], fg=theme["accent"])
+        for graph in graph_views.values():
+            graph.set_theme(theme["accent"], bg=theme["bg"])
+
+    # ---- background collection ---- #
+    # Each section is refreshed as often as the fastest collector it read
+    # last time (see collectors.INTERVALS); the slower collectors it reads
+    # hand back their last value until they are due themselves. Sections
+    # built only from the inventory rerun when a hotplug check invalidates
+    # something.
+    generations = {}  # section name -> inventory.generation() when it last ran
+
+    def scheduled(name, func):
+        def run():
+            generations[name] = inventory.generation()
+            lines, used = collectors.traced(func)
+            collection.set_interval(name, collectors.interval(used))
+            return lines
+        return profiling.PROFILER.wrap(name, run)
+
+    def changed(name):
+        inventory.refresh_hotplug()
+        return generations.get(name) != inventory.generation()
+
+    sections = {section.__name__: section for section in SECTIONS + [system_summary]}
+    sections["alerts"] = check_alerts
+    jobs = {name: scheduled(name, func) for name, func in sections.items()}
+    jobs["history"] = profiling.PROFILER.wrap("history", update_history)
+
+    def dedicated_gpu():
+        generations["dedicated_gpu"] = inventory.generation()
+        return any(gpu.vendor_id in (devices.VENDOR_NVIDIA, devices.VENDOR_AMD) for gpu in collectors.get("gpus"))
+
+    jobs["dedicated_gpu"] = profiling.PROFILER.wrap("dedicated_gpu", dedicated_gpu)
+    collection = engine.CollectionEngine(jobs, intervals={"history": 1.0, "dedicated_gpu": engine.ON_CHANGE},
+                                         changed=changed, steady=["history"],
+                                         on_tick=profiling.PROFILER.wrap("tick", snapshot.tick))
+
+    def active_sections():
+        return [system_summary] if summary_mode.get() else SECTIONS
+
+    def section_lines(section):
+        name = section.__name__
+        lines = collection.latest.get(name)
+        if lines is None and name in collection.errors:
+            return unavailable(name, collection.errors[name])
+        if lines is None:
+            return [f"=== {name} ===", "collecting..."]
+        if collection.is_stale(name):
+            return [lines[0] + " (stale)"] + list(lines[1:])
+        return lines
 
     def refresh_text():
-        scroll = text.yview()
-        text.delete("1.0", tk.END)
-        alerts = check_alerts()
-        update_msg = check_for_updates_cached()
+        alerts = collection.latest.get("alerts")
+        update_msg = updates.message()
 
         if alerts:
             version_label.config(text=" | ".join(alerts))
@@ -952,23 +776,22 @@ def gui_app():
         else:
             version_label.config(text=f"HardwareMon v{VERSION}")
 
-        active_sections = [system_summary] if summary_mode.get() else SECTIONS
-        for section in active_sections:
-            lines = section()
-            for line in lines:
-                text.insert(tk.END, line + "\n")
-            text.insert(tk.END, "\n")
+        show_gpu_graph(collection.latest.get("dedicated_gpu", False))
 
-        text.yview_moveto(scroll[0])
+        # Only lines that changed since the last frame are touched
+        renderer.render([(s.__name__, section_lines(s)) for s in active_sections()])
 
-        update_history()
-        draw_graph(cpu_canvas, cpu_history, THEMES[current_theme]["accent"], "CPU")
-        draw_graph(mem_canvas, mem_history, THEMES[current_theme]["accent"], "Memory")
-        draw_graph(disk_canvas, disk_history, THEMES[current_theme]["accent"], "Disk")
+        for name, graph in graph_views.items():
+            graph.update(HISTORY.latest(name, MAX_POINTS))
+
+        if show_profile.get():
+            profile_overlay.config(text="\n".join(profiling.PROFILER.report(limit=12) + [commands.summary(), sensors.summary()]))
 
     def toggle_view():
         summary_mode.set(not summary_mode.get())
         toggle_btn.config(text="Show Full Stats" if summary_mode.get() else "Show Summary")
+        collection.set_active([s.__name__ for s in active_sections()] + ["alerts", "history", "dedicated_gpu"])
+        collection.submit()
         refresh_text()
 
     toggle_btn.config(command=toggle_view)
@@ -984,25 +807,42 @@ def gui_app():
     root.bind("<F2>", lambda e: toggle_view())
     root.bind("<F3>", switch_theme)
 
+    def toggle_profile(event=None):
+        show_profile.set(not show_profile.get())
+        if show_profile.get():
+            profile_overlay.place(relx=1.0, rely=0.0, anchor="ne", x=-4, y=4)
+            refresh_text()
+        else:
+            profile_overlay.place_forget()
+
+    root.bind("<F4>", toggle_profile)
+
     apply_theme_gui(current_theme)
     refresh_text()
+    root.update()  # first frame before reading the ring file
+    timeseries.attach(HISTORY)  # history from before we started, if the daemon ran
+    collection.set_active([s.__name__ for s in active_sections()] + ["alerts", "history", "dedicated_gpu"])
+    collection.start()
 
     def update_loop():
-        refresh_text()
-        root.after(1000, update_loop)
+        # Only render here; sampling happens on the collector threads
+        if collection.drain():
+            profiling.PROFILER.call("refresh_text", refresh_text)
+        root.after(100, update_loop)
 
     update_loop()
     root.mainloop()
+    collection.stop()
 
 
 
 
 
-def main():
-    check_for_updates()
+def gui_main():
+    updates.start(VERSION)  # answers from the cache now, asks GitHub in the background
     gui_app()
 if __name__ == "__main__":
-    main()
+    gui_main()
 
 ## -- END GUI APP -- ##
 
@@ -1,12 +1,7 @@
 
 import tkinter as tk
-from tkinter import ttk
-import psutil
 import platform
-import subprocess
-from PIL import Image, ImageTk, ImageOps
-import os
-import pkgutil
+from hardwaremon import collectors, devices, engine, graphs, history, nvidia, snapshot, timeseries
 
 VERSION = "v3.0.9"
 
@@ -41,7 +36,9 @@ theme_names = list(THEMES.keys())
 import importlib.resources
 
 def load_icon(name):
+    # Pillow is imported on first use, after the window has been drawn
     try:
+        from PIL import Image, ImageTk
         with importlib.resources.open_binary("hardwaremon.icons", name) as f:
             img = Image.open(f).convert("RGBA")
             img = img.resize((32, 32), Image.Resampling.LANCZOS)
@@ -54,16 +51,17 @@ def load_icon(name):
 # HARDWARE FUNCTIONS
 #########################
 def cpu_info():
+    cpu = collectors.get("cpu")
     return [
         "=== CPU INFORMATION ===", "",
-        f"Processor: {platform.processor()}",
-        f"Cores: {psutil.cpu_count(logical=False)}",
-        f"Threads: {psutil.cpu_count(logical=True)}",
-        f"Usage: {psutil.cpu_percent()} %"
+        f"Processor: {cpu.name}",
+        f"Cores: {cpu.cores}",
+        f"Threads: {cpu.threads}",
+        f"Usage: {collectors.get('usage').cpu} %"
     ]
 
 def ram_info():
-    mem = psutil.virtual_memory()
+    mem = collectors.get("memory")
     return [
         "=== RAM INFORMATION ===", "",
         f"Total: {round(mem.total/1e9,2)} GB",
@@ -73,7 +71,7 @@ def ram_info():
     ]
 
 def disk_info():
-    d = psutil.disk_usage("/")
+    d = collectors.get("disk")
     return [
         "=== DISK INFORMATION ===", "",
         f"Total: {round(d.total/1e9,2)} GB",
@@ -85,14 +83,19 @@ def disk_info():
 def gpu_info():
     lines = ["=== GPU INFORMATION ===", ""]
     try:
-        nvidia = subprocess.getoutput("nvidia-smi --query-gpu=name,memory.total --format=csv,noheader")
-        if nvidia:
-            for line in nvidia.strip().split("\n"):
-                lines.append(line.strip())
+        # amdgpu sysfs and the long-running nvidia-smi reader; no spawns here
+        telemetry = collectors.get("amdgpu") + collectors.get("nvidia")
+        if telemetry:
+            for gpu in telemetry:
+                lines.append(f"{gpu.name}, {gpu.memory_total or 0:.0f} MiB")
+                lines.append(f"  Load: {gpu.utilization}% | Temp: {gpu.temperature} °C | Power: {gpu.power} W")
+        elif nvidia.collecting():
+            lines.append("NVIDIA: collecting…")
         else:
-            out = subprocess.getoutput("lspci | grep -i 'vga'")
+            out = [devices.format_pci(d) for d in devices.pci_display_devices()
+                   if d.class_id == 0x0300]
             if out:
-                lines.extend(out.strip().split("\n"))
+                lines.extend(out)
             else:
                 lines.append("GPU info not available")
     except Exception as e:
@@ -100,13 +103,8 @@ def gpu_info():
     return lines
 
 def motherboard_info():
-    lines = ["=== MOTHERBOARD ===", ""]
-    try:
-        out = subprocess.getoutput("cat /sys/devices/virtual/dmi/id/board_name")
-        lines.append(out.strip() if out else "Unknown")
-    except:
-        lines.append("Unknown")
-    return lines
+    board = collectors.get("board")
+    return ["=== MOTHERBOARD ===", "", (board and board.name) or "Unknown"]
 
 def os_info():
     return [
@@ -147,7 +145,15 @@ def gui():
     canvas = tk.Canvas(content, height=150)
     canvas.pack(fill="both", expand=True)
 
-    cpu_hist = [0]*60
+    cpu_hist = history.RingBuffer(60)
+    for _ in range(60):
+        cpu_hist.append(0)
+    for value in timeseries.recent("cpu", 60):  # backfill from `hardwaremon daemon`
+        cpu_hist.append(value)
+    cpu_graph = graphs.LineGraph(
+        canvas, "CPU", THEMES[current_theme]["highlight"], fg=THEMES[current_theme]["fg"],
+        padding=0, grid=True, title="CPU Usage (%)", smooth=False, font=("Consolas", 10, "bold")
+    )
 
     # Animated text
     def animate_text(lines):
@@ -158,35 +164,19 @@ def gui():
             root.after(20, lambda: step(i+1))
         step(0)
 
-    # CPU Graph
+    # CPU Graph (items are reused, only their coordinates change). Sampled
+    # on the usage collector's own interval, off the Tk thread; steady so
+    # the graph keeps scrolling even when the value doesn't move.
+    sampler = engine.CollectionEngine({"usage": lambda: collectors.get("usage").cpu},
+                                      intervals={"usage": collectors.INTERVALS["usage"]},
+                                      steady=["usage"], workers=1, on_tick=snapshot.tick)
+
     def draw_graph():
-        cpu = psutil.cpu_percent()
-        cpu_hist.append(cpu)
-        cpu_hist.pop(0)
-        canvas.delete("all")
-
-        w = canvas.winfo_width()
-        h = canvas.winfo_height()
-        step = w/len(cpu_hist)
-
-        # horizontal grid & labels
-        for i in range(0, 101, 20):
-            y = h - (i/100)*h
-            canvas.create_line(0, y, w, y, fill="#444444", dash=(2,4))
-            canvas.create_text(30, y-10, text=f"{i}%", fill=THEMES[current_theme]["fg"], anchor="w", font=("Consolas", 10, "bold"))
-
-        # CPU usage line
-        x = 0
-        lasty = h
-        for v in cpu_hist:
-            y = h - (v/100)*h
-            canvas.create_line(x, lasty, x+step, y, width=2, fill=THEMES[current_theme]["highlight"])
-            lasty = y
-            x += step
-
-        canvas.create_text(w/2, 10, text="CPU Usage (%)", fill=THEMES[current_theme]["fg"], font=("Consolas", 12, "bold"))
-
-        root.after(500, draw_graph)
+        if sampler.drain():
+            cpu_hist.append(sampler.latest["usage"])
+            cpu_graph.update(cpu_hist.values())
+
+        root.after(100, draw_graph)
 
     # Section switching
     active_section = "CPU"
@@ -195,14 +185,22 @@ def gui():
         active_section = name
         animate_text(SECTIONS[name]())
 
-    # Icons and buttons
-    icons = {name: load_icon(path) for name, path in ICON_FILES.items()}
+    # Buttons start out as text; load_icons() swaps in the images once
+    # the first frame is up
+    icons = {}
     buttons = {}
     for name in SECTIONS:
-        b = tk.Button(sidebar, image=icons[name], command=lambda x=name: switch_section(x))
+        b = tk.Button(sidebar, text=name, width=5, command=lambda x=name: switch_section(x))
         b.pack(pady=10)
         buttons[name] = b
 
+    def load_icons():
+        for name, b in buttons.items():
+            icon = load_icon(ICON_FILES[name])
+            if icon is not None:
+                b.configure(image=icon, width=0)
+                icons[name] = icon
+
     # Theme application
     def apply_theme(theme_name):
         theme = THEMES[theme_name]
@@ -210,13 +208,11 @@ def gui():
         sidebar.configure(bg=theme["sidebar"])
         content.configure(bg=theme["bg"])
         text.configure(bg=theme["bg"], fg=theme["fg"], insertbackground=theme["fg"])
-        canvas.configure(bg=theme["bg"])
+        cpu_graph.set_theme(theme["highlight"], fg=theme["fg"], bg=theme["bg"])
 
-        # recolor icons
-        for name, b in buttons.items():
-            new_icon = load_icon(ICON_FILES[name])
-            b.configure(image=new_icon)
-            icons[name] = new_icon
+        # recolor icons (none yet while starting up)
+        if icons:
+            load_icons()
 
     def toggle_theme(event=None):
         global current_theme
@@ -228,10 +224,14 @@ def gui():
 
     # Init
     animate_text(cpu_info())
+    sampler.start()
     draw_graph()
     apply_theme(current_theme)
 
+    root.update()  # first frame on screen before Pillow is imported
+    load_icons()
     root.mainloop()
+    sampler.stop()
 
 if __name__ == "__main__":
     gui()
\ No newline at end of file
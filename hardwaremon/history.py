@@ -0,0 +1,127 @@
+import threading
+import time
+from array import array
+
+# ---------- Metric History ---------- #
+# Fixed-capacity ring buffers over compact array('f') storage. Each metric
+# keeps 1-second raw samples plus 1-minute and 1-hour min/avg/max rollups,
+# so memory stays constant no matter how long the GUI is left running.
+
+RAW_CAPACITY = 3600          # 1 hour of 1-second samples
+MINUTE_CAPACITY = 24 * 60    # 1 day of minute rollups
+HOUR_CAPACITY = 31 * 24      # 1 month of hour rollups
+
+
+class RingBuffer:
+    __slots__ = ("capacity", "_data", "_start", "_len")
+
+    def __init__(self, capacity, typecode="f"):
+        self.capacity = capacity
+        self._data = array(typecode, [0]) * capacity
+        self._start = 0
+        self._len = 0
+
+    def append(self, value):
+        if self._len < self.capacity:
+            self._data[(self._start + self._len) % self.capacity] = value
+            self._len += 1
+        else:
+            self._data[self._start] = value
+            self._start = (self._start + 1) % self.capacity
+
+    def __len__(self):
+        return self._len
+
+    def last(self):
+        if not self._len:
+            return None
+        return self._data[(self._start + self._len - 1) % self.capacity]
+
+    def values(self, n=None):
+        # Oldest first, like the lists this replaces
+        n = self._len if n is None else min(n, self._len)
+        first = (self._start + self._len - n) % self.capacity
+        end = first + n
+        if end <= self.capacity:
+            return self._data[first:end].tolist()
+        return self._data[first:].tolist() + self._data[:end - self.capacity].tolist()
+
+
+class Rollup:
+    def __init__(self, seconds, capacity):
+        self.seconds = seconds
+        self.times = RingBuffer(capacity, "d")
+        self.min = RingBuffer(capacity)
+        self.avg = RingBuffer(capacity)
+        self.max = RingBuffer(capacity)
+        self._bucket = None
+        self._min = self._max = self._sum = 0.0
+        self._count = 0
+
+    def add(self, t, value):
+        bucket = int(t // self.seconds)
+        if bucket != self._bucket:
+            self.flush()
+            self._bucket = bucket
+            self._min = self._max = value
+            self._sum = 0.0
+            self._count = 0
+        self._min = min(self._min, value)
+        self._max = max(self._max, value)
+        self._sum += value
+        self._count += 1
+
+    def flush(self):
+        if not self._count:
+            return
+        self.times.append(self._bucket * self.seconds)
+        self.min.append(self._min)
+        self.avg.append(self._sum / self._count)
+        self.max.append(self._max)
+        self._count = 0
+
+    def rows(self, n=None):
+        # [(bucket start, min, avg, max), ...], oldest first
+        return list(zip(self.times.values(n), self.min.values(n),
+                        self.avg.values(n), self.max.values(n)))
+
+
+class MetricHistory:
+    def __init__(self, raw=RAW_CAPACITY, minutes=MINUTE_CAPACITY, hours=HOUR_CAPACITY):
+        self.times = RingBuffer(raw, "d")
+        self.raw = RingBuffer(raw)
+        self.minute = Rollup(60, minutes)
+        self.hour = Rollup(3600, hours)
+
+    def add(self, value, t=None):
+        t = time.time() if t is None else t
+        self.times.append(t)
+        self.raw.append(value)
+        self.minute.add(t, value)
+        self.hour.add(t, value)
+
+    def latest(self, n=None):
+        return self.raw.values(n)
+
+    def __len__(self):
+        return len(self.raw)
+
+
+class HistoryStore:
+    def __init__(self, names, **capacities):
+        self.metrics = {name: MetricHistory(**capacities) for name in names}
+        self.lock = threading.Lock()
+
+    def __getitem__(self, name):
+        return self.metrics[name]
+
+    def record(self, t=None, **values):
+        t = time.time() if t is None else t
+        with self.lock:
+            for name, value in values.items():
+                if value is not None:
+                    self.metrics[name].add(value, t)
+
+    def latest(self, name, n=None):
+        with self.lock:
+            return self.metrics[name].latest(n)
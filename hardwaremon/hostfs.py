@@ -0,0 +1,290 @@
+import argparse
+import gzip
+import json
+import os
+import platform
+import threading
+import time
+from collections import namedtuple
+
+from hardwaremon import commands
+
+# ---------- Host Access: Root Override, Record and Replay ---------- #
+# Every sysfs/procfs read, external command and psutil call made by the
+# collectors goes through here, which allows three modes:
+#   live    - the real machine (default)
+#   root    - files are read below another directory (a copied or synthetic
+#             tree); psutil is pointed at <root>/proc as well
+#   replay  - everything is answered from an archive captured with
+#             `hardwaremon record`, with no I/O at all
+# While recording, whatever the collectors read is captured into a
+# gzip-compressed JSON archive.
+
+ARCHIVE_VERSION = 1
+DEFAULT_ARCHIVE = "hardwaremon-capture.json.gz"
+
+ROOT = "/"
+_replay = None      # archive dict being replayed
+_recording = None   # archive dict being captured
+_types = {}         # (name, fields) -> namedtuple class, for decoding
+_handles = []       # every Handles instance, closed when the host changes
+
+
+def _new_archive():
+    return {"version": ARCHIVE_VERSION, "files": {}, "dirs": {}, "commands": {}, "calls": {}}
+
+
+def _reset_caches():
+    # Facts cached for one host must not leak into another
+    from hardwaremon import collectors, hwmon, inventory, snapshot
+    for handles in _handles:
+        handles.close()
+    hwmon.INDEX.reset()
+    inventory.reset()
+    collectors.PROCESSES.reset()
+    collectors.clear()
+    snapshot.tick()
+
+
+def live():
+    return _replay is None and ROOT == "/"
+
+
+def cacheable():
+    # Only the live host's facts belong in the on-disk inventory, and a
+    # recording has to re-read them so they end up in the archive
+    return live() and _recording is None
+
+
+def direct():
+    # Files may be read straight from disk (live or --root), bypassing read():
+    # not while replaying, and not while recording so the archive sees them
+    return _replay is None and _recording is None
+
+
+def set_root(root):
+    global ROOT
+    import psutil
+    ROOT = os.path.abspath(root) if root else "/"
+    psutil.PROCFS_PATH = path("/proc")
+    _reset_caches()
+
+
+def path(p):
+    return p if ROOT == "/" else os.path.join(ROOT, p.lstrip("/"))
+
+
+def read(p):
+    # Stripped file contents, or None when missing/unreadable
+    if _replay is not None:
+        return _replay["files"].get(p)
+    try:
+        with open(path(p)) as f:
+            value = f.read().strip()
+    except (OSError, UnicodeDecodeError):
+        value = None
+    if _recording is not None:
+        _recording["files"][p] = value
+    return value
+
+
+class Handles:
+    # Open-once files for attributes polled every tick (sysfs values): each
+    # read is one pread() at offset 0, which makes sysfs regenerate the
+    # value, instead of open + read + close. Files that can't be opened are
+    # remembered as missing until close(). Falls back to read() whenever
+    # direct() is false.
+    def __init__(self):
+        self._fds = {}      # path -> fd, or None if it couldn't be opened
+        self._lock = threading.Lock()
+        _handles.append(self)
+
+    def read(self, p):
+        if not direct():
+            return read(p)
+        with self._lock:
+            if p not in self._fds:
+                try:
+                    self._fds[p] = os.open(path(p), os.O_RDONLY)
+                except OSError:
+                    self._fds[p] = None
+            fd = self._fds[p]
+            if fd is None:
+                return None
+            try:
+                return os.pread(fd, 4096, 0).decode().strip()
+            except (OSError, UnicodeDecodeError):
+                # e.g. ENODEV after hot-unplug: reopen on the next read
+                del self._fds[p]
+                os.close(fd)
+                return None
+
+    def close(self):
+        with self._lock:
+            for fd in self._fds.values():
+                if fd is not None:
+                    os.close(fd)
+            self._fds.clear()
+
+    def __len__(self):
+        return sum(fd is not None for fd in self._fds.values())
+
+
+def listdir(p):
+    if _replay is not None:
+        entries = _replay["dirs"].get(p)
+        if entries is None:
+            raise FileNotFoundError(p)
+        return list(entries)
+    try:
+        entries = os.listdir(path(p))
+    except OSError:
+        if _recording is not None:
+            _recording["dirs"][p] = None
+        raise
+    if _recording is not None:
+        _recording["dirs"][p] = entries
+    return entries
+
+
+def exists(p):
+    if _replay is not None:
+        return _replay["files"].get(p) is not None or _replay["dirs"].get(p) is not None \
+            or p in _replay.get("exists", ())
+    found = os.path.exists(path(p))
+    if _recording is not None and found:
+        _recording.setdefault("exists", []).append(p)
+    return found
+
+
+def command(argv, timeout=None, ttl=0):
+    # Output of a program, run by commands.run() ("" when it isn't available)
+    key = " ".join(argv)
+    if _replay is not None:
+        return _replay["commands"].get(key, "")
+    output = commands.run(argv, timeout or commands.DEFAULT_TIMEOUT, ttl)
+    if _recording is not None:
+        _recording["commands"][key] = output
+    return output
+
+
+def call(key, func, *args, **kwargs):
+    # A psutil (or other live) call whose result can be recorded/replayed
+    if _replay is not None:
+        if key not in _replay["calls"]:
+            raise LookupError(f"{key} was not recorded")
+        return _decode(_replay["calls"][key])
+    value = func(*args, **kwargs)
+    if _recording is not None:
+        _recording["calls"][key] = _encode(value)
+    return value
+
+
+def _encode(value):
+    if hasattr(value, "_fields"):  # psutil's namedtuples
+        return {"__tuple__": type(value).__name__, "fields": list(value._fields),
+                "values": [_encode(v) for v in value]}
+    if isinstance(value, dict):
+        return {str(k): _encode(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    return value
+
+
+def _decode(value):
+    if isinstance(value, dict):
+        if "__tuple__" in value:
+            key = (value["__tuple__"], tuple(value["fields"]))
+            cls = _types.get(key)
+            if cls is None:
+                cls = _types[key] = namedtuple(*key)
+            return cls(*(_decode(v) for v in value["values"]))
+        return {k: _decode(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    return value
+
+
+# ---------- Archives ---------- #
+
+def start_recording():
+    global _recording
+    _recording = _new_archive()
+    _reset_caches()  # re-read static facts so they end up in the archive
+
+
+def stop_recording():
+    global _recording
+    archive, _recording = _recording, None
+    archive["exists"] = sorted(set(archive.get("exists", ())))
+    return archive
+
+
+def save(archive, filename=DEFAULT_ARCHIVE):
+    with gzip.open(filename, "wt") as f:
+        json.dump(archive, f, separators=(",", ":"))
+
+
+def load(filename):
+    with gzip.open(filename, "rt") as f:
+        archive = json.load(f)
+    if archive.get("version") != ARCHIVE_VERSION:
+        raise ValueError(f"{filename} is not a hardwaremon capture (version {archive.get('version')})")
+    return archive
+
+
+def replay(archive):
+    # Pass an archive dict or a filename; None goes back to live data
+    global _replay
+    _replay = load(archive) if isinstance(archive, str) else archive
+    _reset_caches()
+
+
+def capture(filename=DEFAULT_ARCHIVE, warmup=0.5):
+    # Run every collector and section once and save what they read
+    from hardwaremon import collectors, hardwaremon, snapshot
+    collectors.sample()  # prime cpu_percent and per-process CPU deltas
+    time.sleep(warmup)
+    start_recording()
+    try:
+        collectors.sample(snap=snapshot.tick())
+        for section in hardwaremon.SECTIONS + [hardwaremon.system_summary]:
+            section()
+    finally:
+        archive = stop_recording()
+    archive["host"] = platform.node()
+    archive["captured"] = time.time()
+    save(archive, filename)
+    return archive
+
+
+# ---------- Command Line ---------- #
+
+def add_arguments(parser):
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--root", default=None,
+                       help="read /proc, /sys and /etc below this directory instead")
+    group.add_argument("--replay", metavar="ARCHIVE", default=None,
+                       help="answer every read from a `hardwaremon record` archive")
+
+
+def apply(args):
+    if args.replay:
+        replay(args.replay)
+    elif args.root:
+        set_root(args.root)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="hardwaremon record",
+                                     description="Capture what the collectors read into an archive for replay")
+    parser.add_argument("-o", "--output", default=DEFAULT_ARCHIVE, help=f"archive to write (default: {DEFAULT_ARCHIVE})")
+    parser.add_argument("--root", default=None, help="record from a tree below this directory")
+    args = parser.parse_args(argv)
+    if args.root:
+        set_root(args.root)
+    archive = capture(args.output)
+    size = os.path.getsize(args.output)
+    print(f"Captured {len(archive['files'])} files, {len(archive['dirs'])} directories, "
+          f"{len(archive['commands'])} commands and {len(archive['calls'])} calls "
+          f"into {args.output} ({size / 1024:.1f} KiB)")
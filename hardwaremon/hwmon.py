@@ -0,0 +1,103 @@
+import os
+import re
+import threading
+
+from hardwaremon import hostfs
+
+# ---------- hwmon Readings ---------- #
+# Index keeps the list of sensor files (fan*, temp*, in*, power* inputs of
+# every chip) and reads them all in one pass through hostfs.Handles, so a
+# tick costs one pread per sensor plus one listdir of /sys/class/hwmon to
+# notice chips coming and going. Labels and chip names are only read when
+# that listing changes.
+
+HWMON_BASE = "/sys/class/hwmon"
+
+# file prefix -> (kind, divisor to get RPM / °C / V / W)
+KINDS = {"fan": ("fans", 1), "temp": ("temperatures", 1000), "in": ("voltages", 1000), "power": ("power", 1e6)}
+SENSOR_FILE = re.compile(r"(fan|temp|in|power)(\d+)_(input|average)")
+
+_read = hostfs.read
+
+
+def _natural(name):
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", name)]
+
+
+class Sensor:
+    __slots__ = ("chip", "device", "kind", "file", "label", "path", "divisor")
+
+    def __init__(self, chip, device, kind, file, label, path, divisor):
+        self.chip = chip
+        self.device = device   # "hwmon3": chip names repeat (two nvme drives...), this doesn't
+        self.kind = kind
+        self.file = file       # e.g. "fan1_input"
+        self.label = label     # from <prefix><n>_label, "" if there is none
+        self.path = path
+        self.divisor = divisor
+
+
+class Index:
+    def __init__(self):
+        self.sensors = []
+        self.scans = 0
+        self._listing = None   # chip directory names at the last scan
+        self._handles = hostfs.Handles()
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self._listing = None
+            self.sensors = []
+            self.scans = 0
+            self._handles.close()
+
+    def _scan(self, listing):
+        sensors = []
+        for hw in sorted(listing, key=_natural):
+            hw_path = os.path.join(HWMON_BASE, hw)
+            chip = _read(os.path.join(hw_path, "name")) or hw
+            try:
+                files = hostfs.listdir(hw_path)
+            except OSError:
+                continue
+            inputs = {}
+            for file in files:
+                match = SENSOR_FILE.fullmatch(file)
+                if match:
+                    prefix, number, suffix = match.groups()
+                    # power<n>_input where the chip has it, else power<n>_average
+                    if suffix == "input" or (prefix + number) not in inputs:
+                        inputs[prefix + number] = (prefix, file)
+            for sensor in sorted(inputs, key=_natural):
+                prefix, file = inputs[sensor]
+                kind, divisor = KINDS[prefix]
+                label = _read(os.path.join(hw_path, sensor + "_label")) or ""
+                sensors.append(Sensor(chip, hw, kind, file, label, os.path.join(hw_path, file), divisor))
+        self._handles.close()
+        self.sensors = sensors
+        self._listing = listing
+        self.scans += 1
+
+    def read(self):
+        # {"fans": [(chip, device, sensor file, label, value)], "temperatures": [...],
+        #  "voltages": [...], "power": [...]}, or None without /sys/class/hwmon
+        with self._lock:
+            try:
+                listing = sorted(hostfs.listdir(HWMON_BASE))
+            except OSError:
+                return None
+            if listing != self._listing:
+                self._scan(listing)
+            readings = {kind: [] for kind, _ in KINDS.values()}
+            for sensor in self.sensors:
+                raw = self._handles.read(sensor.path)
+                try:
+                    value = int(raw) / sensor.divisor
+                except (TypeError, ValueError):
+                    continue  # unreadable right now (sensor asleep, chip gone)
+                readings[sensor.kind].append((sensor.chip, sensor.device, sensor.file, sensor.label, value))
+            return readings
+
+
+INDEX = Index()
@@ -0,0 +1,189 @@
+import json
+import os
+import platform
+import tempfile
+import threading
+import time
+import zlib
+
+from hardwaremon import hostfs
+
+# ---------- Static Hardware Inventory ---------- #
+# Facts that only change on reboot or hotplug (CPU name, board, distro,
+# GPU list...) are collected once and persisted to disk. The whole cache
+# is keyed by boot id + kernel version; individual facts can also watch
+# a path (e.g. /sys/bus/pci/devices) and are re-collected when it changes.
+
+CACHE_VERSION = 3
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "hardwaremon"
+)
+CACHE_FILE = os.path.join(CACHE_DIR, "inventory.json")
+
+_collectors = {}   # name -> (function, watched path or None)
+_facts = {}        # name -> value
+_stamps = {}       # name -> signature of the watched path when collected
+_loaded = False
+_generation = 0    # bumped whenever facts are invalidated
+# Sections ask for facts from worker threads. Facts are computed outside
+# the lock (they may read other facts or run slow tools); the dicts and
+# the cache file are only touched while holding it.
+_lock = threading.RLock()
+
+
+def register(name, func, watch=None):
+    _collectors[name] = (func, watch)
+
+
+def fact(name, watch=None):
+    def decorator(func):
+        register(name, func, watch)
+        return func
+    return decorator
+
+
+def boot_id():
+    value = hostfs.read("/proc/sys/kernel/random/boot_id")
+    if value:
+        return value
+    # No boot id (non-Linux): fall back to boot time
+    try:
+        import psutil
+        return str(int(hostfs.call("boot_time", psutil.boot_time)))
+    except Exception:
+        return ""
+
+
+def cache_key():
+    return {"boot_id": boot_id(), "kernel": platform.release()}
+
+
+def _signature(path):
+    # Cheap change detector for hotplug-sensitive facts
+    if not path:
+        return None
+    try:
+        path = hostfs.path(path)
+        st = os.stat(path)
+        entries = sorted(os.listdir(path)) if os.path.isdir(path) else []
+        return f"{st.st_mtime_ns}:{len(entries)}:{zlib.crc32(' '.join(entries).encode())}"
+    except OSError:
+        return None
+
+
+def reset():
+    # Forget everything in memory (not on disk), e.g. when switching hosts
+    global _loaded, _generation
+    with _lock:
+        _generation += 1
+        _facts.clear()
+        _stamps.clear()
+        _loaded = False
+
+
+def load():
+    with _lock:
+        return _load()
+
+
+def _load():
+    global _loaded
+    _loaded = True
+    if not hostfs.cacheable():
+        return False
+    try:
+        with open(CACHE_FILE) as f:
+            data = json.load(f)
+    except Exception:
+        return False
+
+    if data.get("version") != CACHE_VERSION or data.get("key") != cache_key():
+        return False
+
+    for name, entry in data.get("facts", {}).items():
+        if name not in _collectors:
+            continue
+        watch = _collectors[name][1]
+        # Selective invalidation: drop only facts whose watched path changed
+        if watch and entry.get("stamp") != _signature(watch):
+            continue
+        _facts[name] = entry.get("value")
+        _stamps[name] = entry.get("stamp")
+    return True
+
+
+def save():
+    if not hostfs.cacheable():
+        return
+    with _lock:
+        data = {
+            "version": CACHE_VERSION,
+            "key": cache_key(),
+            "saved": time.time(),
+            "facts": {
+                name: {"value": value, "stamp": _stamps.get(name)}
+                for name, value in _facts.items()
+            },
+        }
+        tmp = None
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            # A tmp file of its own, so another process saving at the same
+            # time can't interleave with this one
+            fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, prefix="inventory.", suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp, CACHE_FILE)
+        except Exception:
+            if tmp is not None and os.path.exists(tmp):
+                os.unlink(tmp)  # a read-only home just means no warm start
+
+
+def get(name):
+    with _lock:
+        if not _loaded:
+            load()
+        if name in _facts:
+            return _facts[name]
+
+    func, watch = _collectors[name]
+    try:
+        value = func()
+    except Exception:
+        return None  # don't cache failures, try again next time
+    stamp = _signature(watch)
+    with _lock:
+        _facts[name] = value
+        _stamps[name] = stamp
+        save()
+    return value
+
+
+def generation():
+    # Changes whenever a fact may have changed; compare two calls to see
+    # whether anything built from the inventory needs redoing
+    return _generation
+
+
+def invalidate(*names):
+    # No names = drop everything
+    global _generation
+    with _lock:
+        _generation += 1
+        for name in names or list(_facts):
+            _facts.pop(name, None)
+            _stamps.pop(name, None)
+        save()
+
+
+def refresh_hotplug():
+    # Re-check watched paths; call this rarely (not every tick)
+    with _lock:
+        stale = [
+            name for name, (_, watch) in _collectors.items()
+            if watch and name in _facts and _stamps.get(name) != _signature(watch)
+        ]
+    if stale:
+        invalidate(*stale)
+    return stale
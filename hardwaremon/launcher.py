@@ -0,0 +1,31 @@
+import sys
+
+# ---------- `hardwaremon` entry point ---------- #
+# Subcommands are dispatched before anything GUI-related is imported, so
+# headless modes work on machines without Tk or Pillow.
+
+
+def main():
+    args = sys.argv[1:]
+    if args and args[0] == "daemon":
+        from hardwaremon import daemon
+        return daemon.main(args[1:])
+    if args and args[0] == "exporter":
+        from hardwaremon import exporter
+        return exporter.main(args[1:])
+    if args and args[0] == "bench":
+        from hardwaremon import bench
+        return bench.main(args[1:])
+    if args and args[0] == "record":
+        from hardwaremon import hostfs
+        return hostfs.main(args[1:])
+    if args and args[0] == "fixture":
+        from hardwaremon import fixtures
+        return fixtures.main(args[1:])
+
+    from hardwaremon.hardwaremon_gui import gui
+    return gui()
+
+
+if __name__ == "__main__":
+    main()
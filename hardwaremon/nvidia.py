@@ -0,0 +1,137 @@
+import atexit
+import subprocess
+import threading
+import time
+
+# ---------- Streaming nvidia-smi Reader ---------- #
+# Starting nvidia-smi costs tens of ms of driver initialization, so instead
+# of one process per refresh a single `nvidia-smi --query-gpu=... -lms N`
+# keeps running and prints one CSV line per GPU every N ms. A background
+# thread parses the stream and keeps the latest reading per GPU in memory.
+# If the process exits it is restarted with backoff; if it stops printing,
+# or never prints at all (hung driver call, wedged at init), latest() kills
+# it so the thread can start a new one. Nobody waits for the first line:
+# until it arrives latest() is empty, collecting() is true and the next
+# refresh picks the readings up.
+
+FIELDS = ("index", "utilization.gpu", "memory.used", "memory.total",
+          "temperature.gpu", "power.draw", "clocks.gr", "name")   # name last: it may contain commas
+KEYS = ("index", "utilization", "memory_used", "memory_total", "temperature", "power", "clock", "name")
+DEFAULT_INTERVAL_MS = 1000
+RESTART_MIN = 1.0       # seconds before restarting a process that exited
+RESTART_MAX = 60.0      # ...doubling up to this; also how often a missing nvidia-smi is retried
+
+
+def _number(value):
+    # "[N/A]", "[Not Supported]" etc. become None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def parse(line):
+    # One CSV line (csv,noheader,nounits) -> dict keyed by KEYS, or None
+    fields = [field.strip() for field in line.split(",", len(FIELDS) - 1)]
+    if len(fields) != len(FIELDS) or not fields[0].isdigit():
+        return None
+    reading = {key: _number(value) for key, value in zip(KEYS[1:-1], fields[1:-1])}
+    reading["index"] = int(fields[0])
+    reading["name"] = fields[-1]
+    return reading
+
+
+class Reader:
+    def __init__(self, interval_ms=DEFAULT_INTERVAL_MS, command="nvidia-smi"):
+        self.interval_ms = interval_ms
+        self.command = command
+        self.gpus = {}          # index -> latest reading
+        self.updated = {}       # index -> monotonic time of that reading
+        self.starts = 0         # processes started so far
+        self.error = None       # why nvidia-smi couldn't be started, if it couldn't
+        self.first_sample = threading.Event()
+        self._proc = None
+        self._heard = None      # monotonic time of the current process's start or last line
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def argv(self):
+        return [self.command, "--query-gpu=" + ",".join(FIELDS),
+                "--format=csv,noheader,nounits", "-lms", str(self.interval_ms)]
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="hardwaremon-nvidia-smi", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        proc = self._proc
+        if proc is not None and proc.poll() is None:
+            proc.terminate()
+
+    def _run(self):
+        delay = RESTART_MIN
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self._proc = subprocess.Popen(self.argv(), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                              stdin=subprocess.DEVNULL, text=True, bufsize=1)
+            except OSError as e:
+                self.error = e       # not installed (yet); look again much later
+                self._stop.wait(RESTART_MAX)
+                continue
+            self.error = None
+            self.starts += 1
+            self._heard = time.monotonic()
+            for line in iter(self._proc.stdout.readline, ""):
+                self._heard = time.monotonic()
+                reading = parse(line)
+                if reading is not None:
+                    with self._lock:
+                        self.gpus[reading["index"]] = reading
+                        self.updated[reading["index"]] = time.monotonic()
+                    self.first_sample.set()
+            self._proc.stdout.close()
+            self._proc.wait()
+            if time.monotonic() - started > RESTART_MAX:
+                delay = RESTART_MIN  # it ran fine for a while; this is a fresh failure
+            self._stop.wait(delay)
+            delay = min(delay * 2, RESTART_MAX)
+
+    def max_age(self):
+        return max(5.0, 3 * self.interval_ms / 1000)
+
+    def latest(self):
+        # Current readings sorted by GPU index; GPUs not heard from in
+        # max_age() seconds are dropped
+        now = time.monotonic()
+        with self._lock:
+            fresh = [dict(self.gpus[i]) for i in sorted(self.gpus) if now - self.updated[i] <= self.max_age()]
+        proc, heard = self._proc, self._heard
+        if heard is not None and now - heard > self.max_age() and proc is not None and proc.poll() is None:
+            proc.kill()  # stuck; the reader thread sees EOF and restarts it
+        return fresh
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared():
+    # The process-wide reader, started (and stopped at exit) on first use
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = Reader().start()
+            atexit.register(_shared.stop)
+    return _shared
+
+
+def collecting():
+    # The shared reader has been started and nvidia-smi is running but hasn't printed yet
+    reader = _shared
+    return reader is not None and reader.error is None and not reader.first_sample.is_set()
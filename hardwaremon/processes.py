@@ -0,0 +1,95 @@
+import heapq
+import time
+
+import psutil
+
+# ---------- Incremental Process Table ---------- #
+# Process handles are kept across ticks so cpu_percent() measures a real
+# delta (a fresh Process always reports 0.0 on its first call). Each tick
+# reads only the sort key for every PID, picks the top N with a bounded
+# heap, and fetches names/memory just for those N rows.
+
+SORT_KEYS = ("cpu", "rss", "io", "threads")
+
+_GONE = (psutil.NoSuchProcess, psutil.ZombieProcess)
+
+
+class ProcessTable:
+    def __init__(self):
+        self.procs = {}      # pid -> psutil.Process
+        self.io_last = {}    # pid -> read+write bytes at the previous tick
+        self.last_cost = 0.0
+        self.last_count = 0
+
+    def reset(self):
+        # Drop every handle, e.g. when /proc now points at another host
+        self.procs.clear()
+        self.io_last.clear()
+
+    def _sync(self):
+        pids = set(psutil.pids())
+        for pid in list(self.procs):
+            if pid not in pids:
+                del self.procs[pid]
+                self.io_last.pop(pid, None)
+        for pid in pids - self.procs.keys():
+            try:
+                proc = psutil.Process(pid)
+                proc.cpu_percent(None)  # prime the delta for the next tick
+            except _GONE + (psutil.AccessDenied,):
+                continue
+            self.procs[pid] = proc
+
+    def _key(self, sort, pid, proc):
+        if sort == "cpu":
+            return proc.cpu_percent(None)
+        if sort == "rss":
+            return proc.memory_info().rss
+        if sort == "threads":
+            return proc.num_threads()
+        # io: bytes moved since the previous tick
+        try:
+            io = proc.io_counters()
+        except (psutil.AccessDenied, AttributeError):
+            return 0
+        total = io.read_bytes + io.write_bytes
+        previous = self.io_last.get(pid, total)
+        self.io_last[pid] = total
+        return total - previous
+
+    def top(self, n=5, sort="cpu"):
+        if sort not in SORT_KEYS:
+            raise ValueError(f"sort must be one of {SORT_KEYS}")
+        started = time.perf_counter()
+        self._sync()
+
+        keys = {}
+        for pid, proc in list(self.procs.items()):
+            try:
+                keys[pid] = self._key(sort, pid, proc)
+            except _GONE:
+                del self.procs[pid]
+                self.io_last.pop(pid, None)
+            except psutil.AccessDenied:
+                keys[pid] = 0
+
+        rows = []
+        for pid in heapq.nlargest(n, keys, key=keys.__getitem__):
+            proc = self.procs[pid]
+            try:
+                with proc.oneshot():
+                    rows.append({
+                        "pid": pid,
+                        "name": proc.name(),
+                        "cpu": keys[pid] if sort == "cpu" else proc.cpu_percent(None),
+                        "mem": proc.memory_percent(),
+                        "rss": proc.memory_info().rss,
+                        "threads": proc.num_threads(),
+                        "key": keys[pid],
+                    })
+            except _GONE + (psutil.AccessDenied,):
+                continue
+
+        self.last_cost = time.perf_counter() - started
+        self.last_count = len(keys)
+        return rows
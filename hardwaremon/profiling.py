@@ -0,0 +1,138 @@
+import bisect
+import sys
+import threading
+import time
+
+# ---------- Per-Section Cost Instrumentation ---------- #
+# Every section run through Profiler.call() records its wall time, CPU time
+# (of the thread it ran on) and the subprocesses it started. Times go into
+# fixed log-spaced histograms, so recording is a bisect plus a few adds and
+# memory stays constant however long the app runs. Subprocesses are counted
+# from the "subprocess.Popen" audit event (os.popen and getoutput raise it
+# too), with the hook added on first use rather than at import.
+
+# Bucket upper bounds in ms: 0.05, 0.1, 0.2 ... ~13 s
+BOUNDS_MS = [0.05 * 2 ** i for i in range(19)]
+
+_local = threading.local()
+_lock = threading.Lock()
+_hooked = False
+_spawns = 0   # process-wide
+
+
+def _audit(event, args):
+    global _spawns
+    if event == "subprocess.Popen":
+        _local.spawns = getattr(_local, "spawns", 0) + 1
+        with _lock:
+            _spawns += 1
+
+
+def _install_spawn_hook():
+    # Audit hooks can't be removed again, so there is only ever one
+    global _hooked
+    with _lock:
+        if not _hooked:
+            _hooked = True
+            sys.addaudithook(_audit)
+
+
+def thread_spawns():
+    # Subprocesses started by the calling thread so far
+    _install_spawn_hook()
+    return getattr(_local, "spawns", 0)
+
+
+def total_spawns():
+    # ...and by every thread
+    _install_spawn_hook()
+    return _spawns
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BOUNDS_MS) + 1)   # last bucket: overflow
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms):
+        self.counts[bisect.bisect_left(BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, pct):
+        # Upper bound of the bucket holding the pct-th sample
+        if not self.count:
+            return 0.0
+        rank = pct / 100 * self.count
+        seen = 0
+        for bound, n in zip(BOUNDS_MS + [self.max], self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+
+class SectionStats:
+    __slots__ = ("wall", "cpu", "spawns")
+
+    def __init__(self):
+        self.wall = Histogram()
+        self.cpu = Histogram()
+        self.spawns = 0
+
+
+class Profiler:
+    def __init__(self):
+        self.stats = {}   # name -> SectionStats
+        self._lock = threading.Lock()
+
+    def call(self, name, func, *args, **kwargs):
+        spawns = thread_spawns()
+        cpu = time.thread_time()
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            wall_ms = (time.perf_counter() - started) * 1000
+            cpu_ms = (time.thread_time() - cpu) * 1000
+            spawned = thread_spawns() - spawns
+            with self._lock:
+                stats = self.stats.get(name)
+                if stats is None:
+                    stats = self.stats[name] = SectionStats()
+                stats.wall.add(wall_ms)
+                stats.cpu.add(cpu_ms)
+                stats.spawns += spawned
+
+    def wrap(self, name, func):
+        def profiled(*args, **kwargs):
+            return self.call(name, func, *args, **kwargs)
+        profiled.__name__ = getattr(func, "__name__", name)
+        return profiled
+
+    def reset(self):
+        with self._lock:
+            self.stats.clear()
+
+    def report(self, limit=None):
+        # Costliest sections first, by mean wall time
+        with self._lock:
+            rows = sorted(self.stats.items(), key=lambda item: item[1].wall.mean(), reverse=True)
+        lines = [f"{'name (ms)':24} {'p50':>7} {'p95':>7} {'max':>7} {'cpu':>6} {'spawn':>5} {'calls':>6}"]
+        for name, s in rows[:limit]:
+            n = s.wall.count
+            lines.append(f"{name[:24]:24} {s.wall.percentile(50):7.2f} {s.wall.percentile(95):7.2f} "
+                         f"{s.wall.max:7.2f} {s.cpu.mean():6.2f} {s.spawns / n if n else 0:5.2g} {n:6}")
+        return lines
+
+
+PROFILER = Profiler()
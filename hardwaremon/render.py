@@ -0,0 +1,283 @@
+import os
+import select
+import shutil
+import sys
+import time
+import unicodedata
+
+# ---------- Incremental Text Rendering ---------- #
+# Each section owns a region of the Text widget that starts at a named mark
+# ("sec:<name>", left gravity) and ends with one blank separator line. On
+# every refresh only the lines whose content changed are rewritten, so Tk
+# work scales with what actually changed rather than with the whole page.
+
+
+def _split(lines):
+    # Some sections embed "\n" inside a line; render them as real lines
+    return "\n".join(lines).split("\n")
+
+
+class TextRenderer:
+    def __init__(self, text):
+        self.text = text
+        self.layout = []      # section names, in display order
+        self.rendered = {}    # name -> lines currently in the widget
+        self.lines_written = 0
+
+    def render(self, sections):
+        # sections: [(name, lines), ...] in display order
+        sections = [(name, _split(lines)) for name, lines in sections]
+        if [name for name, _ in sections] != self.layout:
+            self._rebuild(sections)
+            return
+        for name, lines in sections:
+            self._update(name, lines)
+
+    def _rebuild(self, sections):
+        text = self.text
+        for name in self.layout:
+            text.mark_unset(f"sec:{name}")
+        text.delete("1.0", "end")
+        self.layout = []
+        self.rendered = {}
+        for name, lines in sections:
+            mark = f"sec:{name}"
+            text.mark_set(mark, "end-1c")
+            text.mark_gravity(mark, "left")
+            text.insert("end-1c", "\n".join(lines) + "\n\n")
+            self.layout.append(name)
+            self.rendered[name] = lines
+            self.lines_written += len(lines)
+
+    def _update(self, name, lines):
+        old = self.rendered[name]
+        if lines == old:
+            return
+        text = self.text
+        start = int(text.index(f"sec:{name}").split(".")[0])
+
+        for i in range(min(len(old), len(lines))):
+            if old[i] != lines[i]:
+                row = start + i
+                text.delete(f"{row}.0", f"{row}.end")
+                text.insert(f"{row}.0", lines[i])
+                self.lines_written += 1
+
+        if len(lines) > len(old):
+            # Insert before this section's blank separator line
+            extra = lines[len(old):]
+            text.insert(f"{start + len(old)}.0", "\n".join(extra) + "\n")
+            self.lines_written += len(extra)
+        elif len(lines) < len(old):
+            text.delete(f"{start + len(lines)}.0", f"{start + len(old)}.0")
+
+        self.rendered[name] = lines
+
+
+# ---------- Terminal Rendering ---------- #
+# The CLI's text mode draws into the terminal's alternate screen and keeps
+# a copy of what is on it. Each frame is composed into rows, compared with
+# that copy, and only the changed part of each changed row is written
+# (cursor move + new characters), all in one write. Rows with wide or
+# combining characters are rewritten whole, since their cells can't be
+# counted by index. Sections can be folded to their header line and the
+# view scrolls; keys are read in cbreak mode while waiting for the next tick.
+
+CSI = "\x1b["
+KEYS = {
+    "\x1b[A": "up", "\x1b[B": "down", "\x1b[5~": "pgup", "\x1b[6~": "pgdn",
+    "\x1b[H": "home", "\x1b[F": "end", "\x1b[Z": "prev", "\t": "next",
+    "k": "up", "j": "down", "b": "pgup", " ": "pgdn", "g": "home", "G": "end",
+    "p": "prev", "n": "next", "\r": "fold", "\n": "fold", "f": "fold", "F": "fold_all", "q": "quit",
+}
+HELP = " j/k scroll  space/b page  tab select  enter fold  F fold all  q quit"
+
+
+def _cells(char):
+    if unicodedata.combining(char) or char in "\u200d\ufe0f":
+        return 0
+    return 2 if unicodedata.east_asian_width(char) in "WF" else 1
+
+
+def _clip(text, width):
+    # Longest prefix of text that fits in width terminal cells
+    if text.isascii():
+        return text[:width]
+    used = 0
+    for i, char in enumerate(text):
+        used += _cells(char)
+        if used > width:
+            return text[:i]
+    return text
+
+
+class TerminalRenderer:
+    def __init__(self, out, size=None):
+        self.out = out
+        self.size = size           # (columns, lines); None = ask the terminal each frame
+        self.sections = []         # last [(name, lines)] rendered
+        self.folded = set()
+        self.selected = 0          # index into sections
+        self.top = 0               # first frame row shown
+        self.screen = []           # [(text, reverse video)] currently on the terminal
+        self.cells_written = 0
+        self._dims = None
+        self._tty = None
+
+    # ---- terminal setup ---- #
+    def __enter__(self):
+        # Keyboard first: if that fails halfway the terminal hasn't been touched yet
+        self._tty = None  # no keyboard (Windows, stdin not a terminal): just draw
+        try:
+            import termios
+            import tty
+        except ImportError:
+            termios = None
+        if termios is not None and sys.stdin is not None and sys.stdin.isatty():
+            try:
+                fd = sys.stdin.fileno()
+                self._tty = (fd, termios.tcgetattr(fd))
+                tty.setcbreak(fd)
+            except (OSError, ValueError, termios.error):
+                if self._tty:
+                    termios.tcsetattr(fd, termios.TCSADRAIN, self._tty[1])
+                self._tty = None
+        self.out.write(CSI + "?1049h" + CSI + "?25l")  # alternate screen, hide cursor
+        self.out.flush()
+        return self
+
+    def __exit__(self, *exc):
+        if self._tty:
+            import termios
+            termios.tcsetattr(self._tty[0], termios.TCSADRAIN, self._tty[1])
+        self.out.write(CSI + "?25h" + CSI + "?1049l")
+        self.out.flush()
+
+    # ---- frames ---- #
+    def render(self, sections):
+        self.sections = [(name, _split(lines)) for name, lines in sections]
+        self.selected = min(self.selected, max(0, len(self.sections) - 1))
+        self._draw()
+
+    def _rows(self):
+        # Whole frame as [(text, reverse video)], plus each section's first row
+        rows, starts = [], []
+        for i, (name, lines) in enumerate(self.sections):
+            starts.append(len(rows))
+            body = lines[1:]
+            folded = name in self.folded
+            marker = "[+] " if folded else "[-] "
+            header = marker + (lines[0] if lines else name)
+            if folded and body:
+                header += f"  ({len(body)} lines)"
+            rows.append((header, i == self.selected))
+            if not folded:
+                rows.extend((line, False) for line in body)
+            rows.append(("", False))
+        return rows, starts
+
+    def _draw(self):
+        columns, lines = self.size or shutil.get_terminal_size()
+        height = max(1, lines - 1)  # last line is the status bar
+        rows, starts = self._rows()
+        self.top = max(0, min(self.top, len(rows) - height))
+
+        visible = rows[self.top:self.top + height]
+        visible += [("", False)] * (height - len(visible))
+        status = f"{HELP}   rows {self.top + 1}-{min(len(rows), self.top + height)} of {len(rows)}"
+        visible.append((status, True))
+        frame = [(_clip(text, columns), reverse) for text, reverse in visible]
+
+        parts = []
+        if self._dims != (columns, lines):
+            self._dims = (columns, lines)
+            self.screen = []
+            parts.append(CSI + "H" + CSI + "2J")
+        for row, (new, old) in enumerate(zip(frame, self.screen + [None] * (len(frame) - len(self.screen)))):
+            if new != old:
+                parts.append(self._row_update(row, new, old))
+        self.screen = frame
+        if parts:
+            self.out.write("".join(parts))
+            self.out.flush()
+
+    def _row_update(self, row, new, old):
+        text, reverse = new
+        start = 0
+        if old is not None and old[1] == reverse and text.isascii() and old[0].isascii():
+            # Skip the unchanged prefix and suffix of the row
+            before = old[0]
+            while start < min(len(text), len(before)) and text[start] == before[start]:
+                start += 1
+            end = len(text)
+            if len(text) == len(before):
+                while end > start and text[end - 1] == before[end - 1]:
+                    end -= 1
+            changed = text[start:end]
+            erase = len(text) < len(before)
+        else:
+            changed, erase = text, True
+        self.cells_written += len(changed)
+        move = f"{CSI}{row + 1};{start + 1}H"
+        if reverse:
+            changed = CSI + "7m" + changed + CSI + "0m"
+        return move + changed + (CSI + "K" if erase else "")
+
+    # ---- keys ---- #
+    def key(self, name):
+        # Returns False for quit
+        rows, starts = self._rows()
+        columns, lines = self.size or shutil.get_terminal_size()
+        page = max(1, lines - 2)
+        if name == "quit":
+            return False
+        if name in ("up", "down", "pgup", "pgdn"):
+            step = 1 if name in ("up", "down") else page
+            self.top += step if name in ("down", "pgdn") else -step
+        elif name == "home":
+            self.top = 0
+        elif name == "end":
+            self.top = len(rows)
+        elif name in ("next", "prev") and self.sections:
+            self.selected = (self.selected + (1 if name == "next" else -1)) % len(self.sections)
+            start = starts[self.selected]
+            if not self.top <= start < self.top + page:
+                self.top = start  # bring the selected header into view
+        elif name == "fold" and self.sections:
+            self.folded ^= {self.sections[self.selected][0]}
+        elif name == "fold_all":
+            names = {name for name, _ in self.sections}
+            self.folded = set() if names <= self.folded else names
+        self._draw()
+        return True
+
+    def wait(self, timeout):
+        # Handle keys until timeout; returns False if the user quit
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return True
+            if not self._tty:
+                time.sleep(remaining)
+                return True
+            ready, _, _ = select.select([self._tty[0]], [], [], remaining)
+            if not ready:
+                return True
+            data = os.read(self._tty[0], 64).decode(errors="ignore")
+            for name in _parse_keys(data):
+                if not self.key(name):
+                    return False
+
+
+def _parse_keys(data):
+    names = []
+    while data:
+        for seq in sorted(KEYS, key=len, reverse=True):
+            if data.startswith(seq):
+                names.append(KEYS[seq])
+                data = data[len(seq):]
+                break
+        else:
+            data = data[1:]  # unknown key or escape sequence byte
+    return names
@@ -0,0 +1,88 @@
+import re
+import threading
+
+# ---------- Temperature Sensor Classification ---------- #
+# Which temperatures are the CPU's, the GPU's or the DIMMs' is decided by
+# RULES: (chip pattern, label pattern, category), first match wins, both
+# matched case-insensitively against the whole chip name / label ("" is an
+# unlabeled sensor). Each (chip, label) is classified the first time it is
+# seen and looked up afterwards; sensors no rule matches are remembered in
+# UNCLASSIFIED once and show up in summary() (--profile, F4).
+
+CPU_PACKAGE = "cpu_package"
+CPU_CORE = "cpu_core"        # per-core (coretemp) or per-CCD (k10temp, zenpower)
+GPU_EDGE = "gpu_edge"
+GPU_JUNCTION = "gpu_junction"
+GPU_MEM = "gpu_mem"
+DIMM = "dimm"
+NVME = "nvme"
+CHIPSET = "chipset"
+
+CPU = (CPU_PACKAGE, CPU_CORE)
+GPU = (GPU_EDGE, GPU_JUNCTION, GPU_MEM)
+
+RULES = [
+    # chip                              label                       category
+    (r"coretemp",                       r"package id \d+",          CPU_PACKAGE),
+    (r"coretemp",                       r"core \d+",                CPU_CORE),
+    (r"k10temp|zenpower",               r"tctl|tdie|",              CPU_PACKAGE),
+    (r"k10temp|zenpower",               r"tccd\d+",                 CPU_CORE),
+    (r"cpu_thermal|x86_pkg_temp",       r".*",                      CPU_PACKAGE),
+    (r"amdgpu|radeon",                  r"edge|",                   GPU_EDGE),
+    (r"amdgpu",                         r"junction",                GPU_JUNCTION),
+    (r"amdgpu",                         r"mem",                     GPU_MEM),
+    (r"nouveau|nvidia.*",               r".*",                      GPU_EDGE),
+    (r"jc42|spd5118|ee1004",            r".*",                      DIMM),
+    (r"nvme",                           r".*",                      NVME),
+    (r"pch_\w+",                        r".*",                      CHIPSET),
+    # Super I/O chips (nct67xx, it87...) name some of their inputs
+    (r".*",                             r"pch.*|chipset.*",         CHIPSET),
+    (r".*",                             r"cputin|cpu( package)?",   CPU_PACKAGE),
+    (r".*",                             r"core \d+",                CPU_CORE),
+    (r".*",                             r"gpu.*",                   GPU_EDGE),
+    (r".*",                             r"dimm.*|memory.*",         DIMM),
+]
+
+_rules = [(re.compile(chip, re.IGNORECASE), re.compile(label, re.IGNORECASE), category)
+          for chip, label, category in RULES]
+_index = {}          # (chip, label) -> category, or None when no rule matched
+_lock = threading.Lock()
+UNCLASSIFIED = []    # (chip, label) in the order they were first seen
+
+
+def _match(chip, label):
+    for chip_re, label_re, category in _rules:
+        if chip_re.fullmatch(chip) and label_re.fullmatch(label):
+            return category
+    return None
+
+
+def classify(chip, label):
+    key = (chip, label or "")
+    try:
+        return _index[key]
+    except KeyError:
+        pass
+    category = _match(*key)
+    with _lock:
+        if key not in _index:
+            _index[key] = category
+            if category is None:
+                UNCLASSIFIED.append(key)
+    return category
+
+
+def group(temps):
+    # {category: [records]} for anything with .chip and .label, in input order
+    groups = {}
+    for temp in temps:
+        category = classify(temp.chip, temp.label)
+        if category is not None:
+            groups.setdefault(category, []).append(temp)
+    return groups
+
+
+def summary():
+    with _lock:
+        unknown = ", ".join(f"{chip}/{label}" if label else chip for chip, label in UNCLASSIFIED)
+        return f"sensors: {len(_index) - len(UNCLASSIFIED)} classified, unclassified: {unknown or 'none'}"
@@ -0,0 +1,150 @@
+import threading
+import time
+
+import psutil
+
+from hardwaremon import hostfs, hwmon
+
+# ---------- Per-Tick Sensor Snapshot ---------- #
+# Every psutil source is sampled at most once per tick and shared by all
+# sections, alerts and graphs. Calling cpu_percent(interval=None) from
+# several places resets its measurement window, and sensors_temperatures()
+# walks every hwmon chip, so neither should run more than once a tick. The
+# "hwmon" source is the one batched read behind fans, temperatures, voltages
+# and power (see hwmon.py).
+
+MAX_AGE = 1.0  # a snapshot older than this is replaced by current()
+
+
+def _temperatures():
+    if not hasattr(psutil, "sensors_temperatures"):
+        return {}
+    return hostfs.call("sensors_temperatures", psutil.sensors_temperatures) or {}
+
+
+def _battery():
+    if not hasattr(psutil, "sensors_battery"):
+        return None
+    return hostfs.call("sensors_battery", psutil.sensors_battery)
+
+
+SOURCES = {
+    "cpu_percent": lambda: hostfs.call("cpu_percent", psutil.cpu_percent, interval=None),
+    "virtual_memory": lambda: hostfs.call("virtual_memory", psutil.virtual_memory),
+    "disk_usage": lambda: hostfs.call("disk_usage:/", psutil.disk_usage, hostfs.path("/")),
+    "temperatures": _temperatures,
+    "hwmon": hwmon.INDEX.read,
+    "battery": _battery,
+}
+
+
+class Snapshot:
+    def __init__(self, previous=None):
+        self.taken = time.time()
+        self._values = {}
+        self._times = {}     # name -> when the value was actually sampled
+        self._stale = set()  # sources that failed this tick
+        self._errors = {}    # key -> exception, for failures with no earlier value to fall back on
+        self._previous = previous
+        self._lock = threading.Lock()
+        self._locks = {}     # key -> lock held while that key is sampled
+
+    def get(self, name):
+        return self.memo(name, SOURCES[name])
+
+    def memo(self, key, func):
+        # Run func at most once for this snapshot. Each key has its own lock
+        # so a slow source doesn't hold up the others. A failure is raised
+        # again to every caller unless an earlier value can stand in for it.
+        value = self._memo(key, func)
+        error = self._errors.get(key)
+        if error is not None:
+            raise error
+        return value
+
+    def _memo(self, key, func):
+        with self._lock:
+            if key in self._values:
+                return self._values[key]
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            if key not in self._values:
+                self._sample(key, func)
+            return self._values[key]
+
+    def _sample(self, key, func):
+        try:
+            value = func()
+            self._times[key] = time.time()
+        except Exception as e:
+            # Keep showing the last good value, but remember it is old
+            prev = self._previous
+            if prev is not None and key in prev._values and key not in prev._errors:
+                value = prev._values[key]
+                self._times[key] = prev._times[key]
+            else:
+                value = None
+                self._times[key] = None
+                self._errors[key] = e
+            self._stale.add(key)
+        self._values[key] = value
+
+    def age(self, name):
+        if name in SOURCES:
+            self._memo(name, SOURCES[name])
+        sampled = self._times.get(name)
+        return None if sampled is None else time.time() - sampled
+
+    def is_stale(self, name, max_age=None):
+        if name in SOURCES:
+            self._memo(name, SOURCES[name])
+        if name in self._stale:
+            return True
+        if max_age is not None:
+            age = self.age(name)
+            return age is None or age > max_age
+        return False
+
+    def stale_tag(self, name, max_age=None):
+        return " (stale)" if self.is_stale(name, max_age) else ""
+
+    # Shorthands for the common sources
+    def cpu_percent(self):
+        return self.get("cpu_percent")
+
+    def virtual_memory(self):
+        return self.get("virtual_memory")
+
+    def disk_usage(self):
+        return self.get("disk_usage")
+
+    def temperatures(self):
+        return self.get("temperatures") or {}
+
+    def battery(self):
+        return self.get("battery")
+
+    def hwmon(self):
+        return self.get("hwmon") or {}
+
+
+_current = None
+_tick_lock = threading.Lock()
+
+
+def tick():
+    # Start a new sampling pass; call once at the top of every refresh
+    global _current
+    with _tick_lock:
+        previous = _current
+        _current = Snapshot(previous)
+        if previous is not None:
+            previous._previous = None  # only keep one generation around
+        return _current
+
+
+def current():
+    snap = _current
+    if snap is None or time.time() - snap.taken > MAX_AGE:
+        snap = tick()
+    return snap
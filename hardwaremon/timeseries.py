@@ -0,0 +1,186 @@
+import math
+import mmap
+import os
+import struct
+import time
+import zlib
+
+# ---------- On-Disk Time-Series Ring ---------- #
+# A fixed-size file: a small header followed by `capacity` fixed-width
+# records, memory-mapped and written in place. Every record carries a
+# sequence number and a CRC, so a crash mid-write only ever loses the torn
+# record; readers skip slots whose CRC doesn't match and order the rest by
+# sequence. The header's last_seq is only a hint: readers start from it,
+# check it against the slots and step back from there, so loading the last
+# few minutes doesn't mean reading a day of records.
+
+MAGIC = b"HWMONTS1"
+VERSION = 1
+
+FIELDS = (
+    "cpu", "mem", "disk", "swap",
+    "net_sent", "net_recv",       # bytes/s
+    "disk_read", "disk_write",    # bytes/s
+)
+
+HEADER = struct.Struct("<8sIIII64sQ")   # magic, version, record size, capacity, nfields, names, last_seq
+HEADER_SIZE = 128
+RECORD = struct.Struct(f"<Qd{len(FIELDS)}fI")   # seq, timestamp, values..., crc32
+DEFAULT_CAPACITY = 86400   # one day of 1 s samples (~4.5 MB)
+
+
+def default_path():
+    from hardwaremon import inventory
+    return os.path.join(inventory.CACHE_DIR, "history.ring")
+
+
+def _crc(seq, t, values):
+    return zlib.crc32(RECORD.pack(seq, t, *values, 0)[:-4])
+
+
+class RingFile:
+    def __init__(self, path=None, capacity=DEFAULT_CAPACITY, writable=False):
+        self.path = path or default_path()
+        self.writable = writable
+        if writable:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                import fcntl
+                fcntl.flock(self.fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except ImportError:
+                pass
+            except OSError:
+                os.close(self.fd)
+                raise RuntimeError(f"{self.path} is already being written by another daemon")
+        else:
+            self.fd = os.open(self.path, os.O_RDONLY)
+
+        size = os.fstat(self.fd).st_size
+        if writable and not self._valid_header(size):
+            self._format(capacity)
+            size = os.fstat(self.fd).st_size
+        elif not self._valid_header(size):
+            os.close(self.fd)
+            raise ValueError(f"{self.path} is not a hardwaremon ring file")
+
+        access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+        self.mm = mmap.mmap(self.fd, size, access=access)
+        _, _, _, self.capacity, _, _, _ = HEADER.unpack_from(self.mm, 0)
+        self.seq = self.last_seq() if writable else 0
+
+    def _valid_header(self, size):
+        if size < HEADER_SIZE:
+            return False
+        magic, version, record_size, capacity, nfields, names, _ = HEADER.unpack(
+            os.pread(self.fd, HEADER.size, 0))
+        return (magic == MAGIC and version == VERSION and record_size == RECORD.size
+                and nfields == len(FIELDS) and names.rstrip(b"\0") == ",".join(FIELDS).encode()
+                and size == HEADER_SIZE + capacity * record_size)
+
+    def _format(self, capacity):
+        os.ftruncate(self.fd, 0)
+        os.ftruncate(self.fd, HEADER_SIZE + capacity * RECORD.size)
+        header = HEADER.pack(MAGIC, VERSION, RECORD.size, capacity, len(FIELDS),
+                             ",".join(FIELDS).encode(), 0)
+        os.pwrite(self.fd, header.ljust(HEADER_SIZE, b"\0"), 0)
+        os.fsync(self.fd)
+
+    def _slot(self, seq):
+        return HEADER_SIZE + (seq % self.capacity) * RECORD.size
+
+    def _records(self):
+        for i in range(self.capacity):
+            seq, t, *rest = RECORD.unpack_from(self.mm, HEADER_SIZE + i * RECORD.size)
+            values, crc = rest[:-1], rest[-1]
+            if seq and crc == _crc(seq, t, values):
+                yield seq, t, values
+
+    def _record(self, seq):
+        # (timestamp, values) if seq's slot still holds that record intact
+        stored, t, *rest = RECORD.unpack_from(self.mm, self._slot(seq))
+        values, crc = rest[:-1], rest[-1]
+        if stored == seq and crc == _crc(seq, t, values):
+            return t, values
+        return None
+
+    def _scan_last_seq(self):
+        return max((seq for seq, _, _ in self._records()), default=0)
+
+    def last_seq(self):
+        seq, = struct.unpack_from("<Q", self.mm, HEADER.size - 8)
+        if seq and self._record(seq) is None:
+            return self._scan_last_seq()  # the hint doesn't match the slots
+        # A crash between a record and its header update leaves the hint behind
+        for _ in range(self.capacity):
+            if self._record(seq + 1) is None:
+                break
+            seq += 1
+        return seq
+
+    def append(self, values, t=None):
+        t = time.time() if t is None else t
+        values = [float(values.get(name) or 0.0) for name in FIELDS] \
+            if isinstance(values, dict) else [float(v) for v in values]
+        self.seq += 1
+        # Record first (CRC makes a torn write detectable), header hint second
+        RECORD.pack_into(self.mm, self._slot(self.seq), self.seq, t, *values,
+                         _crc(self.seq, t, values))
+        struct.pack_into("<Q", self.mm, HEADER.size - 8, self.seq)
+
+    def read(self, since=None):
+        # [(timestamp, {field: value}), ...] oldest first
+        rows = sorted(self._records())
+        return [(t, dict(zip(FIELDS, values))) for _, t, values in rows
+                if since is None or t >= since]
+
+    def latest(self, n):
+        # The newest n intact records, oldest first; torn ones are stepped over
+        rows = []
+        seq = self.last_seq()
+        oldest = max(0, seq - self.capacity)
+        while seq > oldest and len(rows) < n:
+            record = self._record(seq)
+            if record is not None:
+                rows.append(record)
+            seq -= 1
+        return [(t, dict(zip(FIELDS, values))) for t, values in reversed(rows)]
+
+    def flush(self):
+        self.mm.flush()
+
+    def close(self):
+        try:
+            self.mm.close()
+        finally:
+            os.close(self.fd)
+
+
+def attach(store, path=None):
+    # Backfill a HistoryStore from the daemon's ring, as many records as
+    # its raw buffers hold; returns records loaded
+    try:
+        ring = RingFile(path)
+    except (OSError, ValueError):
+        return 0
+    try:
+        rows = ring.latest(max(metric.raw.capacity for metric in store.metrics.values()))
+    finally:
+        ring.close()
+    for t, values in rows:
+        # NaN: the daemon couldn't read that field then
+        store.record(t=t, **{name: values[name] for name in store.metrics
+                             if name in values and not math.isnan(values[name])})
+    return len(rows)
+
+
+def recent(field, n, path=None):
+    # Last n values of one field, oldest first ([] when no daemon has run)
+    try:
+        ring = RingFile(path)
+    except (OSError, ValueError):
+        return []
+    try:
+        return [values[field] for _, values in ring.latest(n) if not math.isnan(values[field])]
+    finally:
+        ring.close()
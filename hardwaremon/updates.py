@@ -0,0 +1,111 @@
+import json
+import os
+import threading
+import time
+
+from hardwaremon import inventory
+
+# ---------- Background Update Check ---------- #
+# The latest release is looked up on a daemon thread, so a slow or missing
+# network never holds up the window. The answer and the response's ETag are
+# kept in a small cache file: within CHECK_INTERVAL no request is made at
+# all, and after that a conditional request (If-None-Match) usually comes
+# back as an empty 304.
+
+REPO = "louisboii747/HardwareMon"
+URL = f"https://api.github.com/repos/{REPO}/releases/latest"
+CACHE_FILE = os.path.join(inventory.CACHE_DIR, "update.json")
+CHECK_INTERVAL = 6 * 3600   # seconds between requests, across launches
+TIMEOUT = 5
+
+_lock = threading.Lock()
+_message = None
+_thread = None
+
+
+def _version(tag):
+    # "v3.0.10" -> (3, 0, 10); None if it isn't a plain dotted version
+    try:
+        return tuple(int(part) for part in tag.lstrip("v").split("."))
+    except (AttributeError, ValueError):
+        return None
+
+
+def is_newer(latest, current):
+    if not latest:
+        return False
+    new, old = _version(latest), _version(current)
+    if new is None or old is None:
+        return latest.lstrip("v") != current.lstrip("v")
+    return new > old
+
+
+def format_message(latest, current):
+    return f"Update available: v{latest.lstrip('v')}" if is_newer(latest, current) else None
+
+
+def load_cache(path=CACHE_FILE):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache, path=CACHE_FILE):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(cache, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # no cache just means asking again next launch
+
+
+def check(current, url=URL, path=CACHE_FILE, max_age=CHECK_INTERVAL):
+    # Blocking; returns the update message or None. Failures (offline,
+    # rate limited...) keep the last known answer and count as a check,
+    # so an offline machine doesn't retry on every launch.
+    global _message
+    cache = load_cache(path)
+    if cache.get("url") != url:
+        cache = {"url": url}
+    if time.time() - cache.get("checked", 0) >= max_age:
+        import requests  # only ever imported on the checker thread
+        headers = {"Accept": "application/vnd.github+json"}
+        if cache.get("etag"):
+            headers["If-None-Match"] = cache["etag"]
+        try:
+            response = requests.get(url, headers=headers, timeout=TIMEOUT)
+            if response.status_code == 200:
+                cache["latest"] = response.json()["tag_name"]
+                cache["etag"] = response.headers.get("ETag")
+        except Exception:
+            pass
+        cache["checked"] = time.time()
+        save_cache(cache, path)
+
+    message = format_message(cache.get("latest"), current)
+    with _lock:
+        _message = message
+    return message
+
+
+def start(current, url=URL, path=CACHE_FILE, max_age=CHECK_INTERVAL):
+    # Answer from the cache file right away, then check in the background
+    global _message, _thread
+    cache = load_cache(path)
+    with _lock:
+        _message = format_message(cache.get("latest") if cache.get("url") == url else None, current)
+        if _thread is not None and _thread.is_alive():
+            return _thread
+        _thread = threading.Thread(target=check, args=(current, url, path, max_age),
+                                   name="hardwaremon-update-check", daemon=True)
+    _thread.start()
+    return _thread
+
+
+def message():
+    # Latest known update message; never blocks
+    return _message
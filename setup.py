@@ -14,7 +14,7 @@ setup(
     ],
     entry_points={
         "console_scripts": [
-            "hardwaremon=hardwaremon.hardwaremon_gui:gui",   # GUI
+            "hardwaremon=hardwaremon.launcher:main",   # GUI (+ `hardwaremon daemon|exporter|bench|record|fixture`)
             "hardwaremon_cli=hardwaremon.hardwaremon:main"   # CLI
         ]
     },
@@ -1,5 +1,1062 @@
+import pytest
+
 from hardwaremon.hardwaremon import check_alerts
 
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    # Keep every test away from the real ~/.cache/hardwaremon
+    from hardwaremon import inventory
+    monkeypatch.setattr(inventory, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(inventory, "CACHE_FILE", str(tmp_path / "inventory.json"))
+    return tmp_path
+
+
 def test_alerts_returns_list():
     result = check_alerts()
     assert isinstance(result, list)
+
+
+def test_inventory_cache_roundtrip(tmp_path, monkeypatch):
+    from hardwaremon import inventory
+    monkeypatch.setattr(inventory, "_facts", {})
+    monkeypatch.setattr(inventory, "_stamps", {})
+    monkeypatch.setattr(inventory, "_loaded", False)
+
+    calls = []
+    monkeypatch.setitem(inventory._collectors, "test_fact", (lambda: calls.append(1) or "value", None))
+    assert inventory.get("test_fact") == "value"
+    assert inventory.get("test_fact") == "value"
+    assert len(calls) == 1
+
+    # Cold start: reuse what was persisted
+    monkeypatch.setattr(inventory, "_facts", {})
+    monkeypatch.setattr(inventory, "_loaded", False)
+    assert inventory.get("test_fact") == "value"
+    assert len(calls) == 1
+
+    inventory.invalidate("test_fact")
+    assert inventory.get("test_fact") == "value"
+    assert len(calls) == 2
+
+
+def test_sysfs_pci_enumeration(tmp_path, monkeypatch):
+    from hardwaremon import devices
+    ids = tmp_path / "pci.ids"
+    ids.write_text(
+        "# comment\n"
+        "10de  NVIDIA Corporation\n"
+        "\t2484  GA104 [GeForce RTX 3070]\n"
+        "\t\t1043 87b8  Subsystem\n"
+        "8086  Intel Corporation\n"
+        "C 03  Display controller\n"
+        "\t00  VGA compatible controller\n"
+        "\t02  3D controller\n"
+    )
+    dev = tmp_path / "devices" / "0000:01:00.0"
+    dev.mkdir(parents=True)
+    for attr, value in [("class", "0x030000"), ("vendor", "0x10de"), ("device", "0x2484"),
+                        ("revision", "0xa1"), ("current_link_width", "16"),
+                        ("max_link_width", "16")]:
+        (dev / attr).write_text(value + "\n")
+
+    monkeypatch.setattr(devices, "PCI_DEVICES", str(tmp_path / "devices"))
+    monkeypatch.setattr(devices, "PCI_IDS", devices.IdsDatabase([str(ids)]))
+
+    (gpu,) = devices.pci_display_devices()
+    assert gpu.link_width == 16
+    assert devices.format_pci(gpu) == \
+        "01:00.0 VGA compatible controller: NVIDIA Corporation GA104 [GeForce RTX 3070] (rev a1)"
+
+
+def test_ids_lookups_and_inventory_saves_from_threads(tmp_path, monkeypatch):
+    import json
+    import threading
+    from hardwaremon import devices, inventory
+
+    ids = tmp_path / "usb.ids"
+    ids.write_text("".join(f"{v:04x}  Vendor {v}\n\t0001  Device\n" for v in range(1, 5000)))
+    db = devices.IdsDatabase([str(ids)])
+    barrier = threading.Barrier(4)
+    names = []
+
+    def lookup():
+        barrier.wait()
+        names.append(db.vendor(4000))
+
+    threads = [threading.Thread(target=lookup) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert names == ["Vendor 4000"] * 4
+
+    monkeypatch.setattr(inventory, "_facts", {f"fact{i}": "x" * 10000 for i in range(20)})
+    savers = [threading.Thread(target=inventory.save) for _ in range(8)]
+    for t in savers:
+        t.start()
+    for t in savers:
+        t.join()
+    with open(inventory.CACHE_FILE) as f:
+        assert len(json.load(f)["facts"]) == 20
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["inventory.json", "usb.ids"]
+
+
+def test_snapshot_samples_once_and_flags_stale(monkeypatch):
+    from hardwaremon import snapshot
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) > 1:
+            raise OSError("hwmon went away")
+        return 42.0
+
+    monkeypatch.setitem(snapshot.SOURCES, "cpu_percent", flaky)
+    monkeypatch.setattr(snapshot, "_current", None)
+    snap = snapshot.tick()
+    assert snap.cpu_percent() == 42.0
+    assert snap.cpu_percent() == 42.0
+    assert len(calls) == 1
+    assert not snap.is_stale("cpu_percent")
+
+    # Sampling fails: the last good value is kept and marked stale
+    snap = snapshot.tick()
+    assert snap.cpu_percent() == 42.0
+    assert snap.is_stale("cpu_percent")
+
+
+def test_missing_sources_report_why_instead_of_crashing(tmp_path, capsys):
+    from hardwaremon import exporter, hardwaremon, hostfs
+
+    (tmp_path / "sys").mkdir()                               # no /proc at all
+    try:
+        hardwaremon.main(["--root", str(tmp_path), "--count", "1", "--interval", "0"])
+        out = capsys.readouterr().out
+        assert "cpu_mem_bar unavailable: FileNotFoundError" in out and "proc/stat" in out
+        assert "=== Operating System Information ===" in out   # the rest still renders
+        assert exporter.collect() is not None
+    finally:
+        hostfs.set_root(None)
+
+
+def test_history_ring_and_rollups():
+    from hardwaremon.history import MetricHistory
+    hist = MetricHistory(raw=5, minutes=3, hours=2)
+    for i in range(130):
+        hist.add(float(i), t=float(i))
+
+    # Raw buffer keeps only the newest samples, oldest first
+    assert hist.latest() == [125.0, 126.0, 127.0, 128.0, 129.0]
+    assert hist.latest(2) == [128.0, 129.0]
+
+    # Two complete minutes have been rolled up
+    assert hist.minute.rows() == [(0.0, 0.0, 29.5, 59.0), (60.0, 60.0, 89.5, 119.0)]
+
+
+def test_engine_marks_slow_collector_stale():
+    import threading
+    import time
+    from hardwaremon.engine import CollectionEngine
+
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return ["=== Slow ==="]
+
+    collection = CollectionEngine({"fast": lambda: ["=== Fast ==="], "slow": slow},
+                                  interval=0.05, deadlines={"slow": 0.1})
+    collection.start()
+    try:
+        deadline = time.time() + 2
+        while "fast" not in collection.latest and time.time() < deadline:
+            collection.drain()
+            time.sleep(0.01)
+        time.sleep(0.2)
+        collection.drain()
+        assert collection.latest["fast"] == ["=== Fast ==="]
+        assert not collection.is_stale("fast")
+        assert "slow" not in collection.latest
+        assert collection.is_stale("slow")
+    finally:
+        release.set()
+        collection.stop()
+
+
+def test_engine_intervals_backoff_and_on_change(monkeypatch):
+    import itertools
+    import time
+    from hardwaremon import collectors, engine
+
+    monkeypatch.setattr(engine, "CHANGE_POLL", 0.05)
+    counter = itertools.count()
+    runs = {"moving": 0, "flat": 0, "inventory": 0}
+    hotplug = []
+
+    def job(name, value):
+        def run():
+            runs[name] += 1
+            return value()
+        return run
+
+    collection = engine.CollectionEngine(
+        {"moving": job("moving", lambda: next(counter)), "flat": job("flat", lambda: 1),
+         "inventory": job("inventory", lambda: 1)},
+        intervals={"moving": 0.02, "flat": 0.02, "inventory": engine.ON_CHANGE},
+        changed=lambda name: bool(hotplug and hotplug.pop()))
+    collection.start()
+    try:
+        time.sleep(0.5)
+        assert runs["inventory"] == 1
+        assert runs["moving"] > 2 * runs["flat"]   # unchanged values back off
+        assert collection.effective_interval("flat") == 0.02 * engine.MAX_BACKOFF
+        hotplug.append(True)
+        time.sleep(0.2)
+        assert runs["inventory"] == 2
+        collection.drain()
+        assert not collection.is_stale("inventory")
+    finally:
+        collection.stop()
+
+    assert collectors.interval({"usage", "disk", "gpus"}) == collectors.INTERVALS["usage"]
+    assert collectors.interval({"gpus", "board"}) is engine.ON_CHANGE
+    assert collectors.traced(collectors.interval, ["disk"]) == (5.0, set())
+
+
+def test_collectors_reuse_values_until_their_interval(monkeypatch):
+    from hardwaremon import collectors, hardwaremon, snapshot
+    reads = {"usage": 0, "temperatures": 0}
+
+    def usage(snap):
+        reads["usage"] += 1
+        return collectors.Usage(10.0, 20.0, 30.0)
+
+    def temperatures(snap):
+        reads["temperatures"] += 1
+        return [collectors.Temperature("amdgpu", "edge", 50.0, "hwmon0")]
+
+    monkeypatch.setitem(collectors.REGISTRY, "usage", usage)
+    monkeypatch.setitem(collectors.REGISTRY, "temperatures", temperatures)
+    monkeypatch.setitem(collectors.INTERVALS, "usage", 0.25)
+    for _ in range(3):                      # alerts read both, every usage tick
+        snapshot.tick()
+        hardwaremon.check_alerts()
+        monkeypatch.setitem(collectors._values, "usage", (0, usage, None))   # usage is due again
+    assert reads == {"usage": 3, "temperatures": 1}
+
+
+def test_process_table_keeps_handles_between_ticks():
+    import os
+    from hardwaremon.processes import ProcessTable
+
+    table = ProcessTable()
+    rows = table.top(3, "rss")
+    assert len(rows) <= 3
+    assert rows == sorted(rows, key=lambda r: r["key"], reverse=True)
+    me = table.procs[os.getpid()]
+
+    table.top(3, "cpu")
+    assert table.procs[os.getpid()] is me
+    assert table.last_count >= len(rows)
+
+
+def test_process_table_deltas_sorting_and_exits(tmp_path):
+    import subprocess
+    import sys
+    import time
+    from hardwaremon.processes import ProcessTable
+
+    # One child spins and writes, the other sits in 16 idle threads
+    busy = subprocess.Popen([sys.executable, "-c", f"""
+import os
+fd = os.open({str(tmp_path / "out")!r}, os.O_WRONLY | os.O_CREAT)
+while True:
+    os.write(fd, b"x" * 65536)
+    os.fsync(fd)
+    os.lseek(fd, 0, 0)
+"""])
+    threaded = subprocess.Popen([sys.executable, "-c", """
+import threading, time
+for _ in range(16):
+    threading.Thread(target=time.sleep, args=(60,), daemon=True).start()
+time.sleep(60)
+"""])
+    every = 100000
+    try:
+        time.sleep(0.3)
+        table = ProcessTable()
+        table.top(every, "cpu")             # first sight: primes the CPU delta
+        table.top(every, "io")              # ...and the I/O baseline
+        assert busy.pid in table.io_last and threaded.pid in table.io_last
+        time.sleep(0.5)
+
+        rows = {row["pid"]: row for row in table.top(every, "cpu")}
+        assert rows[busy.pid]["cpu"] > 0
+
+        rows = table.top(every, "io")
+        assert [row["key"] for row in rows] == sorted((row["key"] for row in rows), reverse=True)
+        keys = {row["pid"]: row["key"] for row in rows}
+        assert keys[busy.pid] > 0 and keys[threaded.pid] == 0
+
+        rows = table.top(every, "threads")
+        assert [row["key"] for row in rows] == sorted((row["key"] for row in rows), reverse=True)
+        assert all(row["key"] == row["threads"] for row in rows)
+        order = [row["pid"] for row in rows]
+        assert order.index(threaded.pid) < order.index(busy.pid)
+    finally:
+        for child in (busy, threaded):
+            child.kill()
+            child.wait()
+
+    table.top(every, "io")
+    for pid in (busy.pid, threaded.pid):
+        assert pid not in table.procs and pid not in table.io_last
+
+
+def test_ring_file_wraps_and_skips_torn_records(tmp_path):
+    from hardwaremon import timeseries
+    path = str(tmp_path / "history.ring")
+
+    ring = timeseries.RingFile(path, capacity=4, writable=True)
+    for i in range(6):
+        ring.append({"cpu": float(i)}, t=100.0 + i)
+    # Simulate a crash in the middle of writing the newest record
+    offset = ring._slot(ring.seq) + 12
+    ring.mm[offset:offset + 4] = b"\xff\xff\xff\xff"
+    ring.close()
+
+    reader = timeseries.RingFile(path)
+    assert [values["cpu"] for _, values in reader.read()] == [2.0, 3.0, 4.0]
+    assert [values["cpu"] for _, values in reader.latest(2)] == [3.0, 4.0]
+    reader.close()
+
+    # A restarted writer carries on after the last intact record
+    ring = timeseries.RingFile(path, writable=True)
+    assert ring.seq == 5
+    ring.close()
+
+    # Backfill starts from the header hint and reads only the newest slots
+    big = str(tmp_path / "big.ring")
+    ring = timeseries.RingFile(big, capacity=10000, writable=True)
+    for i in range(50):
+        ring.append({"cpu": float(i)}, t=100.0 + i)
+    ring.close()
+    reader = timeseries.RingFile(big)
+    reader._records = None                                   # a full scan would fail
+    assert [values["cpu"] for _, values in reader.latest(3)] == [47.0, 48.0, 49.0]
+    reader.close()
+    assert timeseries.recent("cpu", 2, big) == [48.0, 49.0]
+
+
+def test_daemon_keeps_running_when_collectors_fail(tmp_path, capsys):
+    import math
+    from hardwaremon import daemon, history, hostfs, timeseries
+
+    (tmp_path / "host").mkdir()                              # no /proc, no /sys
+    path = str(tmp_path / "history.ring")
+    try:
+        hostfs.set_root(str(tmp_path / "host"))
+        assert daemon.run(path, interval=0, capacity=8, count=3) == 3
+    finally:
+        hostfs.set_root(None)
+    assert capsys.readouterr().err.count("usage unavailable") == 1   # reported once
+
+    ring = timeseries.RingFile(path)
+    assert all(math.isnan(values["cpu"]) for _, values in ring.read())
+    ring.close()
+    store = history.HistoryStore(["cpu"])
+    timeseries.attach(store, path)
+    assert len(store["cpu"]) == 0 and timeseries.recent("cpu", 5, path) == []
+
+
+def test_exporter_serves_cached_openmetrics():
+    import threading
+    import urllib.request
+    from hardwaremon import exporter
+
+    server, cache = exporter.serve(port=0, interval=60)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/metrics"
+        request = urllib.request.Request(url, headers={"Accept": "application/openmetrics-text"})
+        with urllib.request.urlopen(request) as response:
+            body = response.read().decode()
+        assert "hardwaremon_cpu_usage_percent " in body
+        assert body.endswith("# EOF\n")
+
+        # Repeated scrapes reuse the serialized sample
+        assert cache.payload(True) is cache.payload(True)
+        assert cache.generation == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+        cache.stop()
+
+
+def test_exporter_series_unique_for_repeated_chip_names(tmp_path):
+    from hardwaremon import exporter, fixtures, hostfs
+
+    fixtures.build(str(tmp_path), processes=5, interfaces=2, mounts=1, chips=0)
+    for hw in ("hwmon1", "hwmon2"):                          # two NVMe drives
+        chip = tmp_path / "sys" / "class" / "hwmon" / hw
+        chip.mkdir(parents=True)
+        for name, text in (("name", "nvme"), ("temp1_input", "40000"), ("temp1_label", "Composite")):
+            (chip / name).write_text(text + "\n")
+    try:
+        hostfs.set_root(str(tmp_path))
+        (temps,) = [fam for fam in exporter.collect() if fam.name == "hardwaremon_temperature_celsius"]
+    finally:
+        hostfs.set_root(None)
+    assert [labels["device"] for labels, _ in temps.samples] == ["hwmon1", "hwmon2"]
+    series = [tuple(sorted(labels.items())) for labels, _ in temps.samples]
+    assert len(set(series)) == len(series) == 2
+
+
+def test_exporter_scrape_survives_loadavg_failure(monkeypatch):
+    from hardwaremon import exporter, hostfs
+
+    real_call = hostfs.call
+
+    def call(name, func, *args):
+        if name == "getloadavg":
+            raise OSError("no /proc/loadavg")
+        return real_call(name, func, *args)
+
+    monkeypatch.setattr(hostfs, "call", call)
+    names = [fam.name for fam in exporter.collect()]
+    assert "hardwaremon_load_average" not in names
+    assert "hardwaremon_memory_used_bytes" in names
+
+
+def test_cli_streams_ndjson_records(capsys):
+    import json
+    from hardwaremon.hardwaremon import main
+
+    main(["--format", "ndjson", "--count", "2", "--interval", "0"])
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert len(records) == 2
+    assert {"ts", "cpu", "mem", "disk", "net"} <= records[0].keys()
+
+
+def test_collectors_feed_every_consumer_from_one_sample(monkeypatch):
+    from hardwaremon import collectors, hardwaremon, snapshot
+    calls = []
+
+    def usage(snap):
+        calls.append(1)
+        return collectors.Usage(95.0, 50.0, 10.0)
+
+    monkeypatch.setitem(collectors.REGISTRY, "usage", usage)
+    snapshot.tick()
+    hardwaremon.update_history()
+    alerts = hardwaremon.check_alerts()
+    bar = hardwaremon.cpu_mem_bar()
+    record = hardwaremon.sample_record()
+
+    assert len(calls) == 1
+    assert any("CPU Usage High" in alert for alert in alerts)
+    assert bar[1].endswith("95.0%")
+    assert record["usage"] == {"cpu": 95.0, "mem": 50.0, "disk": 10.0}
+    assert not hasattr(collectors.Usage(1, 2, 3), "__dict__")
+
+
+def test_bench_flags_regressions_against_baseline(tmp_path):
+    from hardwaremon import bench
+
+    results = bench.run(["cpu_mem_bar"], iterations=3)
+    assert {"p50_ms", "p99_ms", "alloc_kib", "spawns"} <= results["cpu_mem_bar"].keys()
+
+    path = str(tmp_path / "baseline.json")
+    bench.save_baseline(results, path)
+    assert bench.compare(results, bench.load_baseline(path)) == []
+
+    slower = {"cpu_mem_bar": dict(results["cpu_mem_bar"], p50_ms=1000.0, spawns=2)}
+    regressions = bench.compare(slower, bench.load_baseline(path))
+    assert len(regressions) == 2
+
+
+def test_bench_reads_collectors_on_every_iteration(monkeypatch):
+    from hardwaremon import bench, collectors
+    calls = []
+
+    def swap(snap):
+        calls.append(1)
+        return collectors.Swap(100, 10, 10.0)
+
+    monkeypatch.setitem(collectors.REGISTRY, "swap", swap)
+    bench.measure(lambda: collectors.get("swap"), iterations=5, warmup=1)
+    assert len(calls) == 1 + 5 + 1                           # warmup, timed, tracemalloc
+
+
+def test_record_from_root_and_replay(tmp_path):
+    from hardwaremon import hardwaremon, hostfs
+
+    chip = tmp_path / "sys" / "class" / "hwmon" / "hwmon0"
+    chip.mkdir(parents=True)
+    (chip / "name").write_text("nct6775\n")
+    (chip / "fan1_input").write_text("1200\n")
+    dmi = tmp_path / "sys" / "devices" / "virtual" / "dmi" / "id"
+    dmi.mkdir(parents=True)
+    (dmi / "board_name").write_text("X570 AORUS\n")
+
+    try:
+        hostfs.set_root(str(tmp_path))
+        hostfs.start_recording()
+        fans = hardwaremon.fan_info()
+        board = hardwaremon.motherboard_info()
+        archive = hostfs.stop_recording()
+        hostfs.set_root(None)
+
+        path = str(tmp_path / "capture.json.gz")
+        hostfs.save(archive, path)
+        hostfs.replay(path)
+        assert fans == ["=== Fan Sensors ===", "nct6775 fan1_input: 1200 RPM"]
+        assert hardwaremon.fan_info() == fans
+        assert hardwaremon.motherboard_info() == board
+        assert "Product Name: X570 AORUS" in board
+    finally:
+        hostfs.set_root(None)
+        hostfs.replay(None)
+
+
+def test_synthetic_host_scales_sections(tmp_path):
+    from hardwaremon import bench, fixtures, hardwaremon, hostfs
+
+    fixtures.build(str(tmp_path), cpus=8, processes=40, interfaces=12, mounts=6, chips=3)
+    try:
+        hostfs.set_root(str(tmp_path))
+        assert len(hardwaremon.network_info()) == 1 + 1 + 12   # header + lo + interfaces
+        assert len(hardwaremon.partition_info()) == 1 + 1 + 6  # header + / + mounts
+        assert len(hardwaremon.fan_info()) == 1 + 3 * 3
+        assert len(hardwaremon.top_processes()) == 1 + 5 + 1
+        assert "40 processes scanned" in hardwaremon.top_processes()[-1]
+    finally:
+        hostfs.set_root(None)
+
+    assert bench.growth([1, 4], [1.0, 4.0]) == 1.0
+    assert bench.growth([1, 4], [1.0, 16.0]) > bench.SUPERLINEAR
+
+
+def test_profiler_histograms_sections():
+    import subprocess
+    from hardwaremon import bench, profiling
+
+    profiler = profiling.Profiler()
+    for _ in range(20):
+        profiler.call("fast", lambda: None)
+    profiler.call("spawner", lambda: __import__("os").popen("true").read())
+
+    fast = profiler.stats["fast"]
+    assert fast.wall.count == 20 and fast.spawns == 0
+    assert fast.wall.percentile(50) <= fast.wall.percentile(95) <= fast.wall.max
+    assert profiler.stats["spawner"].spawns == 1
+    assert profiler.report()[0].startswith("name (ms)")
+
+    # Counted from the audit hook, Popen itself is left alone
+    assert subprocess.Popen.__init__.__qualname__ == "Popen.__init__"
+    with bench.SpawnCounter() as spawns:
+        subprocess.run(["true"])
+    assert spawns.count == 1
+
+
+def test_update_check_conditional_and_cached(tmp_path):
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from hardwaremon import updates
+
+    seen = []
+
+    class Releases(BaseHTTPRequestHandler):
+        def do_GET(self):
+            seen.append(self.headers.get("If-None-Match"))
+            if self.headers.get("If-None-Match") == '"r1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = json.dumps({"tag_name": "v3.1.0"}).encode()
+            self.send_response(200)
+            self.send_header("ETag", '"r1"')
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Releases)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/releases/latest"
+    cache = str(tmp_path / "update.json")
+    try:
+        assert updates.check("v3.0.9", url, cache) == "Update available: v3.1.0"
+        assert updates.check("v3.0.9", url, cache) == "Update available: v3.1.0"
+        assert seen == [None]                       # second launch: answered from the cache
+        assert updates.check("v3.1.0", url, cache, max_age=0) is None
+        assert seen == [None, '"r1"']               # conditional request, 304
+
+        updates.start("v3.0.9", url, cache, max_age=0).join(5)
+        assert updates.message() == "Update available: v3.1.0"
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert updates.check("v3.0.9", url, str(tmp_path / "offline.json")) is None
+
+
+def test_cli_startup_skips_gui_and_network_modules():
+    from hardwaremon import bench
+
+    results = bench.startup({"hardwaremon.hardwaremon": 10000}, runs=1)
+    assert results["hardwaremon.hardwaremon"]["forbidden"] == []
+    ms, imported = bench.import_time("hardwaremon.hardwaremon_gui", runs=1)
+    assert ms > 0 and "tkinter" in imported and "PIL" not in imported
+
+
+class FakeText:
+    # Just enough of tk.Text for TextRenderer: "row.col" / "row.end" /
+    # "end" / "end-1c" / mark indexes, mark gravity, and the trailing
+    # newline Tk always keeps at the end of the buffer
+    def __init__(self):
+        self.buf = "\n"
+        self.marks = {}
+        self.gravity = {}
+
+    def _offset(self, index):
+        last = len(self.buf) - 1
+        if index in self.marks:
+            return self.marks[index]
+        if index in ("end", "end-1c"):
+            return last
+        row, col = index.split(".")
+        lines = self.buf.split("\n")
+        row = int(row)
+        if row > len(lines) - 1:
+            return last
+        start = sum(len(line) + 1 for line in lines[:row - 1])
+        length = len(lines[row - 1])
+        return start + (length if col == "end" else min(int(col), length))
+
+    def index(self, index):
+        before = self.buf[:self._offset(index)]
+        return f"{before.count(chr(10)) + 1}.{len(before) - before.rfind(chr(10)) - 1}"
+
+    def get(self, start, end):
+        return self.buf[self._offset(start):self._offset(end)]
+
+    def mark_set(self, mark, index):
+        self.marks[mark] = self._offset(index)
+        self.gravity[mark] = "right"
+
+    def mark_gravity(self, mark, gravity):
+        self.gravity[mark] = gravity
+
+    def mark_unset(self, mark):
+        self.marks.pop(mark, None)
+
+    def insert(self, index, text):
+        at = self._offset(index)
+        self.buf = self.buf[:at] + text + self.buf[at:]
+        for mark, pos in self.marks.items():
+            if pos > at or (pos == at and self.gravity[mark] == "right"):
+                self.marks[mark] = pos + len(text)
+
+    def delete(self, start, end):
+        a, b = self._offset(start), self._offset(end)
+        if b <= a:
+            return
+        self.buf = self.buf[:a] + self.buf[b:]
+        for mark, pos in self.marks.items():
+            self.marks[mark] = pos - (b - a) if pos >= b else min(pos, a)
+
+
+class StubCanvas:
+    # Records what LineGraph does to its items instead of drawing them
+    def __init__(self, width=300, height=100):
+        self.width, self.height = width, height
+        self.created = []
+        self.coords_calls = {}
+        self.config = {}
+        self.deleted = 0
+        self.on_configure = None
+
+    def _create(self, kind, *args, **kwargs):
+        self.created.append(kind)
+        item = len(self.created)
+        self.config[item] = dict(kwargs)
+        return item
+
+    def create_line(self, *args, **kwargs):
+        return self._create("line", *args, **kwargs)
+
+    def create_text(self, *args, **kwargs):
+        return self._create("text", *args, **kwargs)
+
+    def coords(self, item, *points):
+        self.coords_calls[item] = points
+
+    def itemconfigure(self, item, **kwargs):
+        self.config[item].update(kwargs)
+
+    def delete(self, *items):
+        self.deleted += 1
+
+    def configure(self, **kwargs):
+        pass
+
+    def tag_lower(self, item):
+        pass
+
+    def bind(self, event, func, add=None):
+        self.on_configure = func
+
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        return self.height
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+
+def test_line_graph_reuses_its_canvas_items():
+    from hardwaremon.graphs import GRID_STEPS, LineGraph
+
+    canvas = StubCanvas()
+    graph = LineGraph(canvas, "CPU", "#00ff00", grid=True, title="CPU Usage (%)")
+    items = len(canvas.created)
+    assert items == 3 + 2 * len(GRID_STEPS)                   # line, value, title + grid
+
+    graph.update([10.0])                                       # too few points: hidden
+    assert canvas.config[graph.line]["state"] == "hidden"
+    for values in ([10.0, 20.0, 30.0], [50.0] * 60):
+        graph.update(values)
+    assert len(canvas.coords_calls[graph.line]) == 2 * 60
+    assert canvas.config[graph.value_text]["text"] == "CPU: 50.0%"
+
+    grid_y = canvas.coords_calls[graph.grid_lines[-1]]
+    canvas.width, canvas.height = 600, 200                     # resize moves the grid
+    canvas.on_configure()
+    assert canvas.coords_calls[graph.grid_lines[-1]] != grid_y
+    assert canvas.coords_calls[graph.line][-1] == 200 - 10 - 50.0 * (200 - 20) / 100
+
+    graph.set_theme("#ff0000", fg="#ffffff", bg="#000000")
+    assert canvas.config[graph.line]["fill"] == "#ff0000"
+    assert canvas.config[graph.grid_labels[0]]["fill"] == "#ffffff"
+
+    assert len(canvas.created) == items and canvas.deleted == 0
+
+
+@pytest.mark.parametrize("widget", ["fake", "tk"])
+def test_text_renderer_keeps_sections_aligned(widget):
+    from hardwaremon.render import TextRenderer
+
+    if widget == "tk":
+        tk = pytest.importorskip("tkinter")
+        try:
+            root = tk.Tk()
+        except tk.TclError:
+            pytest.skip("no display")
+        text = tk.Text(root)
+    else:
+        root, text = None, FakeText()
+
+    def expect(sections):
+        return "".join("\n".join(lines) + "\n\n" for _, lines in sections)
+
+    renderer = TextRenderer(text)
+    frames = [
+        [("a", ["A", "a1", "a2"]), ("b", ["B", "b1"]), ("c", ["C", "c1"])],
+        [("a", ["A", "a1", "a2"]), ("b", ["B", "b1", "b2", "b3"]), ("c", ["C", "c1"])],   # grows
+        [("a", ["A", "a1", "a2"]), ("b", ["B"]), ("c", ["C", "c1"])],                     # shrinks
+        [("a", ["A!", "a1", "a2", "a3"]), ("b", ["B"]), ("c", ["C", "c1"])],              # first line + growth
+        [("a", ["A!"]), ("b", ["B2", "x"]), ("c", ["C"])],                                # everything at once
+        [("a", ["A!"]), ("b", ["B2", "x"]), ("c", ["C", "c1\nc2"])],                      # embedded newline
+    ]
+    try:
+        for frame in frames:
+            renderer.render(frame)
+            assert text.get("1.0", "end-1c") == expect([(n, "\n".join(lines).split("\n")) for n, lines in frame])
+            row = 1
+            for name, lines in frame:                        # each mark sits on its header line
+                assert text.index(f"sec:{name}") == f"{row}.0"
+                row += len("\n".join(lines).split("\n")) + 1
+
+        written = renderer.lines_written
+        renderer.render([("a", ["A!"]), ("b", ["B2", "y"]), ("c", ["C", "c1", "c2"])])
+        assert renderer.lines_written == written + 1         # only b's second line
+    finally:
+        if root is not None:
+            root.destroy()
+
+
+def test_terminal_renderer_writes_only_changes():
+    import io
+    from hardwaremon.render import TerminalRenderer
+
+    out = io.StringIO()
+    screen = TerminalRenderer(out, size=(40, 6))
+    screen.render([("cpu", ["=== CPU ===", "Usage: 10.0%"]), ("net", ["=== Net ===", "eth0: 1 MB"])])
+    assert "\x1b[2J" in out.getvalue() and "Usage: 10.0%" in out.getvalue()
+
+    out.truncate(0)
+    out.seek(0)
+    before = screen.cells_written
+    screen.render([("cpu", ["=== CPU ===", "Usage: 12.0%"]), ("net", ["=== Net ===", "eth0: 1 MB"])])
+    assert out.getvalue() == "\x1b[2;9H2"               # one cell on row 2
+    assert screen.cells_written == before + 1
+
+    screen.key("fold")                                  # fold the selected (first) section
+    assert screen.screen[0][0] == "[+] === CPU ===  (1 lines)"
+    assert screen.screen[2][0] == "[-] === Net ==="
+    screen.key("fold")                                  # unfolded again: 6 rows, 5 fit
+    screen.key("down")
+    assert screen.top == 1 and screen.screen[0][0] == "Usage: 12.0%"
+    screen.key("next")
+    assert ("[-] === Net ===", True) in screen.screen   # selected header in reverse video
+    assert screen.key("quit") is False
+
+
+def test_terminal_renderer_without_keyboard(monkeypatch):
+    import io
+    import os
+    import sys
+    from hardwaremon.render import TerminalRenderer
+
+    read_end, write_end = os.pipe()
+
+    class PipeClaimingTty:                                   # isatty() lies; tcgetattr fails
+        def isatty(self):
+            return True
+
+        def fileno(self):
+            return read_end
+
+    try:
+        for stdin in (PipeClaimingTty(), io.StringIO()):
+            monkeypatch.setattr(sys, "stdin", stdin)
+            out = io.StringIO()
+            with TerminalRenderer(out, size=(20, 4)) as screen:
+                screen.render([("cpu", ["=== CPU ==="])])
+            assert screen._tty is None
+            assert out.getvalue().startswith("\x1b[?1049h") and out.getvalue().endswith("\x1b[?1049l")
+    finally:
+        os.close(read_end)
+        os.close(write_end)
+
+
+def test_nvidia_reader_streams_and_restarts(tmp_path, monkeypatch):
+    import sys
+    import time
+    from hardwaremon import nvidia
+
+    # Prints two GPUs every -lms ms for three rounds, then exits
+    fake = tmp_path / "nvidia-smi"
+    fake.write_text(f"""#!{sys.executable}
+import sys, time
+interval = int(sys.argv[sys.argv.index("-lms") + 1]) / 1000
+for i in range(3):
+    print(f"0, {{40 + i}}, 1024, 8192, 55, 120.50, 1905, NVIDIA GeForce RTX 3070", flush=True)
+    print("1, 0, 10, 4096, [N/A], [Not Supported], 300, Tesla T4, rev A", flush=True)
+    time.sleep(interval)
+""")
+    fake.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}:{__import__('os').environ['PATH']}")
+    monkeypatch.setattr(nvidia, "RESTART_MIN", 0.05)
+
+    reader = nvidia.Reader(interval_ms=20).start()
+    try:
+        assert reader.first_sample.wait(5)
+        deadline = time.time() + 5
+        while reader.starts < 2 and time.time() < deadline:
+            time.sleep(0.02)
+        assert reader.starts >= 2                      # restarted after the process exited
+        first, second = reader.latest()
+        assert first["name"] == "NVIDIA GeForce RTX 3070" and 40 <= first["utilization"] <= 42
+        assert first["memory_total"] == 8192 and first["power"] == 120.5
+        assert second["name"] == "Tesla T4, rev A" and second["temperature"] is None
+    finally:
+        reader.stop()
+    assert nvidia.parse("garbage") is None
+
+    # Wedged before its first line: killed after max_age() and started again
+    fake.write_text(f"#!{sys.executable}\nimport time\ntime.sleep(60)\n")
+    monkeypatch.setattr(nvidia.Reader, "max_age", lambda self: 0.2)
+    reader = nvidia.Reader(interval_ms=20).start()
+    try:
+        deadline = time.time() + 5
+        while reader.starts < 2 and time.time() < deadline:
+            reader.latest()
+            time.sleep(0.05)
+        assert reader.starts >= 2 and not reader.first_sample.is_set()
+    finally:
+        reader.stop()
+
+
+def test_nvidia_shared_reader_does_not_wait_for_first_sample(tmp_path, monkeypatch):
+    import sys
+    import time
+    from hardwaremon import nvidia
+
+    # Takes a second to print its first line, like a cold driver
+    fake = tmp_path / "nvidia-smi"
+    fake.write_text(f"""#!{sys.executable}
+import time
+time.sleep(1)
+print("0, 40, 1024, 8192, 55, 120.50, 1905, NVIDIA GeForce RTX 3070", flush=True)
+time.sleep(60)
+""")
+    fake.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}:{__import__('os').environ['PATH']}")
+    monkeypatch.setattr(nvidia, "_shared", None)
+
+    started = time.monotonic()
+    reader = nvidia.shared()
+    try:
+        assert time.monotonic() - started < 0.5
+        assert reader.latest() == [] and nvidia.collecting()
+        assert reader.first_sample.wait(5)
+        assert [r["name"] for r in reader.latest()] == ["NVIDIA GeForce RTX 3070"]
+        assert not nvidia.collecting()
+    finally:
+        reader.stop()
+
+
+def test_amdgpu_telemetry_from_sysfs(tmp_path):
+    from hardwaremon import amdgpu, collectors, hostfs, snapshot
+
+    def write(path, text):
+        full = tmp_path / path.lstrip("/")
+        full.parent.mkdir(parents=True, exist_ok=True)
+        full.write_text(text + "\n")
+
+    card = "/sys/class/drm/card1/device"
+    write(card + "/vendor", "0x1002")
+    write(card + "/mem_info_vram_total", str(8 * 2**30))
+    write(card + "/mem_info_vram_used", str(512 * 2**20))
+    write(card + "/gpu_busy_percent", "37")
+    write(card + "/pp_dpm_sclk", "0: 500Mhz\n1: 1800Mhz *\n2: 2400Mhz")
+    write(card + "/hwmon/hwmon4/power1_average", "45000000")
+    write(card + "/hwmon/hwmon4/temp1_input", "61000")
+    write("/sys/class/drm/card0/device/vendor", "0x8086")        # integrated Intel
+    write("/sys/class/drm/card1-DP-1/status", "connected")      # connector, not a card
+    try:
+        hostfs.set_root(str(tmp_path))
+        (gpu,) = collectors.get("amdgpu", snapshot.tick())
+        assert (gpu.name, gpu.utilization, gpu.memory_used, gpu.memory_total) == ("card1", 37, 512, 8192)
+        assert (gpu.temperature, gpu.power, gpu.clock) == (61, 45, 1800)
+
+        write(card + "/gpu_busy_percent", "90")                 # same file, new value
+        collectors.clear()
+        assert collectors.get("amdgpu", snapshot.tick())[0].utilization == 90
+        assert len(amdgpu._handles) == 6                        # opened once, reused
+    finally:
+        hostfs.set_root(None)
+    assert len(amdgpu._handles) == 0
+
+
+def test_hwmon_index_batches_reads_and_rescans_on_change(tmp_path):
+    from hardwaremon import collectors, hardwaremon, hostfs, hwmon, snapshot
+
+    chip = tmp_path / "sys" / "class" / "hwmon" / "hwmon0"
+    chip.mkdir(parents=True)
+    for name, text in (("name", "nct6775"), ("fan1_input", "1200"), ("temp1_input", "45500"),
+                       ("temp1_label", "SYSTIN"), ("in0_input", "1104"), ("power1_average", "35000000")):
+        (chip / name).write_text(text + "\n")
+    try:
+        hostfs.set_root(str(tmp_path))
+        snap = snapshot.tick()
+        assert collectors.get("fans", snap) == [collectors.Fan("nct6775", "fan1_input", 1200, "hwmon0")]
+        assert collectors.get("temperatures", snap) == [collectors.Temperature("nct6775", "SYSTIN", 45.5, "hwmon0")]
+        assert collectors.get("voltages", snap)[0].volts == 1.104
+        assert collectors.get("power", snap)[0].watts == 35.0
+        assert hwmon.INDEX.scans == 1 and len(hwmon.INDEX._handles) == 4
+
+        (chip / "fan1_input").write_text("900\n")              # same fd, new value
+        collectors.clear()
+        snapshot.tick()
+        assert hardwaremon.fan_info()[1:] == ["nct6775 fan1_input: 900 RPM"]
+        assert hwmon.INDEX.scans == 1
+
+        (chip.parent / "hwmon1").mkdir()                         # a chip appeared
+        (chip.parent / "hwmon1" / "name").write_text("k10temp\n")
+        (chip.parent / "hwmon1" / "temp1_input").write_text("60000\n")
+        collectors.clear()
+        assert len(collectors.get("temperatures", snapshot.tick())) == 2
+        assert hwmon.INDEX.scans == 2
+    finally:
+        hostfs.set_root(None)
+
+
+def test_temperature_sections_use_sensor_classes(monkeypatch):
+    from hardwaremon import collectors, hardwaremon, sensors, snapshot
+
+    temps = [collectors.Temperature(chip, label, 50.0, chip) for chip, label in (
+        ("k10temp", "Tctl"), ("k10temp", "Tccd1"), ("zenpower", "Tdie"), ("coretemp", "Core 0"),
+        ("amdgpu", "junction"), ("amdgpu", "mem"), ("spd5118", ""), ("nvme", "Composite"),
+        ("pch_cannonlake", ""), ("acpitz", ""))]
+    monkeypatch.setitem(collectors.REGISTRY, "temperatures", lambda snap: temps)
+    snapshot.tick()
+
+    assert hardwaremon.cpu_temperature()[1:] == ["Tctl: 50.0 °C", "Tdie: 50.0 °C", "Tccd1: 50.0 °C", "Core 0: 50.0 °C"]
+    assert hardwaremon.gpu_temperature()[1:] == ["junction: 50.0 °C", "mem: 50.0 °C"]
+    assert hardwaremon.memory_temperature()[1:] == ["spd5118: 50.0 °C"]
+    assert sensors.classify("nvme", "Composite") == sensors.NVME
+    assert sensors.classify("pch_cannonlake", "") == sensors.CHIPSET
+
+    snapshot.tick()
+    hardwaremon.cpu_temperature()
+    assert sensors.UNCLASSIFIED.count(("acpitz", "")) == 1    # reported once, not every tick
+    assert "acpitz" in sensors.summary()
+
+
+def test_gpu_alerts_use_per_sensor_thresholds(monkeypatch):
+    from hardwaremon import collectors, hardwaremon, snapshot
+
+    temps = [collectors.Temperature("amdgpu", "edge", 70.0, "hwmon1"),
+             collectors.Temperature("amdgpu", "junction", 92.0, "hwmon1"),   # normal under load
+             collectors.Temperature("amdgpu", "mem", 90.0, "hwmon1")]
+    monkeypatch.setitem(collectors.REGISTRY, "temperatures", lambda snap: temps)
+    monkeypatch.setitem(collectors.REGISTRY, "usage", lambda snap: collectors.Usage(1.0, 1.0, 1.0))
+    snapshot.tick()
+    assert not any("GPU" in alert for alert in hardwaremon.check_alerts())
+
+    temps[1] = collectors.Temperature("amdgpu", "junction", 105.0, "hwmon1")
+    snapshot.tick()
+    assert [a for a in hardwaremon.check_alerts() if "GPU" in a] == ["\u26a0\ufe0f GPU Junction Temp High: 105.0 °C"]
+
+
+def test_command_runner_timeouts_sharing_and_cache(monkeypatch):
+    import sys
+    import threading
+    import time
+    from hardwaremon import commands
+
+    monkeypatch.setattr(commands, "STATS", dict.fromkeys(commands.STATS, 0))
+    slow = [sys.executable, "-c", "import time; time.sleep(0.3); print('done')"]
+
+    outputs = []
+    threads = [threading.Thread(target=lambda: outputs.append(commands.run(slow, ttl=60))) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert outputs == ["done\n"] * 3
+    assert commands.STATS["spawns"] == 1 and commands.STATS["shared"] == 2
+    assert commands.run(slow, ttl=60) == "done\n" and commands.STATS["cache_hits"] == 1
+
+    started = time.monotonic()
+    assert commands.run([sys.executable, "-c", "import time; time.sleep(10)"], timeout=0.2) == ""
+    assert time.monotonic() - started < 5 and commands.STATS["timeouts"] == 1
+    assert commands.run(["hardwaremon-no-such-tool"]) == "" and commands.STATS["failures"] == 1
+
+    monkeypatch.setattr(commands, "_slots", threading.BoundedSemaphore(1))  # one child at a time
+    started = time.monotonic()
+    threads = [threading.Thread(target=commands.run, args=(slow + [str(i)],)) for i in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert time.monotonic() - started >= 0.6
+    commands.clear()